@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import {
   ArrowLeft,
   TrendingUp,
@@ -39,7 +39,7 @@ import {
   Legend,
   Cell
 } from 'recharts';
-import { useBookingsDemo, useFieldsDemo, useSportsDemo } from '@/hooks/useDemoData';
+import { useBookingRollupsDemo, useBookingsDemo, useFieldsDemo, useSportsDemo } from '@/hooks/useDemoData';
 
 // Define types for our data
 interface Booking {
@@ -81,10 +81,35 @@ interface Sport {
   updated_at: string;
 }
 
+// YYYY-MM-DD in local time, the format of rollup days
+const toDay = (date: Date) =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+
+// First transaction day covered by a period filter (undefined = all time)
+const periodStart = (range: string): string | undefined => {
+  const now = new Date();
+  switch (range) {
+    case 'daily':
+      return toDay(now);
+    case 'weekly':
+      return toDay(new Date(now.getFullYear(), now.getMonth(), now.getDate() - 7));
+    case 'monthly':
+      return toDay(new Date(now.getFullYear(), now.getMonth(), 1));
+    case 'yearly':
+      return toDay(new Date(now.getFullYear(), 0, 1));
+    default:
+      return undefined;
+  }
+};
+
+const PAID_STATUSES = new Set(['confirmed', 'completed']);
+const TREND_STATUSES = new Set(['confirmed', 'completed', 'pending']);
+
 const DashboardPage = () => {
   const { bookings: demoBookings, loading: loadingBookings } = useBookingsDemo();
   const { fields: demoFields, loading: loadingFields } = useFieldsDemo();
   const { sports: demoSports, loading: loadingSports } = useSportsDemo();
+  const { isInitialized, rollups, loading: loadingRollups, loadRollups } = useBookingRollupsDemo();
 
   const [bookings, setBookings] = useState<Booking[]>([]);
   const [fields, setFields] = useState<Field[]>([]);
@@ -99,7 +124,7 @@ const DashboardPage = () => {
 
   // Sync data from hooks
   useEffect(() => {
-    if (loadingBookings || loadingFields || loadingSports) {
+    if (loadingBookings || loadingFields || loadingSports || loadingRollups) {
       // Still loading from demo store
       return;
     }
@@ -116,8 +141,9 @@ const DashboardPage = () => {
         updated_at: b.updated_at || b.created_at
       }));
 
+      const sportById = new Map(demoSports.map(s => [s.id, s]));
       const mappedFields = demoFields.map(f => {
-        const sport = demoSports.find(s => s.id === f.sport_id);
+        const sport = sportById.get(f.sport_id);
         return {
           ...f,
           description: f.description || '',
@@ -147,166 +173,92 @@ const DashboardPage = () => {
       setError('Failed to process dashboard data');
       setLoading(false);
     }
-  }, [demoBookings, demoFields, demoSports, loadingBookings, loadingFields, loadingSports]);
+  }, [demoBookings, demoFields, demoSports, loadingBookings, loadingFields, loadingSports, loadingRollups]);
 
-  // Calculate stats based on all bookings and their status
-  const totalIncoming = filteredBookings
-    .filter(b => b.booking_status === 'confirmed' || b.booking_status === 'completed')
-    .reduce((sum, booking) => sum + Number(booking.total_price), 0);
+  // The store filters rollups by period; switching period re-reads a few hundred rows.
+  // Re-read as well once the demo data is ready and whenever the bookings change.
+  useEffect(() => {
+    if (!isInitialized) return;
+    loadRollups({ from: periodStart(dateRange) });
+  }, [isInitialized, dateRange, demoBookings, loadRollups]);
+
+  // Field id -> sport id / sport name, for filtering and grouping
+  const fieldSportId = useMemo(() => new Map(fields.map(f => [f.id, f.sport_id.toString()])), [fields]);
+  const fieldSportName = useMemo(() => {
+    const sportName = new Map(sports.map(s => [s.id, s.sport_name]));
+    return new Map(fields.map(f => [f.id, sportName.get(f.sport_id) || 'Unknown']));
+  }, [fields, sports]);
+
+  const visibleRollups = useMemo(
+    () => selectedSport === 'all' ? rollups : rollups.filter(r => fieldSportId.get(r.field_id) === selectedSport),
+    [rollups, selectedSport, fieldSportId]
+  );
+
+  // Calculate stats from the rollups of the selected period and sport
+  const sumRollups = (predicate: (status: string) => boolean, measure: 'revenue' | 'count') =>
+    visibleRollups.reduce((sum, row) => predicate(row.status) ? sum + row[measure] : sum, 0);
 
-  const totalOutgoing = filteredBookings
-    .filter(b => b.booking_status === 'cancelled')
-    .reduce((sum, booking) => sum + Number(booking.total_price), 0);
+  const totalIncoming = sumRollups(status => PAID_STATUSES.has(status), 'revenue');
+  const totalOutgoing = sumRollups(status => status === 'cancelled', 'revenue');
+  const pendingRevenue = sumRollups(status => status === 'pending', 'revenue');
+  const pendingCount = sumRollups(status => status === 'pending', 'count');
 
   const pendingBookings = filteredBookings.filter(b => b.booking_status === 'pending');
 
   const threeMonthsAgoStart = new Date();
   threeMonthsAgoStart.setMonth(threeMonthsAgoStart.getMonth() - 3, 1);
   threeMonthsAgoStart.setHours(0, 0, 0, 0);
+  const threeMonthsAgoMonth = toDay(threeMonthsAgoStart).slice(0, 7);
 
-  // Filter logic for filteredBookings state
-  // This effect updates filteredBookings when filters change
+  // Filter logic for the booking lists (recent transactions, pending payments)
   useEffect(() => {
     if (loading) return;
 
-    let result = [...bookings];
+    let result = bookings;
 
     if (selectedSport !== 'all') {
-      const sportFieldIds = fields
-        .filter(field => field.sport_id.toString() === selectedSport)
-        .map(field => field.id.toString());
-
-      result = result.filter(booking => sportFieldIds.includes(booking.field_id));
+      result = result.filter(booking => fieldSportId.get(Number(booking.field_id)) === selectedSport);
     }
 
-    const now = new Date();
-    // Reset time to start of day for accurate comparison
-    const today = new Date(now.getFullYear(), now.getMonth(), now.getDate());
-
-    const parseDate = (dateStr: string) => {
-      const date = new Date(dateStr);
-      // If parsing fails or date is invalid, it returns NaN
-      return isNaN(date.getTime()) ? null : new Date(date.getFullYear(), date.getMonth(), date.getDate());
-    };
-
-    switch (dateRange) {
-      case 'daily':
-        result = result.filter(booking => {
-          // Filter by TRANSACTION date (created_at), not game date
-          const dateStr = booking.created_at || booking.booking_date;
-          // Handle both ISO string and potential Date objects if any
-          const transDate = new Date(dateStr);
-
-          return (
-            transDate.getDate() === now.getDate() &&
-            transDate.getMonth() === now.getMonth() &&
-            transDate.getFullYear() === now.getFullYear()
-          );
-        });
-        break;
-      case 'weekly':
-        const oneWeekAgo = new Date(today);
-        oneWeekAgo.setDate(today.getDate() - 7);
-        result = result.filter(booking => {
-          const transDate = new Date(booking.created_at || booking.booking_date);
-          return transDate >= oneWeekAgo;
-        });
-        break;
-      case 'monthly':
-        result = result.filter(booking => {
-          const transDate = new Date(booking.created_at || booking.booking_date);
-          return (
-            transDate.getMonth() === today.getMonth() &&
-            transDate.getFullYear() === today.getFullYear()
-          );
-        });
-        break;
-      case 'yearly':
-        result = result.filter(booking => {
-          const transDate = new Date(booking.created_at || booking.booking_date);
-          return transDate.getFullYear() === today.getFullYear();
-        });
-        break;
+    // Filter by TRANSACTION date (created_at), not game date, like the rollups
+    const from = periodStart(dateRange);
+    if (from) {
+      result = result.filter(booking => (booking.created_at || booking.booking_date).slice(0, 10) >= from);
     }
 
     setFilteredBookings(result);
-  }, [bookings, selectedSport, dateRange, fields, loading]);
-
-  // Calculations for charts based on 'bookings' (source) or 'filteredBookings' (displayed)
-  // Logic: Charts usually respect the filters except maybe global filters if specified.
-  // The original code applied filters to 'chartBookings' inside render logic (which is bad practice) 
-  // or derived it. Let's reuse 'filteredBookings' logic but for charts we might want somewhat different scope?
-  // Original code derived 'chartBookings' from 'bookings' inside render loop.
-  // We can just use 'filteredBookings' for the charts as it reflects current selection.
-
-  // Confirmed bookings by sport and month
-  // Bookings by sport and month (including pending for visibility)
-  const confirmedBookingsBySportAndMonth = filteredBookings
-    .filter(b => {
-      const bookingDate = new Date(b.booking_date);
-      // Include pending bookings so the user can see their recent action
-      const isValidStatus = b.booking_status === 'confirmed' || b.booking_status === 'completed' || b.booking_status === 'pending';
-      const isWithinThreeMonths = bookingDate >= threeMonthsAgoStart;
-      return isValidStatus && isWithinThreeMonths;
-    })
-    .reduce((acc, booking) => {
-      const field = fields.find(f => f.id.toString() === booking.field_id.toString());
-      const sport = field ? sports.find(s => s.id === field.sport_id) : null;
-      const sportName = sport ? sport.sport_name : 'Unknown';
-
-      // Fix date parsing issues by ensuring we use the booking_date string directly if possible or standardizing
-      // Booking date is typically YYYY-MM-DD.
-      const dateParts = new Date(booking.booking_date);
-      const monthYear = dateParts.toLocaleDateString('en-US', { month: 'short', year: 'numeric' });
-
-      if (!acc[monthYear]) {
-        acc[monthYear] = {};
-      }
-      if (!acc[monthYear][sportName]) {
-        acc[monthYear][sportName] = 0;
+  }, [bookings, selectedSport, dateRange, fieldSportId, loading]);
+
+  // Bookings by sport and month played (including pending for visibility)
+  const confirmedBookingsBySportAndMonth = visibleRollups
+    .filter(row => TREND_STATUSES.has(row.status) && row.play_month >= threeMonthsAgoMonth)
+    .reduce((acc, row) => {
+      const sportName = fieldSportName.get(row.field_id) || 'Unknown';
+      if (!acc[row.play_month]) {
+        acc[row.play_month] = {};
       }
-      acc[monthYear][sportName]++;
+      acc[row.play_month][sportName] = (acc[row.play_month][sportName] || 0) + row.count;
       return acc;
     }, {} as Record<string, Record<string, number>>);
 
   // Collect all unique sport names for dynamic bar generation
   const allSportNames = Array.from(new Set(
-    filteredBookings.map(b => {
-      const field = fields.find(f => f.id.toString() === b.field_id.toString());
-      const sport = field ? sports.find(s => s.id === field.sport_id) : null;
-      return sport ? sport.sport_name : 'Unknown';
-    })
+    visibleRollups.map(row => fieldSportName.get(row.field_id) || 'Unknown')
   ));
 
-  const trendChartData = Object.entries(confirmedBookingsBySportAndMonth)
-    .map(([month, sportsData]) => {
-      return {
-        name: month,
-        ...sportsData
-      };
-    })
-    .sort((a, b) => {
-      const [monthA, yearA] = a.name.split(' ');
-      const [monthB, yearB] = b.name.split(' ');
-      const dateA = new Date(`${monthA} 1, ${yearA}`);
-      const dateB = new Date(`${monthB} 1, ${yearB}`);
-      return dateA.getTime() - dateB.getTime();
-    });
-
-  const revenueBySport = filteredBookings
-    // Include pending in potential revenue view, or keep it strict? 
-    // Usually revenue implies confirmed money. But user seems to want to see "activity".
-    // Let's keep revenue strict for now, but valid booking trends lenient.
-    // User complaint was about "Booking Trends" specifically.
-    .filter(b => b.booking_status === 'confirmed' || b.booking_status === 'completed')
-    .reduce((acc, booking) => {
-      const field = fields.find(f => f.id.toString() === booking.field_id.toString());
-      if (!field) return acc;
-
-      const sport = sports.find(s => s.id === field.sport_id);
-      const sportName = sport ? sport.sport_name : 'Unknown';
-
-      acc[sportName] = (acc[sportName] || 0) + Number(booking.total_price);
+  const trendChartData = Object.keys(confirmedBookingsBySportAndMonth)
+    .sort()
+    .map(month => ({
+      name: new Date(`${month}-01T00:00:00`).toLocaleDateString('en-US', { month: 'short', year: 'numeric' }),
+      ...confirmedBookingsBySportAndMonth[month]
+    }));
+
+  // Revenue counts confirmed money only
+  const revenueBySport = visibleRollups
+    .filter(row => PAID_STATUSES.has(row.status) && fieldSportName.has(row.field_id))
+    .reduce((acc, row) => {
+      const sportName = fieldSportName.get(row.field_id)!;
+      acc[sportName] = (acc[sportName] || 0) + row.revenue;
       return acc;
     }, {} as Record<string, number>);
 
@@ -444,13 +396,13 @@ const DashboardPage = () => {
                   <CreditCard className="h-5 w-5 text-amber-500" />
                 </div>
                 <Badge variant="outline" className="bg-amber-500/5 text-amber-500 border-amber-500/20">
-                  {pendingBookings.length} Pending
+                  {pendingCount} Pending
                 </Badge>
               </div>
               <div className="space-y-1">
                 <p className="text-sm text-zinc-400 font-medium">Pending Payments</p>
                 <h3 className="text-2xl font-bold text-white tracking-tight">
-                  Rp {pendingBookings.reduce((sum, booking) => sum + Number(booking.total_price), 0).toLocaleString('id-ID')}
+                  Rp {pendingRevenue.toLocaleString('id-ID')}
                 </h3>
               </div>
             </CardContent>
@@ -1,6 +1,9 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { headers } from 'next/headers';
 import { createClient } from '@supabase/supabase-js';
+import { CATALOG_CACHE_KEYS, getCached } from '@/lib/catalogCache';
+import { recognizeIntent } from '@/lib/chatIntent';
+import { ServerTimer, SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
 
 // Database connection
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
@@ -37,23 +40,25 @@ interface ChatRequest {
   };
 }
 
-// Fetch active system prompt from database
+// Fetch active system prompt from database (cached until the TTL expires or a prompt changes)
 const getActiveSystemPrompt = async (): Promise<string> => {
   try {
-    const { data, error } = await supabase
-      .from('system_prompts')
-      .select('prompt_content')
-      .eq('is_active', true)
-      .order('version', { ascending: false })
-      .limit(1)
-      .single();
-
-    if (error) {
-      console.log('Database not available, using fallback prompt');
-      throw error;
-    }
+    return await getCached(CATALOG_CACHE_KEYS.SYSTEM_PROMPTS, 'active', async () => {
+      const { data, error } = await supabase
+        .from('system_prompts')
+        .select('prompt_content')
+        .eq('is_active', true)
+        .order('version', { ascending: false })
+        .limit(1)
+        .single();
+
+      if (error) {
+        console.log('Database not available, using fallback prompt');
+        throw error;
+      }
 
-    return data.prompt_content;
+      return data.prompt_content as string;
+    });
   } catch (error) {
     // Fallback to default prompt
     return `Anda adalah asisten AI untuk SportArena. Tugas Anda:
@@ -97,298 +102,30 @@ Respon dalam format JSON dengan struktur:
 
 
 
-// Natural Language Processing for intent recognition
-function recognizeIntent(message: string): {
-  intent: 'availability' | 'pricing' | 'booking' | 'transaction' | 'general' | 'help';
-  entities: {
-    sport?: string;
-    time?: string;
-    date?: string;
-    dayName?: string;
-    timePreference?: 'morning' | 'noon' | 'afternoon' | 'evening';
-    timeRange?: {
-      start: string;
-      end: string;
-      timePreference: string;
-    };
-    fieldName?: string;
-  };
-  confidence: number;
-} {
-  const input = message.toLowerCase();
-
-  // Intent recognition with better patterns
-  const patterns = {
-    availability: {
-      keywords: ['jadwal', 'ketersediaan', 'tersedia', 'kosong', 'slot', 'bisa', 'booking', 'main', 'pakai', 'sewa'],
-      patterns: [
-        /kapan.* bisa/,
-        /jam.* tersedia/,
-        /slot.* kosong/,
-        /schedule.* available/,
-        /what time.* free/,
-        /when can.* play/,
-        /bisa main/,
-        /kapan main/,
-        /cek jadwal/,
-        /mau sewa/,
-        /cari lapangan/,
-        /butuh lapangan/,
-        /sabtu.* kosong/,
-        /minggu.* tersedia/,
-        /senin.* bisa/,
-        / hari.* masih ada/
-      ],
-      score: 0
-    },
-    pricing: {
-      keywords: ['harga', 'price', 'biaya', 'cost', 'tarif', 'ongkos', 'murah', 'mahal'],
-      patterns: [
-        /berapa harga/,
-        /price.* list/,
-        /how much/,
-        /cost.* per/,
-        /tarif.* per/,
-        /biaya.* sewa/,
-        /harga.* lapangan/
-      ],
-      score: 0
-    },
-    booking: {
-      keywords: ['booking', ' reservasi', 'pesan', 'order', 'book', 'reserve', 'daftar'],
-      patterns: [
-        /want to book/,
-        /buat booking/,
-        /pesan lapangan/,
-        /reservasi/,
-        /book.* field/,
-        /sewa lapangan/,
-        /mau booking/,
-        /booking.* now/
-      ],
-      score: 0
-    },
-    transaction: {
-      keywords: ['transaksi', 'pemasukan', 'pengeluaran', 'laporan', 'revenue', 'income', 'profit', 'financial', 'bisnis', 'omset', 'penjualan', 'kinerja', 'performa'],
-      patterns: [
-        /laporan.* keuangan/,
-        /rekap.* transaksi/,
-        /summary.* financial/,
-        /cek omset/,
-        /how.* business/,
-        /performance.* report/,
-        /bagaimana.* bisnis/,
-        /kinerja.* hari/,
-        /performa.* penjualan/,
-        /business.* today/
-      ],
-      score: 0
-    }
-  };
+// Last catalog body per path with its ETag, revalidated with If-None-Match
+const catalogValidators = new Map<string, { etag: string; data: any }>();
 
-  // Calculate intent scores
-  Object.entries(patterns).forEach(([intentType, patternData]) => {
-    let score = 0;
-
-    // Keyword matching
-    patternData.keywords.forEach(keyword => {
-      if (input.includes(keyword)) {
-        score += 0.3;
-      }
-    });
-
-    // Pattern matching
-    patternData.patterns.forEach(pattern => {
-      if (pattern.test(input)) {
-        score += 0.5;
-      }
+// Fetch available sports and fields through the catalog cache
+async function getCatalogData(origin: string): Promise<{ sportsData: any; fieldsData: any }> {
+  const loadJson = (path: string) => async () => {
+    const known = catalogValidators.get(path);
+    const response = await fetch(`${origin}${path}`, {
+      cache: 'no-store',
+      headers: known ? { 'If-None-Match': known.etag } : undefined
     });
-
-    // Specific pattern matching with higher weights
-    if (input.includes('besok')) score += 0.2;
-    if (input.includes('hari ini')) score += 0.2;
-    if (input.includes('malam') || input.includes('malem')) score += 0.3;
-    if (input.includes('pagi')) score += 0.3;
-    if (input.includes('sore')) score += 0.3;
-
-    patterns[intentType as keyof typeof patterns].score = score;
-  });
-
-  // Find best match
-  let bestIntent = 'general';
-  let bestScore = 0;
-  Object.entries(patterns).forEach(([intentType, patternData]) => {
-    if (patternData.score > bestScore) {
-      bestScore = patternData.score;
-      bestIntent = intentType;
-    }
-  });
-
-  // Entity extraction
-  const entities: any = {};
-
-  // Sport extraction (ordered by priority - check longer phrases first)
-  const sportKeywords = {
-    'basketball': ['basketball', 'bola basket', 'basket'],
-    'badminton': ['badminton', 'bulutangkis', 'bulu tangkis', 'bulutangkis'],
-    'padel': ['padel', 'padel tennis', 'padle'],
-    'mini-soccer': ['mini soccer', 'minisoccer', 'mini'],
-    'futsal': ['futsal'] // remove 'bola' to avoid conflicts
+    if (response.status === 304 && known) return known.data;
+    if (!response.ok) throw new Error(`Catalog request ${path} failed with status ${response.status}`);
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) catalogValidators.set(path, { etag, data });
+    return data;
   };
 
-  for (const [sport, keywords] of Object.entries(sportKeywords)) {
-    if (keywords.some(kw => input.includes(kw))) {
-      entities.sport = sport;
-      break;
-    }
-  }
-
-  // Time preference extraction
-  if (input.includes('pagi') || input.includes('morning')) {
-    entities.timePreference = 'morning';
-  } else if (input.includes('siang')) {
-    entities.timePreference = 'noon';
-  } else if (input.includes('sore') || input.includes('afternoon')) {
-    entities.timePreference = 'afternoon';
-  } else if (input.includes('malam') || input.includes('night') || input.includes('petang') || input.includes('malem')) {
-    entities.timePreference = 'evening';
-  }
-
-  // Time extraction (patterns for specific times)
-  const timeMatch = input.match(/(\d{1,2}):(\d{2})/);
-  if (timeMatch) {
-    entities.time = timeMatch[0];
-  }
-
-  // Extract time range patterns (jam 5-6 sore, 5-6, etc.)
-  const timeRangeMatch = input.match(/jam\s*(\d{1,2})(?:\s*[-–]\s*(\d{1,2}))?(?:\s*(sore|siang|malam|malem|pagi))?/i);
-  if (timeRangeMatch) {
-    const startHour = parseInt(timeRangeMatch[1]);
-    const endHour = timeRangeMatch[2] ? parseInt(timeRangeMatch[2]) : startHour + 1;
-    entities.timeRange = {
-      start: `${startHour.toString().padStart(2, '0')}:00`,
-      end: `${endHour.toString().padStart(2, '0')}:00`,
-      timePreference: timeRangeMatch[3]?.toLowerCase() === 'malem' ? 'evening' :
-        (timeRangeMatch[3]?.toLowerCase() || 'afternoon')
-    };
-  }
-
-  // Extract field name with patterns - be more specific
-  const fieldPatterns = [
-    /padel-a/i,
-    /padel-b/i,
-    /badminton\s+court\s*(\d+)/i,
-    /basketball\s+court\s*(\d+)/i,
-    /futsal\s+field\s*(\w+)/i,
-    /mini\s+soccer\s+field\s*(\w+)/i
-  ];
-
-  for (const pattern of fieldPatterns) {
-    const match = input.match(pattern);
-    if (match) {
-      entities.fieldName = match[0];
-      break;
-    }
-  }
-
-  // Date extraction (enhanced patterns)
-  if (input.includes('besok')) {
-    const tomorrow = new Date();
-    tomorrow.setDate(tomorrow.getDate() + 1);
-    entities.date = tomorrow.toISOString().split('T')[0];
-  } else if (input.includes('hari ini')) {
-    entities.date = new Date().toISOString().split('T')[0];
-  } else if (input.includes('sabtu')) {
-    // Find next Saturday
-    const saturday = new Date();
-    const currentDay = saturday.getDay();
-    const daysUntilSaturday = (6 - currentDay + 7) % 7 || 7;
-    saturday.setDate(saturday.getDate() + daysUntilSaturday);
-    entities.date = saturday.toISOString().split('T')[0];
-    entities.dayName = 'Sabtu';
-  } else if (input.includes('minggu')) {
-    // Find next Sunday
-    const sunday = new Date();
-    const currentDay = sunday.getDay();
-    const daysUntilSunday = (0 - currentDay + 7) % 7 || 7;
-    sunday.setDate(sunday.getDate() + daysUntilSunday);
-    entities.date = sunday.toISOString().split('T')[0];
-    entities.dayName = 'Minggu';
-  } else if (input.includes('senin')) {
-    // Find next Monday
-    const monday = new Date();
-    const currentDay = monday.getDay();
-    const daysUntilMonday = (1 - currentDay + 7) % 7 || 7;
-    monday.setDate(monday.getDate() + daysUntilMonday);
-    entities.date = monday.toISOString().split('T')[0];
-    entities.dayName = 'Senin';
-  } else if (input.includes('selasa')) {
-    // Find next Tuesday
-    const tuesday = new Date();
-    const currentDay = tuesday.getDay();
-    const daysUntilTuesday = (2 - currentDay + 7) % 7 || 7;
-    tuesday.setDate(tuesday.getDate() + daysUntilTuesday);
-    entities.date = tuesday.toISOString().split('T')[0];
-    entities.dayName = 'Selasa';
-  } else if (input.includes('rabu')) {
-    // Find next Wednesday
-    const wednesday = new Date();
-    const currentDay = wednesday.getDay();
-    const daysUntilWednesday = (3 - currentDay + 7) % 7 || 7;
-    wednesday.setDate(wednesday.getDate() + daysUntilWednesday);
-    entities.date = wednesday.toISOString().split('T')[0];
-    entities.dayName = 'Rabu';
-  } else if (input.includes('kamis')) {
-    // Find next Thursday
-    const thursday = new Date();
-    const currentDay = thursday.getDay();
-    const daysUntilThursday = (4 - currentDay + 7) % 7 || 7;
-    thursday.setDate(thursday.getDate() + daysUntilThursday);
-    entities.date = thursday.toISOString().split('T')[0];
-    entities.dayName = 'Kamis';
-  } else if (input.includes('jumat')) {
-    // Find next Friday
-    const friday = new Date();
-    const currentDay = friday.getDay();
-    const daysUntilFriday = (5 - currentDay + 7) % 7 || 7;
-    friday.setDate(friday.getDate() + daysUntilFriday);
-    entities.date = friday.toISOString().split('T')[0];
-    entities.dayName = 'Jumat';
-  } else {
-    // Extract date patterns like "29 nov", "28 November", etc.
-    const today = new Date();
-    const currentYear = today.getFullYear();
-    const months: Record<string, number> = {
-      'jan': 0, 'feb': 1, 'mar': 2, 'apr': 3, 'mei': 4, 'may': 5, 'jun': 6,
-      'jul': 7, 'ags': 8, 'aug': 8, 'sep': 9, 'okt': 10, 'oct': 10, 'nov': 11, 'des': 11, 'dec': 11
-    };
-
-    const dateMatch = input.match(/(?:tanggal\s*)?(\d{1,2})\s*(jan|feb|mar|apr|mei|may|jun|jul|ags|aug|sep|okt|oct|nov|des|dec)/i);
-    if (dateMatch) {
-      const day = parseInt(dateMatch[1]);
-      const monthKey = dateMatch[2].toLowerCase();
-
-      if (months[monthKey] !== undefined) {
-        // Fix the month - November is 11 (0-indexed)
-        const monthNum = months[monthKey];
-
-        // Create date with local timezone
-        const date = new Date(currentYear, monthNum, day);
-
-        // Format date as YYYY-MM-DD in local timezone
-        const year = date.getFullYear();
-        const month = String(date.getMonth() + 1).padStart(2, '0');
-        const dayOfMonth = String(date.getDate()).padStart(2, '0');
-        entities.date = `${year}-${month}-${dayOfMonth}`;
-      }
-    }
-  }
-
-  return {
-    intent: bestIntent as any,
-    entities,
-    confidence: bestScore
-  };
+  const [sportsData, fieldsData] = await Promise.all([
+    getCached(CATALOG_CACHE_KEYS.SPORTS, 'available', loadJson('/api/sports?isAvailable=true')),
+    getCached(CATALOG_CACHE_KEYS.FIELDS, 'available', loadJson('/api/fields?isAvailable=true'))
+  ]);
+  return { sportsData, fieldsData };
 }
 
 // Extract greeting style from system prompt
@@ -462,12 +199,7 @@ async function generateContextualResponse(
           sportsData = contextData.sports;
           fieldsData = contextData.fields;
         } else {
-          const [sportsResponse, fieldsResponse] = await Promise.all([
-            fetch(`${apiUrl.origin}/api/sports?isAvailable=true`, { cache: 'no-store' }),
-            fetch(`${apiUrl.origin}/api/fields?isAvailable=true`, { cache: 'no-store' })
-          ]);
-          sportsData = await sportsResponse.json();
-          fieldsData = await fieldsResponse.json();
+          ({ sportsData, fieldsData } = await getCatalogData(apiUrl.origin));
         }
         // Ensure data is array
         if (!Array.isArray(sportsData)) sportsData = [];
@@ -550,6 +282,24 @@ async function generateContextualResponse(
           datesToCheck = dates.slice(0, 3); // Show only 3 dates instead of 5
         }
 
+        // Without client-provided bookings, load booked slots for every target
+        // field across the whole date window in one batch request
+        let batchBookedSlots: Record<string, Record<string, string[]>> | null = null;
+        if (!contextData?.bookings && targetFields.length > 0 && datesToCheck.length > 0) {
+          try {
+            const batchParams = new URLSearchParams({
+              fieldIds: targetFields.map((field: any) => field.id).join(','),
+              startDate: datesToCheck[0].date,
+              endDate: datesToCheck[datesToCheck.length - 1].date
+            });
+            const batchResponse = await fetch(`${apiUrl.origin}/api/booking/check-availability?${batchParams.toString()}`, { cache: 'no-store' });
+            if (!batchResponse.ok) throw new Error(`Availability request failed with status ${batchResponse.status}`);
+            batchBookedSlots = (await batchResponse.json()).bookedSlots || {};
+          } catch (error) {
+            console.error('Error fetching batch availability:', error);
+          }
+        }
+
         for (let dateIndex = 0; dateIndex < datesToCheck.length; dateIndex++) {
           const dateObj = datesToCheck[dateIndex];
           const dateStr = dateObj.date;
@@ -585,10 +335,9 @@ async function generateContextualResponse(
                   }
                 });
               } else {
-                // Fallback to API check
-                const availabilityResponse = await fetch(`${apiUrl.origin}/api/booking/check-availability?fieldId=${field.id}&date=${dateStr}`, { cache: 'no-store' });
-                const availabilityData_response = await availabilityResponse.json();
-                bookedSlots = availabilityData_response.bookedSlots || [];
+                // Fallback to the batch availability result
+                if (!batchBookedSlots) throw new Error('Availability data unavailable');
+                bookedSlots = batchBookedSlots[field.id]?.[dateStr] || [];
               }
 
               // Get available slots
@@ -668,12 +417,7 @@ async function generateContextualResponse(
           sportsData = contextData.sports;
           fieldsData = contextData.fields;
         } else {
-          const [sportsResponse, fieldsResponse] = await Promise.all([
-            fetch(`${apiUrl.origin}/api/sports?isAvailable=true`, { cache: 'no-store' }),
-            fetch(`${apiUrl.origin}/api/fields?isAvailable=true`, { cache: 'no-store' })
-          ]);
-          sportsData = await sportsResponse.json();
-          fieldsData = await fieldsResponse.json();
+          ({ sportsData, fieldsData } = await getCatalogData(apiUrl.origin));
         }
 
         const pricingTitle = getPromptSectionTitle(systemPrompt, 'pricing') || 'Info Harga';
@@ -852,7 +596,7 @@ async function generateContextualResponse(
 }
 
 // AI Chat handler function
-async function generateAIResponse(request: ChatRequest, baseUrl: string): Promise<{
+async function generateAIResponse(request: ChatRequest, baseUrl: string, timer: ServerTimer): Promise<{
   message: string;
   actions: Array<{
     type: 'booking' | 'redirect';
@@ -864,7 +608,7 @@ async function generateAIResponse(request: ChatRequest, baseUrl: string): Promis
   const { message, userRole, contextData } = request;
 
   // Get active system prompt from database
-  const systemPrompt = await getActiveSystemPrompt();
+  const systemPrompt = await timer.time(SERVER_TIMING_PHASES.STORE, () => getActiveSystemPrompt());
 
   // Recognize intent and extract entities
   const intent = recognizeIntent(message);
@@ -872,20 +616,22 @@ async function generateAIResponse(request: ChatRequest, baseUrl: string): Promis
   // Generate contextual response using system prompt
   const usingFallback = systemPrompt.includes('Anda adalah asisten AI untuk SportArena');
   console.log(`🤖 AI Chat using ${usingFallback ? 'fallback' : 'database'} prompt`);
-  const response = await generateContextualResponse(intent, message, userRole, systemPrompt, baseUrl, contextData);
+  const response = await timer.time('generate', () =>
+    generateContextualResponse(intent, message, userRole, systemPrompt, baseUrl, contextData)
+  );
 
   return response;
 }
 
-export async function POST(request: NextRequest) {
+export const POST = withServerTiming('/api/ai-chat', async (request: NextRequest, timer) => {
   try {
-    const body = await request.json() as ChatRequest;
+    const body = await timer.time(SERVER_TIMING_PHASES.PARSE, () => request.json()) as ChatRequest;
     const baseUrl = request.nextUrl.origin;
 
     // Generate AI response
-    const aiResponse = await generateAIResponse(body, baseUrl);
+    const aiResponse = await generateAIResponse(body, baseUrl, timer);
 
-    return NextResponse.json({
+    return timer.json({
       success: true,
       response: aiResponse
     });
@@ -899,10 +645,30 @@ export async function POST(request: NextRequest) {
       { status: 500 }
     );
   }
-}
+});
+
+// Support GET method for testing; ?prewarm=1 loads the prompt and catalog caches (scripts/prewarm.mjs)
+export async function GET(request: NextRequest) {
+  if (request.nextUrl.searchParams.get('prewarm') === '1') {
+    try {
+      const [systemPrompt, { sportsData, fieldsData }] = await Promise.all([
+        getActiveSystemPrompt(),
+        getCatalogData(request.nextUrl.origin)
+      ]);
+      return NextResponse.json({
+        success: true,
+        prewarmed: {
+          systemPrompt: systemPrompt.length > 0,
+          sports: Array.isArray(sportsData) ? sportsData.length : 0,
+          fields: Array.isArray(fieldsData) ? fieldsData.length : 0
+        }
+      });
+    } catch (error) {
+      console.error('Error prewarming chat caches:', error);
+      return NextResponse.json({ success: false, error: 'Failed to prewarm chat caches' }, { status: 500 });
+    }
+  }
 
-// Support GET method for testing
-export async function GET() {
   return NextResponse.json({
     success: true,
     message: 'AI Chat API is working. Use POST method to send chat messages.',
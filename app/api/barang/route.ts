@@ -1,28 +1,28 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getBarang } from '@/lib/demoStore';
+import { conditionalJson } from '@/lib/httpCache';
+import { withServerTiming } from '@/lib/serverTiming';
 
 /**
  * DEMO MODE: Barang API
  * 
- * - GET: Reads from localStorage
+ * - GET: Reads from localStorage; ETag / 304 and gzip or brotli via lib/httpCache
  */
 
 export const dynamic = 'force-dynamic';
 
-export async function GET(request: NextRequest) {
+export const GET = withServerTiming('/api/barang', async (request: NextRequest, timer) => {
   try {
     const category = request.nextUrl.searchParams.get('category');
     const search = request.nextUrl.searchParams.get('q');
 
-    // DEMO MODE: Read from localStorage
-    const items = getBarang({
+    // DEMO MODE: Read from localStorage; stock changes with every sale, so does the ETag
+    return await conditionalJson(request, timer, () => getBarang({
       category: category || undefined,
       search: search || undefined,
-    });
-
-    return NextResponse.json(items);
+    }));
   } catch (error) {
     console.error('Error fetching barang:', error);
     return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
   }
-}
+});
@@ -0,0 +1,174 @@
+import { NextRequest } from 'next/server';
+import {
+  Booking,
+  createBookings,
+  getBookingById,
+  updateBookingsById,
+} from '@/lib/demoStore';
+import { SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
+
+/**
+ * DEMO MODE: Bulk Booking API
+ *
+ * - POST: Creates many bookings at once (e.g. a weekly league slot for a season)
+ * - PUT: Confirms or cancels many bookings by ID
+ *
+ * Both are all-or-nothing and write localStorage ONLY (no Supabase mutation).
+ */
+
+export const dynamic = 'force-dynamic';
+
+const MAX_BULK_BOOKINGS = 1000;
+
+// "09:00" or "09:00-10:00"; single-digit hours are accepted ("8:00-9:00")
+const TIME_SLOT_PATTERN = /^(\d{1,2}):([0-5]\d)(?:-(\d{1,2}):([0-5]\d))?$/;
+const MINUTES_PER_DAY = 24 * 60;
+
+const BULK_ACTIONS: Record<string, Partial<Booking>> = {
+  confirm: { booking_status: 'confirmed' },
+  cancel: { booking_status: 'cancelled' },
+};
+
+function jsonError(error: string, status: number, extra?: Record<string, unknown>) {
+  return new Response(
+    JSON.stringify({ error, ...extra }),
+    { status, headers: { 'Content-Type': 'application/json' } }
+  );
+}
+
+// Why a time slot is invalid, or null when it is fine
+function timeSlotError(slot: unknown): string | null {
+  if (typeof slot !== 'string') return 'must be a string';
+  const match = TIME_SLOT_PATTERN.exec(slot);
+  if (!match) return 'must be HH:MM or HH:MM-HH:MM';
+  const start = Number(match[1]) * 60 + Number(match[2]);
+  if (start >= MINUTES_PER_DAY) return 'must start before 24:00';
+  if (match[3] !== undefined) {
+    const end = Number(match[3]) * 60 + Number(match[4]);
+    if (end <= start || end > MINUTES_PER_DAY) return 'must end after it starts and by 24:00';
+  }
+  return null;
+}
+
+// Same rules as POST /api/booking plus per-slot checks; returns an error message or the booking to insert
+function validateBooking(item: any): string | Omit<Booking, 'id' | 'created_at'> {
+  if (!item || typeof item !== 'object') return 'Booking must be an object';
+
+  const { field_id, field_name, booking_date, time_slots, total_price } = item;
+  if (!field_id || !field_name || !booking_date || !Array.isArray(time_slots) || time_slots.length === 0 || total_price === undefined) {
+    return 'Missing required fields';
+  }
+
+  const fieldIdInt = typeof field_id === 'string' ? parseInt(field_id) : field_id;
+  if (isNaN(fieldIdInt)) return 'Invalid field_id. Must be a number.';
+
+  const seen = new Set<string>();
+  for (let i = 0; i < time_slots.length; i++) {
+    const slot = time_slots[i];
+    const problem = timeSlotError(slot);
+    if (problem) return `Invalid time_slots[${i}] ${JSON.stringify(slot)}: ${problem}`;
+    if (seen.has(slot)) return `Duplicate time_slots[${i}] ${JSON.stringify(slot)}`;
+    seen.add(slot);
+  }
+
+  return {
+    field_id: fieldIdInt,
+    field_name,
+    booking_date,
+    time_slots,
+    total_price,
+    customer_name: item.customer_name || null,
+    customer_phone: item.customer_phone || null,
+    customer_email: item.customer_email || null,
+    booking_status: 'pending',
+    payment_status: 'pending',
+  };
+}
+
+// POST: Create bookings in one batch
+// Body: { bookings: [{ field_id, field_name, booking_date, time_slots, total_price, ... }] }
+export const POST = withServerTiming('/api/booking/bulk', async (request: NextRequest, timer) => {
+  try {
+    const body = await timer.time(SERVER_TIMING_PHASES.PARSE, () => request.json());
+    const items = body?.bookings;
+
+    if (!Array.isArray(items) || items.length === 0) {
+      return jsonError('bookings must be a non-empty array', 400);
+    }
+    if (items.length > MAX_BULK_BOOKINGS) {
+      return jsonError(`At most ${MAX_BULK_BOOKINGS} bookings per request`, 400);
+    }
+
+    const bookings: Omit<Booking, 'id' | 'created_at'>[] = [];
+    const errors: { index: number; error: string }[] = [];
+    items.forEach((item: any, index: number) => {
+      const result = validateBooking(item);
+      if (typeof result === 'string') {
+        errors.push({ index, error: result });
+      } else {
+        bookings.push(result);
+      }
+    });
+    if (errors.length > 0) {
+      return jsonError('Invalid bookings', 400, { errors });
+    }
+
+    // DEMO MODE: Check conflicts and insert the whole batch in one localStorage write
+    const { created, conflicts } = await timer.time(SERVER_TIMING_PHASES.STORE, () => createBookings(bookings));
+    if (conflicts.length > 0) {
+      return jsonError('Selected time slots are already booked', 409, { conflicts });
+    }
+
+    return timer.json({ bookings: created }, { status: 201 });
+  } catch (error) {
+    console.error('Error creating bookings in bulk:', error);
+    return jsonError('Failed to create bookings', 500);
+  }
+});
+
+// PUT: Confirm or cancel bookings by ID
+// Body: { ids: [1, 2, 3], action: 'confirm' | 'cancel' }
+export const PUT = withServerTiming('/api/booking/bulk', async (request: NextRequest, timer) => {
+  try {
+    const body = await timer.time(SERVER_TIMING_PHASES.PARSE, () => request.json());
+    const { ids, action } = body || {};
+
+    const change = Object.prototype.hasOwnProperty.call(BULK_ACTIONS, action) ? BULK_ACTIONS[action] : null;
+    if (!change) {
+      return jsonError(`action must be one of: ${Object.keys(BULK_ACTIONS).join(', ')}`, 400);
+    }
+    if (!Array.isArray(ids) || ids.length === 0) {
+      return jsonError('ids must be a non-empty array', 400);
+    }
+    if (ids.length > MAX_BULK_BOOKINGS) {
+      return jsonError(`At most ${MAX_BULK_BOOKINGS} bookings per request`, 400);
+    }
+
+    const bookingIds = ids.map((id: any) => (typeof id === 'string' ? parseInt(id) : id));
+    if (bookingIds.some((id: any) => typeof id !== 'number' || isNaN(id))) {
+      return jsonError('Invalid ids. Must be numbers.', 400);
+    }
+
+    // Validate every booking before touching any of them
+    const existing = await timer.time(SERVER_TIMING_PHASES.STORE, () => bookingIds.map((id: number) => getBookingById(id)));
+    const missing = bookingIds.filter((id: number, i: number) => !existing[i]);
+    if (missing.length > 0) {
+      return jsonError('Bookings not found', 404, { missing });
+    }
+    if (action === 'confirm') {
+      // A cancelled booking's slots may have been re-booked since
+      const cancelled = existing.filter(b => b!.booking_status === 'cancelled').map(b => b!.id);
+      if (cancelled.length > 0) {
+        return jsonError('Cancelled bookings cannot be confirmed', 409, { cancelled });
+      }
+    }
+
+    // DEMO MODE: Update all of them in one localStorage write
+    const { updated } = await timer.time(SERVER_TIMING_PHASES.STORE, () => updateBookingsById(bookingIds, change));
+
+    return timer.json({ bookings: updated }, { status: 200 });
+  } catch (error) {
+    console.error('Error updating bookings in bulk:', error);
+    return jsonError('Failed to update bookings', 500);
+  }
+});
@@ -1,14 +1,55 @@
 import { NextRequest } from 'next/server';
 import { supabase } from '@/lib/supabase';
+import { ServerTimer, SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
 
 // Ensure this route is not statically generated
 export const dynamic = 'force-dynamic';
 
-// GET: Check available time slots for a specific field and date
-export async function GET(request: NextRequest) {
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+// Upper bounds for one batch request, so a single query stays small
+const MAX_BATCH_FIELDS = 100;
+const MAX_BATCH_DAYS = 31;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Real calendar date in YYYY-MM-DD form (rejects 2025-02-30)
+function isValidDate(value: string): boolean {
+  if (!DATE_PATTERN.test(value)) return false;
+  const parsed = new Date(`${value}T00:00:00Z`);
+  return !isNaN(parsed.getTime()) && parsed.toISOString().slice(0, 10) === value;
+}
+
+// Normalize the time_slots column, which may come back as an array or a JSON string
+function parseTimeSlots(timeSlots: any): string[] {
+  if (Array.isArray(timeSlots)) {
+    // Time slots is already an array
+    return timeSlots;
+  } else if (typeof timeSlots === 'string') {
+    // Time slots is a JSON string that needs to be parsed
+    try {
+      return JSON.parse(timeSlots);
+    } catch (e) {
+      return [];
+    }
+  }
+  // Handle case where it might be an object
+  return timeSlots as string[] || [];
+}
+
+// GET: Check available time slots
+//
+// Single field: ?fieldId=1&date=2025-01-01 -> { bookedSlots: [...] }
+// Batch:        ?fieldIds=1,2,3&startDate=2025-01-01&endDate=2025-01-03
+//               -> { bookedSlots: { "1": { "2025-01-01": [...] }, ... } }
+// The batch form answers every field and day from a single query; it takes at
+// most MAX_BATCH_FIELDS fields and MAX_BATCH_DAYS days.
+export const GET = withServerTiming('/api/booking/check-availability', async (request: NextRequest, timer) => {
   try {
     const { searchParams } = new URL(request.url);
-    
+
+    if (searchParams.has('fieldIds')) {
+      return await getBatchAvailability(searchParams, timer);
+    }
+
     const fieldId = searchParams.get('fieldId');
     const date = searchParams.get('date');
 
@@ -27,45 +68,27 @@ export async function GET(request: NextRequest) {
       );
     }
 
-    const { data: relevantBookings, error } = await supabase
+    const { data: relevantBookings, error } = await timer.time(SERVER_TIMING_PHASES.STORE, () => supabase
       .from('bookings')
       .select('time_slots')
       .eq('field_id', fieldIdInt)
       .eq('booking_date', date)
-      .neq('booking_status', 'cancelled');
+      .neq('booking_status', 'cancelled'));
 
     if (error) throw error;
-    
+
     // Extract all booked time slots from the results
     const bookedSlots: string[] = [];
     if (relevantBookings) {
         relevantBookings.forEach((row: any) => {
-          let slots: string[];
-          if (Array.isArray(row.time_slots)) {
-            // Time slots is already an array
-            slots = row.time_slots;
-          } else if (typeof row.time_slots === 'string') {
-            // Time slots is a JSON string that needs to be parsed
-            try {
-                slots = JSON.parse(row.time_slots);
-            } catch (e) {
-                slots = [];
-            }
-          } else {
-            // Handle case where it might be an object
-            slots = row.time_slots as string[] || [];
-          }
-          bookedSlots.push(...slots);
+          bookedSlots.push(...parseTimeSlots(row.time_slots));
         });
     }
 
     // Remove duplicates
     const uniqueBookedSlots = Array.from(new Set(bookedSlots));
 
-    return new Response(
-      JSON.stringify({ bookedSlots: uniqueBookedSlots }),
-      { status: 200, headers: { 'Content-Type': 'application/json' } }
-    );
+    return timer.json({ bookedSlots: uniqueBookedSlots }, { status: 200 });
   } catch (error) {
     console.error('Error checking availability:', error);
     return new Response(
@@ -73,4 +96,87 @@ export async function GET(request: NextRequest) {
       { status: 500, headers: { 'Content-Type': 'application/json' } }
     );
   }
+});
+
+async function getBatchAvailability(searchParams: URLSearchParams, timer: ServerTimer) {
+  const fieldIds = (searchParams.get('fieldIds') || '')
+    .split(',')
+    .filter(id => id.trim() !== '')
+    .map(id => parseInt(id));
+  const startDate = searchParams.get('startDate') || searchParams.get('date');
+  const endDate = searchParams.get('endDate') || startDate;
+
+  if (fieldIds.length === 0 || !startDate || !endDate) {
+    return new Response(
+      JSON.stringify({ error: 'fieldIds and startDate are required' }),
+      { status: 400, headers: { 'Content-Type': 'application/json' } }
+    );
+  }
+
+  if (fieldIds.some(id => isNaN(id))) {
+    return new Response(
+      JSON.stringify({ error: 'Invalid fieldIds. Must be comma-separated numbers.' }),
+      { status: 400, headers: { 'Content-Type': 'application/json' } }
+    );
+  }
+
+  if (new Set(fieldIds).size > MAX_BATCH_FIELDS) {
+    return new Response(
+      JSON.stringify({ error: `At most ${MAX_BATCH_FIELDS} fieldIds per request` }),
+      { status: 400, headers: { 'Content-Type': 'application/json' } }
+    );
+  }
+
+  if (!isValidDate(startDate) || !isValidDate(endDate)) {
+    return new Response(
+      JSON.stringify({ error: 'Invalid date. Use YYYY-MM-DD.' }),
+      { status: 400, headers: { 'Content-Type': 'application/json' } }
+    );
+  }
+
+  // Both dates are validated YYYY-MM-DD, so they compare as strings
+  if (startDate > endDate) {
+    return new Response(
+      JSON.stringify({ error: 'startDate must not be after endDate' }),
+      { status: 400, headers: { 'Content-Type': 'application/json' } }
+    );
+  }
+
+  const days = (Date.parse(endDate) - Date.parse(startDate)) / DAY_MS + 1;
+  if (days > MAX_BATCH_DAYS) {
+    return new Response(
+      JSON.stringify({ error: `The date range may span at most ${MAX_BATCH_DAYS} days` }),
+      { status: 400, headers: { 'Content-Type': 'application/json' } }
+    );
+  }
+
+  const { data: relevantBookings, error } = await timer.time(SERVER_TIMING_PHASES.STORE, () => supabase
+    .from('bookings')
+    .select('field_id, booking_date, time_slots')
+    .in('field_id', fieldIds)
+    .gte('booking_date', startDate)
+    .lte('booking_date', endDate)
+    .neq('booking_status', 'cancelled'));
+
+  if (error) throw error;
+
+  // Every requested field is present in the result, even with nothing booked
+  const slotSets: Record<number, Record<string, Set<string>>> = {};
+  fieldIds.forEach(id => { slotSets[id] = {}; });
+
+  (relevantBookings || []).forEach((row: any) => {
+    const byDate = slotSets[row.field_id] || (slotSets[row.field_id] = {});
+    const slots = byDate[row.booking_date] || (byDate[row.booking_date] = new Set<string>());
+    parseTimeSlots(row.time_slots).forEach(slot => slots.add(slot));
+  });
+
+  const bookedSlots: Record<number, Record<string, string[]>> = {};
+  Object.entries(slotSets).forEach(([fieldId, byDate]) => {
+    bookedSlots[Number(fieldId)] = {};
+    Object.entries(byDate).forEach(([date, slots]) => {
+      bookedSlots[Number(fieldId)][date] = Array.from(slots);
+    });
+  });
+
+  return timer.json({ bookedSlots }, { status: 200 });
 }
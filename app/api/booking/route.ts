@@ -2,19 +2,22 @@ import { NextRequest } from 'next/server';
 import {
   getBookings,
   createBooking,
+  hasBookingConflict,
 } from '@/lib/demoStore';
+import { ndjsonResponse, wantsNdjson } from '@/lib/ndjson';
+import { SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
 
 /**
  * DEMO MODE: Booking API
  * 
- * - GET: Reads from localStorage
+ * - GET: Reads from localStorage (?format=ndjson streams one booking per line)
  * - POST: Writes to localStorage ONLY (no Supabase mutation)
  */
 
 export const dynamic = 'force-dynamic';
 
 // GET: Fetch bookings (with optional filters)
-export async function GET(request: NextRequest) {
+export const GET = withServerTiming('/api/booking', async (request: NextRequest, timer) => {
   try {
     const { searchParams } = new URL(request.url);
 
@@ -24,16 +27,17 @@ export async function GET(request: NextRequest) {
     const status = searchParams.get('status');
 
     // DEMO MODE: Read from localStorage
-    const bookings = getBookings({
+    const bookings = await timer.time(SERVER_TIMING_PHASES.STORE, () => getBookings({
       fieldId: fieldId ? parseInt(fieldId) : undefined,
       date: date || undefined,
       status: status || undefined,
-    });
+    }));
 
-    return new Response(JSON.stringify(bookings), {
-      status: 200,
-      headers: { 'Content-Type': 'application/json' },
-    });
+    if (wantsNdjson(searchParams)) {
+      return ndjsonResponse(bookings, { status: 200 });
+    }
+
+    return timer.json(bookings, { status: 200 });
   } catch (error) {
     console.error('Error fetching bookings:', error);
     return new Response(
@@ -41,12 +45,12 @@ export async function GET(request: NextRequest) {
       { status: 500, headers: { 'Content-Type': 'application/json' } }
     );
   }
-}
+});
 
 // POST: Create a new booking
-export async function POST(request: NextRequest) {
+export const POST = withServerTiming('/api/booking', async (request: NextRequest, timer) => {
   try {
-    const body = await request.json();
+    const body = await timer.time(SERVER_TIMING_PHASES.PARSE, () => request.json());
 
     const {
       field_id,
@@ -77,26 +81,17 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    // DEMO MODE: Check for existing bookings in localStorage
-    const existingBookings = getBookings({
-      fieldId: fieldIdInt,
-      date: booking_date,
-    }).filter(b => b.booking_status !== 'cancelled');
-
-    // Check for time slot conflicts
-    for (const booking of existingBookings) {
-      const existingSlots = Array.isArray(booking.time_slots) ? booking.time_slots : [];
-      const hasConflict = time_slots.some((slot: string) => existingSlots.includes(slot));
-      if (hasConflict) {
-        return new Response(
-          JSON.stringify({ error: 'Selected time slots are already booked' }),
-          { status: 409, headers: { 'Content-Type': 'application/json' } }
-        );
-      }
+    // DEMO MODE: Check for time slot conflicts against the indexed slot bitmap
+    const conflict = await timer.time(SERVER_TIMING_PHASES.STORE, () => hasBookingConflict(fieldIdInt, booking_date, time_slots));
+    if (conflict) {
+      return new Response(
+        JSON.stringify({ error: 'Selected time slots are already booked' }),
+        { status: 409, headers: { 'Content-Type': 'application/json' } }
+      );
     }
 
     // DEMO MODE: Create booking in localStorage only
-    const newBooking = createBooking({
+    const newBooking = await timer.time(SERVER_TIMING_PHASES.STORE, () => createBooking({
       field_id: fieldIdInt,
       field_name,
       booking_date,
@@ -107,12 +102,9 @@ export async function POST(request: NextRequest) {
       customer_email: customer_email || null,
       booking_status: 'pending',
       payment_status: 'pending'
-    });
+    }));
 
-    return new Response(JSON.stringify(newBooking), {
-      status: 201,
-      headers: { 'Content-Type': 'application/json' },
-    });
+    return timer.json(newBooking, { status: 201 });
   } catch (error) {
     console.error('Error creating booking:', error);
     return new Response(
@@ -120,4 +112,4 @@ export async function POST(request: NextRequest) {
       { status: 500, headers: { 'Content-Type': 'application/json' } }
     );
   }
-}
+});
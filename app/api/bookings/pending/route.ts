@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getPendingBookings } from '@/lib/demoStore';
+import { SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
 
 /**
  * DEMO MODE: Pending Bookings API
@@ -9,16 +10,16 @@ import { getPendingBookings } from '@/lib/demoStore';
 
 export const dynamic = 'force-dynamic';
 
-export async function GET(request: NextRequest) {
+export const GET = withServerTiming('/api/bookings/pending', async (request: NextRequest, timer) => {
   try {
     const search = request.nextUrl.searchParams.get('q');
 
     // DEMO MODE: Read from localStorage
-    const pendingBookings = getPendingBookings(search || undefined);
+    const pendingBookings = await timer.time(SERVER_TIMING_PHASES.STORE, () => getPendingBookings(search || undefined));
 
-    return NextResponse.json({ data: pendingBookings });
+    return timer.json({ data: pendingBookings });
   } catch (error) {
     console.error('Error fetching pending bookings:', error);
     return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
   }
-}
+});
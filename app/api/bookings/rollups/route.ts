@@ -0,0 +1,64 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { getBookingRollups, getFieldWithSportById, getFieldsWithSport } from '@/lib/demoStore';
+import { SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
+
+/**
+ * DEMO MODE: Booking Rollups API
+ *
+ * - GET: Reads the per-day x field x status booking aggregates from localStorage
+ *
+ * Filters: ?from=YYYY-MM-DD&to=YYYY-MM-DD (inclusive, on the transaction day),
+ * ?fieldId=, ?sportId=, ?status=. Each row carries count, revenue and slots,
+ * joined with the field's sport.
+ */
+
+export const dynamic = 'force-dynamic';
+
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+
+export const GET = withServerTiming('/api/bookings/rollups', async (request: NextRequest, timer) => {
+  try {
+    const searchParams = request.nextUrl.searchParams;
+    const from = searchParams.get('from');
+    const to = searchParams.get('to');
+    const fieldId = searchParams.get('fieldId');
+    const sportId = searchParams.get('sportId');
+    const status = searchParams.get('status');
+
+    if ((from && !DATE_PATTERN.test(from)) || (to && !DATE_PATTERN.test(to))) {
+      return NextResponse.json({ error: 'from and to must be YYYY-MM-DD' }, { status: 400 });
+    }
+    if ((fieldId && isNaN(parseInt(fieldId))) || (sportId && isNaN(parseInt(sportId)))) {
+      return NextResponse.json({ error: 'fieldId and sportId must be numbers' }, { status: 400 });
+    }
+
+    // DEMO MODE: Read from localStorage
+    const rollups = await timer.time(SERVER_TIMING_PHASES.STORE, () => {
+      let fieldIds: number[] | undefined = fieldId ? [parseInt(fieldId)] : undefined;
+      if (sportId) {
+        const sportFieldIds = getFieldsWithSport({ sportId: parseInt(sportId) }).map(f => f.id);
+        fieldIds = fieldIds ? fieldIds.filter(id => sportFieldIds.includes(id)) : sportFieldIds;
+      }
+
+      return getBookingRollups({
+        from: from || undefined,
+        to: to || undefined,
+        fieldIds,
+        status: status || undefined,
+      }).map(row => {
+        const field = getFieldWithSportById(row.field_id);
+        return {
+          ...row,
+          field_name: field ? field.field_name : null,
+          sport_id: field ? field.sport_id : null,
+          sport_name: field ? field.sport_name : null,
+        };
+      });
+    });
+
+    return timer.json({ data: rollups });
+  } catch (error) {
+    console.error('Error fetching booking rollups:', error);
+    return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+  }
+});
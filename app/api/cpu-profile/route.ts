@@ -0,0 +1,71 @@
+import { NextRequest, NextResponse } from 'next/server';
+import {
+  CpuProfileConflictError,
+  isCpuProfileRunning,
+  isCpuProfilingEnabled,
+  startCpuProfile,
+  stopCpuProfile,
+} from '@/lib/cpuProfiler';
+
+/**
+ * CPU profiling API (development only)
+ *
+ * Exists only when the server runs with CPU_PROFILE=1 (npm run dev:profile);
+ * otherwise every request gets 404.
+ *
+ * - POST { action: 'start', samplingIntervalUs? }: begin sampling
+ * - POST { action: 'stop' }: end sampling; returns { profile, requests } where
+ *   profile is a .cpuprofile and requests the per-request windows (lib/cpuProfiler)
+ * - GET: { running }
+ */
+
+export const dynamic = 'force-dynamic';
+
+const MIN_SAMPLING_INTERVAL_US = 50;
+
+export async function GET() {
+  if (!isCpuProfilingEnabled()) {
+    return NextResponse.json({ error: 'Not found' }, { status: 404 });
+  }
+  return NextResponse.json({ running: isCpuProfileRunning() });
+}
+
+export async function POST(request: NextRequest) {
+  if (!isCpuProfilingEnabled()) {
+    return NextResponse.json({ error: 'Not found' }, { status: 404 });
+  }
+
+  let body: { action?: string; samplingIntervalUs?: number };
+  try {
+    body = await request.json();
+  } catch (error) {
+    return NextResponse.json({ error: 'Invalid JSON body' }, { status: 400 });
+  }
+
+  try {
+    if (body.action === 'start') {
+      const interval = body.samplingIntervalUs ?? 1000;
+      if (!Number.isInteger(interval) || interval < MIN_SAMPLING_INTERVAL_US) {
+        return NextResponse.json(
+          { error: `samplingIntervalUs must be an integer of at least ${MIN_SAMPLING_INTERVAL_US}` },
+          { status: 400 }
+        );
+      }
+      await startCpuProfile(interval);
+      return NextResponse.json({ running: true, samplingIntervalUs: interval });
+    }
+
+    if (body.action === 'stop') {
+      return NextResponse.json(await stopCpuProfile());
+    }
+
+    return NextResponse.json({ error: "action must be 'start' or 'stop'" }, { status: 400 });
+  } catch (error) {
+    // Already running or starting on start, nothing running on stop
+    if (error instanceof CpuProfileConflictError) {
+      return NextResponse.json({ error: error.message }, { status: 409 });
+    }
+    console.error('Error handling CPU profile request:', error);
+    return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
+  }
+}
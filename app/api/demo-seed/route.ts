@@ -1,5 +1,11 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
+import {
+    DEFAULT_SYNC_BATCH,
+    MAX_SYNC_BATCH,
+    decodeSyncCursor,
+    fetchSeedDelta,
+} from '@/lib/seedSync';
 
 /**
  * Demo Seeding API
@@ -9,11 +15,21 @@ import { supabase } from '@/lib/supabase';
  * 
  * CRITICAL: Supabase is ONLY used for SELECT queries here.
  * No mutations will ever be made to Supabase.
+ *
+ * Delta mode: ?delta=1 (first sync) or ?cursor=<token> returns only rows
+ * changed since the cursor, at most ?limit= per table, as
+ * { success, data: { sports: { columns, rows }, ... }, cursor, hasMore }.
+ * Repeat with the returned cursor while hasMore is true. See lib/seedSync.ts.
  */
 
 export const dynamic = 'force-dynamic';
 
 export async function GET(request: NextRequest) {
+    const { searchParams } = new URL(request.url);
+    if (searchParams.has('cursor') || searchParams.get('delta') === '1') {
+        return getDelta(searchParams);
+    }
+
     try {
         // Fetch all data from Supabase (READ ONLY)
         const [
@@ -83,3 +99,25 @@ export async function GET(request: NextRequest) {
         );
     }
 }
+
+async function getDelta(searchParams: URLSearchParams) {
+    const cursor = decodeSyncCursor(searchParams.get('cursor'));
+    if (!cursor) {
+        return NextResponse.json({ success: false, error: 'Invalid cursor' }, { status: 400 });
+    }
+
+    const limitParam = searchParams.get('limit');
+    const limit = limitParam !== null ? parseInt(limitParam) : DEFAULT_SYNC_BATCH;
+    if (isNaN(limit) || limit < 1 || limit > MAX_SYNC_BATCH) {
+        return NextResponse.json({ success: false, error: `limit must be between 1 and ${MAX_SYNC_BATCH}` }, { status: 400 });
+    }
+
+    try {
+        // Fetch the next batch of changed rows from Supabase (READ ONLY)
+        const delta = await fetchSeedDelta(supabase, cursor, limit);
+        return NextResponse.json({ success: true, ...delta });
+    } catch (error) {
+        console.error('Error fetching demo seed delta:', error);
+        return NextResponse.json({ success: false, error: 'Failed to fetch demo seed delta' }, { status: 500 });
+    }
+}
@@ -1,12 +1,11 @@
 import { NextRequest } from 'next/server';
 import {
-  getFieldById,
-  getFieldImages,
-  getSportById,
+  getFieldWithSportById,
   updateField,
   deleteField,
   getBookings,
 } from '@/lib/demoStore';
+import { CATALOG_CACHE_KEYS, invalidateCatalog } from '@/lib/catalogCache';
 
 /**
  * DEMO MODE: Fields [id] API
@@ -67,15 +66,16 @@ export async function PUT(request: NextRequest, { params }: { params: { id: stri
       );
     }
 
+    invalidateCatalog(CATALOG_CACHE_KEYS.FIELDS);
+
     // Get sport and updated images for response
-    const sport = getSportById(parseInt(sport_id));
-    const updatedImages = getFieldImages(fieldId);
+    const joined = getFieldWithSportById(fieldId);
 
     const result = {
       ...updatedField,
-      sport_name: sport ? sport.sport_name : null,
-      sport_type: sport ? sport.sport_type : null,
-      images: updatedImages.map(i => i.url_image)
+      sport_name: joined ? joined.sport_name : null,
+      sport_type: joined ? joined.sport_type : null,
+      images: joined ? joined.images : []
     };
 
     return new Response(JSON.stringify(result), {
@@ -116,6 +116,8 @@ export async function DELETE(request: NextRequest, { params }: { params: { id: s
       );
     }
 
+    invalidateCatalog(CATALOG_CACHE_KEYS.FIELDS);
+
     return new Response(
       JSON.stringify({ message: 'Field deleted successfully' }),
       { status: 200, headers: { 'Content-Type': 'application/json' } }
@@ -134,29 +136,16 @@ export async function GET(request: NextRequest, { params }: { params: { id: stri
   try {
     const fieldId = parseInt(params.id);
 
-    // DEMO MODE: Read from localStorage
-    const field = getFieldById(fieldId);
+    // DEMO MODE: Read the joined field (sport + images) from the fields view
+    const result = getFieldWithSportById(fieldId);
 
-    if (!field) {
+    if (!result) {
       return new Response(
         JSON.stringify({ error: 'Field not found' }),
         { status: 404, headers: { 'Content-Type': 'application/json' } }
       );
     }
 
-    // Get sport and images
-    const sport = getSportById(field.sport_id);
-    const images = getFieldImages(fieldId);
-    const imageUrls = images.map(img => img.url_image);
-
-    const result = {
-      ...field,
-      sport_name: sport ? sport.sport_name : null,
-      sport_type: sport ? sport.sport_type : null,
-      images: imageUrls,
-      url_image: imageUrls.length > 0 ? imageUrls[0] : field.url_image
-    };
-
     return new Response(JSON.stringify(result), {
       status: 200,
       headers: { 'Content-Type': 'application/json' },
@@ -1,22 +1,24 @@
 import { NextRequest } from 'next/server';
 import {
-  getFields,
-  getFieldImages,
-  getSportById,
+  getFieldsWithSport,
+  getFieldWithSportById,
   createField,
 } from '@/lib/demoStore';
+import { CATALOG_CACHE_KEYS, invalidateCatalog } from '@/lib/catalogCache';
+import { conditionalJson } from '@/lib/httpCache';
+import { SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
 
 /**
  * DEMO MODE: Fields API
  * 
- * - GET: Reads from localStorage
+ * - GET: Reads from localStorage; ETag / 304 and gzip or brotli via lib/httpCache
  * - POST: Writes to localStorage ONLY (no Supabase mutation)
  */
 
 export const dynamic = 'force-dynamic';
 
 // GET: Fetch fields (with optional filters)
-export async function GET(request: NextRequest) {
+export const GET = withServerTiming('/api/fields', async (request: NextRequest, timer) => {
   try {
     const { searchParams } = new URL(request.url);
 
@@ -25,42 +27,12 @@ export async function GET(request: NextRequest) {
     const sportId = searchParams.get('sportId');
     const fieldCode = searchParams.get('fieldCode');
 
-    // DEMO MODE: Read from localStorage
-    const fields = getFields({
+    // DEMO MODE: Read the precomputed fields + sport + images view
+    return await conditionalJson(request, timer, () => getFieldsWithSport({
       isAvailable: isAvailable !== null ? (isAvailable === 'true' || isAvailable === '1') : undefined,
       sportId: sportId ? parseInt(sportId) : undefined,
       fieldCode: fieldCode || undefined,
-    });
-
-    // Get images for these fields
-    const fieldImages = getFieldImages();
-    const imagesMap: Record<number, string[]> = {};
-    fieldImages.forEach((img) => {
-      if (!imagesMap[img.field_id]) {
-        imagesMap[img.field_id] = [];
-      }
-      imagesMap[img.field_id].push(img.url_image);
-    });
-
-    // Get sports data for joining
-    const result = fields.map((field) => {
-      const sport = getSportById(field.sport_id);
-      const images = imagesMap[field.id] || [];
-      const mainImage = images.length > 0 ? images[0] : field.url_image;
-
-      return {
-        ...field,
-        sport_name: sport ? sport.sport_name : null,
-        sport_type: sport ? sport.sport_type : null,
-        url_image: mainImage,
-        images: images
-      };
-    });
-
-    return new Response(JSON.stringify(result), {
-      status: 200,
-      headers: { 'Content-Type': 'application/json' },
-    });
+    }));
   } catch (error) {
     console.error('Error fetching fields:', error);
     return new Response(
@@ -68,12 +40,12 @@ export async function GET(request: NextRequest) {
       { status: 500, headers: { 'Content-Type': 'application/json' } }
     );
   }
-}
+});
 
 // POST: Create a new field
-export async function POST(request: NextRequest) {
+export const POST = withServerTiming('/api/fields', async (request: NextRequest, timer) => {
   try {
-    const body = await request.json();
+    const body = await timer.time(SERVER_TIMING_PHASES.PARSE, () => request.json());
 
     const {
       field_name,
@@ -103,7 +75,7 @@ export async function POST(request: NextRequest) {
     }
 
     // DEMO MODE: Create in localStorage only
-    const newField = createField({
+    const newField = await timer.time(SERVER_TIMING_PHASES.STORE, () => createField({
       field_name,
       field_code,
       sport_id: parseInt(sport_id),
@@ -111,22 +83,20 @@ export async function POST(request: NextRequest) {
       description: description || null,
       url_image: finalImages.length > 0 ? finalImages[0] : null,
       is_available: is_available ? 1 : 0,
-    }, finalImages);
+    }, finalImages));
+    invalidateCatalog(CATALOG_CACHE_KEYS.FIELDS);
 
-    // Get sport info for response
-    const sport = getSportById(parseInt(sport_id));
+    // Joined row for the response (sport info + images)
+    const joined = getFieldWithSportById(newField.id);
 
     const result = {
       ...newField,
-      sport_name: sport ? sport.sport_name : null,
-      sport_type: sport ? sport.sport_type : null,
+      sport_name: joined ? joined.sport_name : null,
+      sport_type: joined ? joined.sport_type : null,
       images: finalImages
     };
 
-    return new Response(JSON.stringify(result), {
-      status: 201,
-      headers: { 'Content-Type': 'application/json' },
-    });
+    return timer.json(result, { status: 201 });
   } catch (error) {
     console.error('Error creating field:', error);
     return new Response(
@@ -134,4 +104,4 @@ export async function POST(request: NextRequest) {
       { status: 500, headers: { 'Content-Type': 'application/json' } }
     );
   }
-}
+});
@@ -1,58 +1,83 @@
 import { NextRequest, NextResponse } from 'next/server';
 import {
-    getPemasukan,
-    getPemasukanDetail,
-    getBookingById,
-    getBarangById,
-    createPemasukan,
-    createPemasukanDetail,
-    updateMultipleBookings,
-    updateBarangStock,
+    getPemasukanHistory,
+    iteratePemasukanHistory,
+    checkout,
 } from '@/lib/demoStore';
+import { ndjsonResponse, wantsNdjson } from '@/lib/ndjson';
+import { SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
 
 /**
  * DEMO MODE: Pemasukan API
  * 
  * - GET: Reads from localStorage
  * - POST: Writes to localStorage ONLY (no Supabase mutation)
+ *
+ * GET filters: ?id=, ?invoice=, ?from=YYYY-MM-DD&to=YYYY-MM-DD (inclusive).
+ * Passing ?limit= (and then ?cursor=<nextCursor>) pages the history and
+ * returns { data, nextCursor } instead of a plain array. ?format=ndjson
+ * streams every matching row, one per line, for exports; it ignores paging.
  */
 
 export const dynamic = 'force-dynamic';
 
-export async function GET(request: NextRequest) {
+const MAX_PAGE_SIZE = 200;
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+
+export const GET = withServerTiming('/api/pemasukan', async (request: NextRequest, timer) => {
     try {
         const { searchParams } = new URL(request.url);
         const id = searchParams.get('id');
         const invoice = searchParams.get('invoice');
+        const from = searchParams.get('from');
+        const to = searchParams.get('to');
+        const limitParam = searchParams.get('limit');
+        const cursorParam = searchParams.get('cursor');
 
-        // DEMO MODE: Read from localStorage
-        let pemasukanList = getPemasukan({
-            id: id ? parseInt(id) : undefined,
-            invoice: invoice || undefined,
-        });
+        if ((from && !DATE_PATTERN.test(from)) || (to && !DATE_PATTERN.test(to))) {
+            return NextResponse.json({ error: 'from and to must be YYYY-MM-DD' }, { status: 400 });
+        }
 
-        // Enrich with details and bookings
-        const result = pemasukanList.map(pemasukan => {
-            const details = getPemasukanDetail(pemasukan.id);
-            const booking = pemasukan.id_booking ? getBookingById(pemasukan.id_booking) : null;
+        if (wantsNdjson(searchParams)) {
+            // Rows are joined lazily as the client reads the stream
+            return ndjsonResponse(iteratePemasukanHistory({
+                id: id ? parseInt(id) : undefined,
+                invoice: invoice || undefined,
+                from: from || undefined,
+                to: to || undefined,
+            }));
+        }
 
-            return {
-                ...pemasukan,
-                pemasukan_detail: details,
-                bookings: booking ? { ...booking, fields: { field_name: booking.field_name } } : null,
-            };
-        });
+        const paginated = limitParam !== null || cursorParam !== null;
+        const limit = limitParam !== null ? parseInt(limitParam) : (paginated ? 50 : undefined);
+        if (limit !== undefined && (isNaN(limit) || limit < 1 || limit > MAX_PAGE_SIZE)) {
+            return NextResponse.json({ error: `limit must be between 1 and ${MAX_PAGE_SIZE}` }, { status: 400 });
+        }
+        const cursor = cursorParam !== null ? parseInt(cursorParam) : undefined;
+        if (cursor !== undefined && isNaN(cursor)) {
+            return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+        }
 
-        return NextResponse.json(result);
+        // DEMO MODE: Read from localStorage, joining details and bookings for this page only
+        const page = await timer.time(SERVER_TIMING_PHASES.STORE, () => getPemasukanHistory({
+            id: id ? parseInt(id) : undefined,
+            invoice: invoice || undefined,
+            from: from || undefined,
+            to: to || undefined,
+            cursor,
+            limit,
+        }));
+
+        return timer.json(paginated ? page : page.data);
     } catch (error) {
         console.error('Error fetching pemasukan:', error);
         return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
     }
-}
+});
 
-export async function POST(request: NextRequest) {
+export const POST = withServerTiming('/api/pemasukan', async (request: NextRequest, timer) => {
     try {
-        const body = await request.json();
+        const body = await timer.time(SERVER_TIMING_PHASES.PARSE, () => request.json());
         const { booking_id, booking_ids, items, amount, user_name } = body;
 
         if (!amount) {
@@ -67,77 +92,22 @@ export async function POST(request: NextRequest) {
             allBookingIds = [booking_id];
         }
 
-        // 1. Get booking details from localStorage
-        let bookingDetails: any[] = [];
-        if (allBookingIds.length > 0) {
-            bookingDetails = allBookingIds
-                .map(id => getBookingById(id))
-                .filter(b => b !== null);
-        }
-
-        // 2. Create Pemasukan in localStorage
-        const primaryBookingId = allBookingIds.length > 0 ? allBookingIds[0] : undefined;
+        const barangItems = Array.isArray(items)
+            ? items.filter((item: any) => item.type === 'barang')
+            : [];
 
-        const payment = createPemasukan({
-            id_booking: primaryBookingId,
+        // DEMO MODE: Income row, invoice lines, stock and booking status in one transaction
+        const { payment } = await timer.time(SERVER_TIMING_PHASES.STORE, () => checkout({
             amount: Number(amount),
-            created_by: user_name || 'System',
-            updated_by: user_name || 'System',
-        });
-
-        // 3. Add Booking Details to Invoice
-        for (const booking of bookingDetails) {
-            createPemasukanDetail({
-                pemasukan_id: payment.id,
-                nomor_invoice: payment.nomor_invoice,
-                barang_id: undefined,
-                nama_barang: `Sewa Lapangan: ${booking.field_name} (${booking.booking_date})`,
-                harga_satuan: booking.total_price,
-                qty: 1,
-                subtotal: booking.total_price,
-            });
-        }
-
-        // 4. Update Booking Status (for all linked bookings)
-        if (allBookingIds.length > 0) {
-            updateMultipleBookings(allBookingIds, {
-                payment_status: 'paid',
-                booking_status: 'confirmed',
-            });
-        }
-
-        // 5. Process Items (Stock Deduction) and Add to Invoice Details
-        if (items && Array.isArray(items)) {
-            for (const item of items) {
-                if (item.type === 'barang') {
-                    const currentItem = getBarangById(item.id);
-
-                    if (currentItem) {
-                        const qty = Number(item.quantity) || 1;
-                        const newStock = Math.max(0, currentItem.stok - qty);
-
-                        // Update Stock in localStorage
-                        updateBarangStock(item.id, newStock);
-
-                        // Add to invoice details
-                        createPemasukanDetail({
-                            pemasukan_id: payment.id,
-                            nomor_invoice: payment.nomor_invoice,
-                            barang_id: currentItem.id,
-                            nama_barang: currentItem.nama_barang,
-                            harga_satuan: currentItem.harga,
-                            qty: qty,
-                            subtotal: Number(currentItem.harga) * qty,
-                        });
-                    }
-                }
-            }
-        }
+            user_name,
+            booking_ids: allBookingIds,
+            items: barangItems,
+        }));
 
-        return NextResponse.json({ success: true, payment });
+        return timer.json({ success: true, payment });
 
     } catch (error) {
         console.error('Payment processing error:', error);
         return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
     }
-}
+});
@@ -5,6 +5,7 @@ import {
   deleteSport,
   getFields,
 } from '@/lib/demoStore';
+import { CATALOG_CACHE_KEYS, invalidateCatalog } from '@/lib/catalogCache';
 
 /**
  * DEMO MODE: Sports [id] API
@@ -52,6 +53,9 @@ export async function PUT(request: NextRequest, { params }: { params: { id: stri
       );
     }
 
+    // Fields embed sport_name/sport_type, so both catalogs go stale
+    invalidateCatalog(CATALOG_CACHE_KEYS.SPORTS, CATALOG_CACHE_KEYS.FIELDS);
+
     return new Response(JSON.stringify(updatedSport), {
       status: 200,
       headers: { 'Content-Type': 'application/json' },
@@ -91,6 +95,8 @@ export async function DELETE(request: NextRequest, { params }: { params: { id: s
       );
     }
 
+    invalidateCatalog(CATALOG_CACHE_KEYS.SPORTS, CATALOG_CACHE_KEYS.FIELDS);
+
     return new Response(
       JSON.stringify({ message: 'Sport deleted successfully' }),
       { status: 200, headers: { 'Content-Type': 'application/json' } }
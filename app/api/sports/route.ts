@@ -3,33 +3,35 @@ import {
   getSports,
   createSport,
 } from '@/lib/demoStore';
+import { CATALOG_CACHE_KEYS, invalidateCatalog } from '@/lib/catalogCache';
+import { conditionalJson } from '@/lib/httpCache';
+import { SERVER_TIMING_PHASES, withServerTiming } from '@/lib/serverTiming';
 
 /**
  * DEMO MODE: Sports API
  * 
- * - GET: Reads from localStorage (demo data)
+ * - GET: Reads from localStorage (demo data); ETag / 304 and gzip or brotli via lib/httpCache
  * - POST: Writes to localStorage ONLY (no Supabase mutation)
  */
 
 export const dynamic = 'force-dynamic';
 
-export async function GET(request: NextRequest) {
+export const GET = withServerTiming('/api/sports', async (request: NextRequest, timer) => {
   try {
     const searchParams = request.nextUrl.searchParams;
     const showAll = searchParams.get('show_all') === 'true';
 
-    const sports = getSports(showAll);
-
-    return NextResponse.json(sports);
+    // Unchanged data is answered with a 304 (ETag from the body, lib/httpCache)
+    return await conditionalJson(request, timer, () => getSports(showAll));
   } catch (error) {
     console.error('Error fetching sports:', error);
     return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
   }
-}
+});
 
-export async function POST(request: NextRequest) {
+export const POST = withServerTiming('/api/sports', async (request: NextRequest, timer) => {
   try {
-    const body = await request.json();
+    const body = await timer.time(SERVER_TIMING_PHASES.PARSE, () => request.json());
     const {
       sport_name,
       sport_type,
@@ -46,17 +48,18 @@ export async function POST(request: NextRequest) {
     }
 
     // DEMO MODE: Create in localStorage only
-    const newSport = createSport({
+    const newSport = await timer.time(SERVER_TIMING_PHASES.STORE, () => createSport({
       sport_name,
       sport_type,
       description,
       is_available: is_available ? 1 : 0,
       updated_at: new Date().toISOString()
-    });
+    }));
+    invalidateCatalog(CATALOG_CACHE_KEYS.SPORTS);
 
-    return NextResponse.json(newSport, { status: 201 });
+    return timer.json(newSport, { status: 201 });
   } catch (error) {
     console.error('Error in POST /api/sports:', error);
     return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
   }
-}
+});
@@ -4,6 +4,7 @@ import {
   updateSystemPrompt,
   deleteSystemPrompt,
 } from '@/lib/demoStore';
+import { CATALOG_CACHE_KEYS, invalidateCatalog } from '@/lib/catalogCache';
 
 /**
  * DEMO MODE: System Prompts [id] API
@@ -83,6 +84,8 @@ export async function PUT(
       );
     }
 
+    invalidateCatalog(CATALOG_CACHE_KEYS.SYSTEM_PROMPTS);
+
     return NextResponse.json({
       success: true,
       data: updatedPrompt
@@ -131,6 +134,8 @@ export async function DELETE(
       );
     }
 
+    invalidateCatalog(CATALOG_CACHE_KEYS.SYSTEM_PROMPTS);
+
     return NextResponse.json({
       success: true,
       data: { id: promptId }
@@ -3,6 +3,7 @@ import {
   getSystemPrompts,
   createSystemPrompt,
 } from '@/lib/demoStore';
+import { CATALOG_CACHE_KEYS, invalidateCatalog } from '@/lib/catalogCache';
 
 /**
  * DEMO MODE: System Prompts API
@@ -61,6 +62,7 @@ export async function POST(request: NextRequest) {
       created_by: created_by || null,
       is_active: false, // Default to inactive for new prompts
     });
+    invalidateCatalog(CATALOG_CACHE_KEYS.SYSTEM_PROMPTS);
 
     return NextResponse.json({
       success: true,
@@ -1,34 +1,101 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { writeFile } from 'fs/promises';
-import path from 'path';
-import { v4 as uuidv4 } from 'uuid';
+import {
+  IMAGE_TYPES,
+  MAX_UPLOAD_BYTES,
+  MULTIPART_OVERHEAD_BYTES,
+  UploadTooLargeError,
+  imageExtension,
+  limitStream,
+  saveImageStream,
+} from '@/lib/imageUpload';
+import { imageVariantUrl, IMAGE_VARIANT_WIDTHS, prewarmImageVariants } from '@/lib/imageVariants';
+
+/**
+ * Image Upload API
+ *
+ * - POST with the raw image as the body (Content-Type: image/jpeg, image/png,
+ *   ...) streams it to public/images without holding it in memory.
+ * - POST multipart/form-data with a `file` field is still accepted. The form
+ *   is parsed in memory, so its body is capped at MAX_UPLOAD_BYTES plus
+ *   MULTIPART_OVERHEAD_BYTES while it arrives.
+ *
+ * Files are stored as /images/<content hash>.<ext>, at most MAX_UPLOAD_BYTES.
+ * The response lists the resized/WebP variant URLs, which are generated in
+ * the background right after the upload.
+ */
+
+export const dynamic = 'force-dynamic';
 
 export async function POST(request: NextRequest) {
   try {
-    const formData = await request.formData();
-    const file = formData.get('file') as File;
+    const contentType = (request.headers.get('content-type') || '').split(';')[0].trim().toLowerCase();
+    const declaredLength = parseInt(request.headers.get('content-length') || '', 10);
+    const isMultipart = contentType === 'multipart/form-data';
+    const bodyLimit = isMultipart ? MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES : MAX_UPLOAD_BYTES;
+
+    // Refuse early when the client announces an oversized body
+    if (declaredLength > bodyLimit) {
+      return tooLarge();
+    }
+
+    let body: ReadableStream<Uint8Array> | null;
+    let ext: string | null;
+    if (isMultipart) {
+      if (!request.body) {
+        return NextResponse.json(
+          { error: 'No file uploaded' },
+          { status: 400 }
+        );
+      }
+      // Cut off a chunked or mislabelled body before formData() buffers all of it
+      const formData = await new Response(limitStream(request.body, bodyLimit), {
+        headers: { 'content-type': request.headers.get('content-type') || '' },
+      }).formData();
+      const file = formData.get('file');
+
+      if (!file || typeof file === 'string') {
+        return NextResponse.json(
+          { error: 'No file uploaded' },
+          { status: 400 }
+        );
+      }
+      if (file.size > MAX_UPLOAD_BYTES) {
+        return tooLarge();
+      }
+      body = file.stream();
+      ext = imageExtension(file.name) || IMAGE_TYPES[file.type] || null;
+    } else {
+      body = request.body;
+      ext = IMAGE_TYPES[contentType] || null;
+    }
 
-    if (!file) {
+    if (!ext) {
+      return NextResponse.json(
+        { error: `Only ${Object.keys(IMAGE_TYPES).join(', ')} images can be uploaded` },
+        { status: 415 }
+      );
+    }
+    if (!body) {
       return NextResponse.json(
         { error: 'No file uploaded' },
         { status: 400 }
       );
     }
 
-    const buffer = Buffer.from(await file.arrayBuffer());
-    const filename = `${uuidv4()}${path.extname(file.name)}`;
-    const uploadDir = path.join(process.cwd(), 'public/images');
-    
-    // Ensure the directory exists (although public/images should exist)
-    // await mkdir(uploadDir, { recursive: true }); 
-
-    const filePath = path.join(uploadDir, filename);
-    await writeFile(filePath, buffer);
+    const { url, bytes } = await saveImageStream(body, ext);
 
-    const relativePath = `/images/${filename}`;
+    // Fill the variant cache without making the uploader wait for it
+    prewarmImageVariants(new URL(request.url).origin, url).catch(() => { });
 
-    return NextResponse.json({ url: relativePath });
+    return NextResponse.json({
+      url,
+      bytes,
+      variants: IMAGE_VARIANT_WIDTHS.map(width => ({ width, url: imageVariantUrl(url, width) })),
+    });
   } catch (error) {
+    if (error instanceof UploadTooLargeError) {
+      return tooLarge();
+    }
     console.error('Error uploading file:', error);
     return NextResponse.json(
       { error: 'Failed to upload file' },
@@ -36,3 +103,10 @@ export async function POST(request: NextRequest) {
     );
   }
 }
+
+function tooLarge() {
+  return NextResponse.json(
+    { error: `File is larger than ${MAX_UPLOAD_BYTES} bytes` },
+    { status: 413 }
+  );
+}
@@ -1,6 +1,7 @@
 'use client';
 
 import { useEffect, useState } from 'react';
+import { imageVariantUrl, IMAGE_VARIANT_WIDTHS } from '@/lib/imageVariants';
 
 export default function Hero() {
   const [scrollY, setScrollY] = useState(0);
@@ -25,7 +26,8 @@ export default function Hero() {
         <div
           className="absolute inset-0 bg-cover bg-center bg-no-repeat transform-gpu"
           style={{
-            backgroundImage: "url('/images/background.png')",
+            // Resized WebP variant instead of the multi-megabyte original
+            backgroundImage: `url('${imageVariantUrl('/images/background.png', IMAGE_VARIANT_WIDTHS[2])}')`,
             transform: `rotateX(20deg) rotateY(10deg) translateY(${scrollY * 0.1}px) scale(1.1)`,
             transformOrigin: 'center center',
           }}
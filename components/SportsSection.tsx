@@ -11,6 +11,7 @@ import {
 } from "@/components/ui/carousel";
 import { Button } from './ui/button';
 import { useSportsDemo, useFieldsDemo } from '@/hooks/useDemoData';
+import { imageVariantSrcSet, imageVariantUrl, IMAGE_VARIANT_WIDTHS } from '@/lib/imageVariants';
 
 // Types are imported from hooks/useDemoData but existing local interfaces might differ slightly.
 // demoStore.Sport matches local Sport except is_available is number.
@@ -115,7 +116,9 @@ const FieldImageCarousel = ({ images, defaultImage, fieldName, isAvailable }: {
           {imageList.map((src, index) => (
             <CarouselItem key={index} className="pl-0 h-full">
               <img
-                src={getSportImage('', src)}
+                src={imageVariantUrl(getSportImage('', src), IMAGE_VARIANT_WIDTHS[1])}
+                srcSet={imageVariantSrcSet(getSportImage('', src))}
+                sizes="100vw"
                 alt={`${fieldName} - ${index + 1}`}
                 className="w-full h-full object-cover"
               />
@@ -5,8 +5,13 @@ import {
     isDemoInitialized,
     seedDemoData,
     resetDemoData,
+    applySeedDelta,
+    getSyncCursor,
+    setSyncCursor,
     DEMO_STORAGE_KEYS,
+    SeedRows,
 } from '@/lib/demoStore';
+import { SEED_TABLES, unpackRows } from '@/lib/seedSync';
 
 interface DemoContextType {
     isInitialized: boolean;
@@ -26,6 +31,42 @@ export function useDemoContext() {
     return useContext(DemoContext);
 }
 
+// Fetch and unpack one delta batch from /api/demo-seed
+async function fetchSeedBatch(cursor: string | null): Promise<{ rows: SeedRows; cursor: string; hasMore: boolean }> {
+    const query = cursor ? `cursor=${encodeURIComponent(cursor)}` : 'delta=1';
+    const response = await fetch(`/api/demo-seed?${query}`);
+
+    if (!response.ok) {
+        throw new Error('Failed to fetch demo seed data');
+    }
+
+    const result = await response.json();
+    if (!result.success) {
+        throw new Error(result.error || 'Failed to fetch demo seed data');
+    }
+
+    const rows: SeedRows = {};
+    SEED_TABLES.forEach(({ key }) => {
+        rows[key] = unpackRows<{ id: number }>(result.data?.[key]);
+    });
+    return { rows, cursor: result.cursor, hasMore: Boolean(result.hasMore) };
+}
+
+// Pull only the rows changed upstream since this browser last synced
+async function catchUpDemoData(): Promise<void> {
+    let cursor = getSyncCursor();
+    // Seeded before delta sync existed: there is no mark to resume from
+    if (!cursor) return;
+
+    let hasMore = true;
+    while (hasMore) {
+        const batch = await fetchSeedBatch(cursor);
+        if (!applySeedDelta(batch.rows, batch.cursor)) break;
+        cursor = batch.cursor;
+        hasMore = batch.hasMore;
+    }
+}
+
 export function DemoProvider({ children }: { children: React.ReactNode }) {
     const [isInitialized, setIsInitialized] = useState(false);
     const [isLoading, setIsLoading] = useState(true);
@@ -41,27 +82,40 @@ export function DemoProvider({ children }: { children: React.ReactNode }) {
                 console.log('Demo already initialized, using existing localStorage data.');
                 setIsInitialized(true);
                 setIsLoading(false);
+
+                // Refresh in the background with what changed since the last sync
+                catchUpDemoData().catch(err => console.warn('Demo delta sync failed:', err));
                 return;
             }
 
-            // Fetch seed data from API (which reads from Supabase)
+            // Fetch seed data from API (which reads from Supabase) in batches
             console.log('Fetching demo seed data from Supabase...');
-            const response = await fetch('/api/demo-seed');
-
-            if (!response.ok) {
-                throw new Error('Failed to fetch demo seed data');
+            const seed: Required<SeedRows> = {
+                sports: [],
+                fields: [],
+                fieldImages: [],
+                bookings: [],
+                barang: [],
+                pemasukan: [],
+                pemasukanDetail: [],
+                systemPrompts: [],
+            };
+            let cursor: string | null = null;
+            let hasMore = true;
+            while (hasMore) {
+                const batch = await fetchSeedBatch(cursor);
+                SEED_TABLES.forEach(({ key }) => seed[key].push(...(batch.rows[key] || [])));
+                cursor = batch.cursor;
+                hasMore = batch.hasMore;
             }
 
-            const result = await response.json();
-
-            if (result.success && result.data) {
-                // Seed localStorage with the fetched data
-                seedDemoData(result.data);
-                console.log('Demo data seeded successfully!');
-                setIsInitialized(true);
-            } else {
-                throw new Error(result.error || 'Failed to seed demo data');
-            }
+            // Seed localStorage with the fetched data; batches arrive in change
+            // order, so store each collection in id order
+            Object.values(seed).forEach(rows => rows.sort((a, b) => a.id - b.id));
+            seedDemoData(seed as unknown as Parameters<typeof seedDemoData>[0]);
+            if (cursor) setSyncCursor(cursor);
+            console.log('Demo data seeded successfully!');
+            setIsInitialized(true);
         } catch (err) {
             console.error('Error initializing demo:', err);
             setError(err instanceof Error ? err.message : 'Unknown error');
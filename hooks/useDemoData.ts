@@ -5,7 +5,7 @@ import { useDemoContext } from '@/contexts/DemoContext';
 import * as demoStore from '@/lib/demoStore';
 
 // Re-export types
-export type { Sport, Field, FieldImage, Booking, Barang, Pemasukan, PemasukanDetail, SystemPrompt } from '@/lib/demoStore';
+export type { Sport, Field, FieldImage, Booking, BookingRollup, Barang, Pemasukan, PemasukanDetail, SystemPrompt } from '@/lib/demoStore';
 
 /**
  * Custom hook for Demo Mode CRUD operations
@@ -81,21 +81,8 @@ export function useFieldsDemo() {
 
     const loadFields = useCallback((filters?: Parameters<typeof demoStore.getFields>[0]) => {
         if (!isInitialized) return;
-        const data = demoStore.getFields(filters);
-
-        // Enrich with sport info and images
-        const fieldImages = demoStore.getFieldImages();
-        const enrichedFields = data.map(field => {
-            const sport = demoStore.getSportById(field.sport_id);
-            const images = fieldImages.filter(i => i.field_id === field.id).map(i => i.url_image);
-            return {
-                ...field,
-                sport_name: sport?.sport_name || null,
-                sport_type: sport?.sport_type || null,
-                images,
-                url_image: images[0] || field.url_image,
-            };
-        });
+        // Fields already joined with sport info and images
+        const enrichedFields = demoStore.getFieldsWithSport(filters);
 
         setFields(enrichedFields as any);
         setLoading(false);
@@ -183,16 +170,8 @@ export function useBookingsDemo() {
 
     const createBooking = useCallback((data: Omit<demoStore.Booking, 'id' | 'created_at'>) => {
         // Check for conflicts
-        const existingBookings = demoStore.getBookings({
-            fieldId: data.field_id,
-            date: data.booking_date,
-        }).filter(b => b.booking_status !== 'cancelled');
-
-        for (const booking of existingBookings) {
-            const hasConflict = data.time_slots.some(slot => booking.time_slots.includes(slot));
-            if (hasConflict) {
-                return { success: false, error: 'Time slots already booked' };
-            }
+        if (demoStore.hasBookingConflict(data.field_id, data.booking_date, data.time_slots)) {
+            return { success: false, error: 'Time slots already booked' };
         }
 
         const newBooking = demoStore.createBooking(data);
@@ -209,11 +188,7 @@ export function useBookingsDemo() {
     }, []);
 
     const checkAvailability = useCallback((fieldId: number, date: string) => {
-        const bookings = demoStore.getBookings({ fieldId, date })
-            .filter(b => b.booking_status !== 'cancelled');
-
-        const bookedSlots = bookings.flatMap(b => b.time_slots);
-        return [...new Set(bookedSlots)];
+        return demoStore.getBookedSlots(fieldId, date);
     }, []);
 
     useEffect(() => {
@@ -233,6 +208,28 @@ export function useBookingsDemo() {
     };
 }
 
+// Not loaded automatically: callers pass their period filter to loadRollups
+// once the demo data is initialized, and again whenever bookings change
+export function useBookingRollupsDemo() {
+    const { isInitialized } = useDemoContext();
+    const [rollups, setRollups] = useState<demoStore.BookingRollup[]>([]);
+    const [loading, setLoading] = useState(true);
+
+    const loadRollups = useCallback((filters?: Parameters<typeof demoStore.getBookingRollups>[0]) => {
+        if (!isInitialized) return;
+        const data = demoStore.getBookingRollups(filters);
+        setRollups(data);
+        setLoading(false);
+    }, [isInitialized]);
+
+    return {
+        isInitialized,
+        rollups,
+        loading,
+        loadRollups,
+    };
+}
+
 // ==================== BARANG HOOKS ====================
 
 export function useBarangDemo() {
@@ -282,62 +279,14 @@ export function usePemasukanDemo() {
     }) => {
         const { amount, user_name, booking_ids = [], items = [] } = payload;
 
-        // Get booking details
-        const bookingDetails = booking_ids.map(id => demoStore.getBookingById(id)).filter(Boolean);
-
-        // Create pemasukan
-        const payment = demoStore.createPemasukan({
-            id_booking: booking_ids[0],
+        // Income row, invoice lines, stock and booking status in one transaction
+        const { payment } = demoStore.checkout({
             amount,
-            created_by: user_name || 'System',
-            updated_by: user_name || 'System',
+            user_name,
+            booking_ids,
+            items: items.filter(item => item.type === 'barang'),
         });
 
-        // Add booking details
-        for (const booking of bookingDetails) {
-            if (booking) {
-                demoStore.createPemasukanDetail({
-                    pemasukan_id: payment.id,
-                    nomor_invoice: payment.nomor_invoice,
-                    barang_id: undefined,
-                    nama_barang: `Sewa Lapangan: ${booking.field_name} (${booking.booking_date})`,
-                    harga_satuan: booking.total_price,
-                    qty: 1,
-                    subtotal: booking.total_price,
-                });
-            }
-        }
-
-        // Update booking status
-        if (booking_ids.length > 0) {
-            demoStore.updateMultipleBookings(booking_ids, {
-                payment_status: 'paid',
-                booking_status: 'confirmed',
-            });
-        }
-
-        // Process barang items
-        for (const item of items) {
-            if (item.type === 'barang') {
-                const currentItem = demoStore.getBarangById(item.id);
-                if (currentItem) {
-                    const qty = item.quantity || 1;
-                    const newStock = Math.max(0, currentItem.stok - qty);
-                    demoStore.updateBarangStock(item.id, newStock);
-
-                    demoStore.createPemasukanDetail({
-                        pemasukan_id: payment.id,
-                        nomor_invoice: payment.nomor_invoice,
-                        barang_id: currentItem.id,
-                        nama_barang: currentItem.nama_barang,
-                        harga_satuan: currentItem.harga,
-                        qty,
-                        subtotal: currentItem.harga * qty,
-                    });
-                }
-            }
-        }
-
         setPemasukanList(prev => [payment, ...prev]);
         return { success: true, payment };
     }, []);
@@ -0,0 +1,83 @@
+/**
+ * Process-level cache for rarely changing catalog reads
+ * (sports, fields, active system prompt).
+ *
+ * Entries expire after a short TTL and are dropped explicitly by the
+ * routes that mutate the underlying collection. Concurrent misses for the
+ * same entry share one in-flight load. State lives on globalThis so every
+ * route bundle in the server process sees the same cache.
+ */
+
+export const CATALOG_CACHE_KEYS = {
+    SPORTS: 'sports',
+    FIELDS: 'fields',
+    SYSTEM_PROMPTS: 'system_prompts',
+} as const;
+
+export type CatalogCacheKey = typeof CATALOG_CACHE_KEYS[keyof typeof CATALOG_CACHE_KEYS];
+
+export const CATALOG_CACHE_TTL_MS = 30_000;
+
+interface CacheEntry {
+    value?: unknown;
+    expiresAt: number;
+    pending?: Promise<unknown>;
+}
+
+type CatalogCacheStore = Map<CatalogCacheKey, Map<string, CacheEntry>>;
+
+const globalForCache = globalThis as unknown as { __catalogCache?: CatalogCacheStore };
+const store: CatalogCacheStore = globalForCache.__catalogCache || (globalForCache.__catalogCache = new Map());
+
+function entriesFor(collection: CatalogCacheKey): Map<string, CacheEntry> {
+    let entries = store.get(collection);
+    if (!entries) {
+        entries = new Map();
+        store.set(collection, entries);
+    }
+    return entries;
+}
+
+// Return the cached value for collection/variant, loading it on a miss.
+// A failed load is not cached; the error propagates to the caller.
+export async function getCached<T>(
+    collection: CatalogCacheKey,
+    variant: string,
+    loader: () => Promise<T>,
+    ttlMs: number = CATALOG_CACHE_TTL_MS
+): Promise<T> {
+    const entries = entriesFor(collection);
+    const existing = entries.get(variant);
+    const now = Date.now();
+
+    if (existing) {
+        if (existing.pending) return existing.pending as Promise<T>;
+        if (existing.expiresAt > now) return existing.value as T;
+    }
+
+    const entry: CacheEntry = { expiresAt: 0 };
+    entry.pending = loader().then(
+        value => {
+            // Only keep the result if nothing invalidated the entry meanwhile
+            // (invalidateCatalog empties this same map, so a stale load no longer finds itself)
+            if (entries.get(variant) === entry) {
+                entry.value = value;
+                entry.expiresAt = Date.now() + ttlMs;
+                entry.pending = undefined;
+            }
+            return value;
+        },
+        error => {
+            if (entries.get(variant) === entry) entries.delete(variant);
+            throw error;
+        }
+    );
+    entries.set(variant, entry);
+    return entry.pending as Promise<T>;
+}
+
+// Drop every cached variant of the given collections. The maps are cleared
+// in place so loads already in flight see that their entry is gone.
+export function invalidateCatalog(...collections: CatalogCacheKey[]): void {
+    collections.forEach(collection => store.get(collection)?.clear());
+}
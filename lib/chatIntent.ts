@@ -0,0 +1,393 @@
+/**
+ * Intent and entity recognition for /api/ai-chat.
+ *
+ * Every phrase the chat reacts to (intent keywords, the "a ... b" intent
+ * patterns, sports, time of day, day names, months) is compiled once into
+ * an Aho–Corasick automaton with a dense transition table. A message is
+ * scanned a single time; the set of phrases seen drives intent scoring and
+ * the sport, time-of-day and date entities. The regexes that capture
+ * numbers (clock times, "jam 5-6 sore", "29 nov", field names) are compiled
+ * once as well and only run when the scan saw the word they anchor on.
+ *
+ * Scores, priorities and results are the same as the original keyword
+ * loops: phrases are checked in their table order, first match wins.
+ */
+
+export type ChatIntent = 'availability' | 'pricing' | 'booking' | 'transaction' | 'general' | 'help';
+
+export type TimePreference = 'morning' | 'noon' | 'afternoon' | 'evening';
+
+export interface ChatEntities {
+    sport?: string;
+    time?: string;
+    date?: string;
+    dayName?: string;
+    timePreference?: TimePreference;
+    timeRange?: {
+        start: string;
+        end: string;
+        timePreference: string;
+    };
+    fieldName?: string;
+}
+
+export interface RecognizedIntent {
+    intent: ChatIntent;
+    entities: ChatEntities;
+    confidence: number;
+}
+
+// ==================== RULES ====================
+
+const KEYWORD_SCORE = 0.3;
+const PATTERN_SCORE = 0.5;
+
+// Patterns are phrases, or two phrases joined by ".*" (second after the first, same line)
+const INTENT_RULES: Array<{ intent: ChatIntent; keywords: string[]; patterns: string[] }> = [
+    {
+        intent: 'availability',
+        keywords: ['jadwal', 'ketersediaan', 'tersedia', 'kosong', 'slot', 'bisa', 'booking', 'main', 'pakai', 'sewa'],
+        patterns: [
+            'kapan.* bisa', 'jam.* tersedia', 'slot.* kosong', 'schedule.* available', 'what time.* free',
+            'when can.* play', 'bisa main', 'kapan main', 'cek jadwal', 'mau sewa', 'cari lapangan',
+            'butuh lapangan', 'sabtu.* kosong', 'minggu.* tersedia', 'senin.* bisa', ' hari.* masih ada'
+        ]
+    },
+    {
+        intent: 'pricing',
+        keywords: ['harga', 'price', 'biaya', 'cost', 'tarif', 'ongkos', 'murah', 'mahal'],
+        patterns: ['berapa harga', 'price.* list', 'how much', 'cost.* per', 'tarif.* per', 'biaya.* sewa', 'harga.* lapangan']
+    },
+    {
+        intent: 'booking',
+        keywords: ['booking', ' reservasi', 'pesan', 'order', 'book', 'reserve', 'daftar'],
+        patterns: ['want to book', 'buat booking', 'pesan lapangan', 'reservasi', 'book.* field', 'sewa lapangan', 'mau booking', 'booking.* now']
+    },
+    {
+        intent: 'transaction',
+        keywords: [
+            'transaksi', 'pemasukan', 'pengeluaran', 'laporan', 'revenue', 'income', 'profit', 'financial',
+            'bisnis', 'omset', 'penjualan', 'kinerja', 'performa'
+        ],
+        patterns: [
+            'laporan.* keuangan', 'rekap.* transaksi', 'summary.* financial', 'cek omset', 'how.* business',
+            'performance.* report', 'bagaimana.* bisnis', 'kinerja.* hari', 'performa.* penjualan', 'business.* today'
+        ]
+    }
+];
+
+// Added to every intent's score, so they only lift a message above 'general'
+const SHARED_BOOSTS: Array<[string[], number]> = [
+    [['besok'], 0.2],
+    [['hari ini'], 0.2],
+    [['malam', 'malem'], 0.3],
+    [['pagi'], 0.3],
+    [['sore'], 0.3]
+];
+
+// Ordered by priority - longer phrases of overlapping sports first
+const SPORT_KEYWORDS: Array<[string, string[]]> = [
+    ['basketball', ['basketball', 'bola basket', 'basket']],
+    ['badminton', ['badminton', 'bulutangkis', 'bulu tangkis']],
+    ['padel', ['padel', 'padel tennis', 'padle']],
+    ['mini-soccer', ['mini soccer', 'minisoccer', 'mini']],
+    ['futsal', ['futsal']] // no 'bola' to avoid conflicts
+];
+
+const TIME_OF_DAY: Array<[TimePreference, string[]]> = [
+    ['morning', ['pagi', 'morning']],
+    ['noon', ['siang']],
+    ['afternoon', ['sore', 'afternoon']],
+    ['evening', ['malam', 'night', 'petang', 'malem']]
+];
+
+const RELATIVE_DAYS: Array<[string, number]> = [['besok', 1], ['hari ini', 0]];
+
+// Day names resolve to the next such day (a week ahead when it is today)
+const WEEKDAYS: Array<[string, number, string]> = [
+    ['sabtu', 6, 'Sabtu'],
+    ['minggu', 0, 'Minggu'],
+    ['senin', 1, 'Senin'],
+    ['selasa', 2, 'Selasa'],
+    ['rabu', 3, 'Rabu'],
+    ['kamis', 4, 'Kamis'],
+    ['jumat', 5, 'Jumat']
+];
+
+const MONTHS: Record<string, number> = {
+    'jan': 0, 'feb': 1, 'mar': 2, 'apr': 3, 'mei': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'ags': 8, 'aug': 8, 'sep': 9, 'okt': 10, 'oct': 10, 'nov': 11, 'des': 11, 'dec': 11
+};
+
+const TIME_PATTERN = /(\d{1,2}):(\d{2})/;
+const TIME_RANGE_PATTERN = /jam\s*(\d{1,2})(?:\s*[-–]\s*(\d{1,2}))?(?:\s*(sore|siang|malam|malem|pagi))?/i;
+const DATE_PATTERN = /(?:tanggal\s*)?(\d{1,2})\s*(jan|feb|mar|apr|mei|may|jun|jul|ags|aug|sep|okt|oct|nov|des|dec)/i;
+const FIELD_PATTERNS = [
+    /padel-a/i,
+    /padel-b/i,
+    /badminton\s+court\s*(\d+)/i,
+    /basketball\s+court\s*(\d+)/i,
+    /futsal\s+field\s*(\w+)/i,
+    /mini\s+soccer\s+field\s*(\w+)/i
+];
+
+// ==================== AUTOMATON ====================
+
+interface PhraseAutomaton {
+    // Characters outside every phrase share class 0, which leads back to the root
+    charClass: Uint8Array;
+    classCount: number;
+    // next state = delta[state * classCount + class]
+    delta: Int32Array;
+    // Phrase ids ending in each state, including those of its suffix states
+    outputs: number[][];
+    lengths: number[];
+}
+
+function compileAutomaton(phrases: string[]): PhraseAutomaton {
+    const charClass = new Uint8Array(128);
+    let classCount = 1;
+    phrases.forEach(phrase => {
+        for (let i = 0; i < phrase.length; i++) {
+            const code = phrase.charCodeAt(i);
+            if (code >= 128) throw new Error(`Non-ASCII chat phrase: ${phrase}`);
+            if (!charClass[code]) charClass[code] = classCount++;
+        }
+    });
+
+    const trie: number[][] = [new Array(classCount).fill(-1)];
+    const outputs: number[][] = [[]];
+    phrases.forEach((phrase, id) => {
+        let state = 0;
+        for (let i = 0; i < phrase.length; i++) {
+            const cls = charClass[phrase.charCodeAt(i)];
+            if (trie[state][cls] === -1) {
+                trie[state][cls] = trie.length;
+                trie.push(new Array(classCount).fill(-1));
+                outputs.push([]);
+            }
+            state = trie[state][cls];
+        }
+        outputs[state].push(id);
+    });
+
+    // Breadth-first, so a state's failure target is complete before the state itself;
+    // missing edges borrow the failure state's edge, which turns the trie into a DFA
+    const delta = new Int32Array(trie.length * classCount);
+    const fail = new Int32Array(trie.length);
+    const queue: number[] = [];
+    for (let cls = 0; cls < classCount; cls++) {
+        const next = trie[0][cls];
+        delta[cls] = next > 0 ? next : 0;
+        if (next > 0) queue.push(next);
+    }
+    for (let head = 0; head < queue.length; head++) {
+        const state = queue[head];
+        outputs[state] = outputs[state].concat(outputs[fail[state]]);
+        for (let cls = 0; cls < classCount; cls++) {
+            const next = trie[state][cls];
+            const fallback = delta[fail[state] * classCount + cls];
+            if (next > 0) {
+                fail[next] = fallback;
+                delta[state * classCount + cls] = next;
+                queue.push(next);
+            } else {
+                delta[state * classCount + cls] = fallback;
+            }
+        }
+    }
+
+    return { charClass, classCount, delta, outputs, lengths: phrases.map(phrase => phrase.length) };
+}
+
+// ==================== COMPILED MATCHER ====================
+
+const phraseIds = new Map<string, number>();
+const phraseList: string[] = [];
+
+function phraseId(phrase: string): number {
+    let id = phraseIds.get(phrase);
+    if (id === undefined) {
+        id = phraseList.length;
+        phraseIds.set(phrase, id);
+        phraseList.push(phrase);
+    }
+    return id;
+}
+
+// A pattern hits when `first` was seen and, for "a.* b" patterns, `then` starts after it on the same line
+interface CompiledPattern {
+    first: number;
+    then: number;
+}
+
+const compiledPatterns: CompiledPattern[] = [];
+
+function compilePattern(pattern: string): number {
+    const parts = pattern.split('.*');
+    if (parts.length > 2) throw new Error(`Unsupported chat pattern: ${pattern}`);
+    compiledPatterns.push({ first: phraseId(parts[0]), then: parts.length === 2 ? phraseId(parts[1]) : -1 });
+    return compiledPatterns.length - 1;
+}
+
+const phraseIdsOf = (phrases: string[]) => phrases.map(phraseId);
+
+const intentRules = INTENT_RULES.map(rule => ({
+    intent: rule.intent,
+    keywords: phraseIdsOf(rule.keywords),
+    patterns: rule.patterns.map(compilePattern)
+}));
+const sharedBoosts = SHARED_BOOSTS.map(([phrases, score]) => [phraseIdsOf(phrases), score] as const);
+const sportKeywords = SPORT_KEYWORDS.map(([sport, phrases]) => [sport, phraseIdsOf(phrases)] as const);
+const timeOfDay = TIME_OF_DAY.map(([preference, phrases]) => [preference, phraseIdsOf(phrases)] as const);
+const relativeDays = RELATIVE_DAYS.map(([phrase, offset]) => [phraseId(phrase), offset] as const);
+const weekdays = WEEKDAYS.map(([phrase, day, name]) => [phraseId(phrase), day, name] as const);
+const monthAnchors = phraseIdsOf(Object.keys(MONTHS));
+const timeAnchor = phraseId(':');
+const timeRangeAnchor = phraseId('jam');
+const fieldAnchors = phraseIdsOf(['padel-', 'court', 'field']);
+
+// Sequence patterns to check when their second phrase ends
+const sequencesByLast: number[][] = phraseList.map(() => []);
+compiledPatterns.forEach((pattern, index) => {
+    if (pattern.then !== -1) sequencesByLast[pattern.then].push(index);
+});
+
+const automaton = compileAutomaton(phraseList);
+
+interface MessageMatch {
+    seen: Uint8Array;
+    patternHits: Uint8Array;
+}
+
+function scanMessage(input: string): MessageMatch {
+    const { charClass, classCount, delta, outputs, lengths } = automaton;
+    const seen = new Uint8Array(phraseList.length);
+    const patternHits = new Uint8Array(compiledPatterns.length);
+    // Where each phrase first ended on the current line; regex "." stops at line breaks
+    const firstEndLine = new Int32Array(phraseList.length).fill(-1);
+    const firstEnd = new Int32Array(phraseList.length);
+    let line = 0;
+    let state = 0;
+
+    for (let i = 0; i < input.length; i++) {
+        const code = input.charCodeAt(i);
+        if (code === 10 || code === 13 || code === 0x2028 || code === 0x2029) line++;
+        state = delta[state * classCount + (code < 128 ? charClass[code] : 0)];
+
+        const ended = outputs[state];
+        for (let k = 0; k < ended.length; k++) {
+            const id = ended[k];
+            seen[id] = 1;
+            if (firstEndLine[id] !== line) {
+                firstEndLine[id] = line;
+                firstEnd[id] = i + 1;
+            }
+            const sequences = sequencesByLast[id];
+            for (let s = 0; s < sequences.length; s++) {
+                const first = compiledPatterns[sequences[s]].first;
+                if (firstEndLine[first] === line && firstEnd[first] <= i + 1 - lengths[id]) {
+                    patternHits[sequences[s]] = 1;
+                }
+            }
+        }
+    }
+
+    compiledPatterns.forEach((pattern, index) => {
+        if (pattern.then === -1 && seen[pattern.first]) patternHits[index] = 1;
+    });
+    return { seen, patternHits };
+}
+
+// ==================== RECOGNITION ====================
+
+const toIsoDay = (date: Date) => date.toISOString().split('T')[0];
+
+export function recognizeIntent(message: string): RecognizedIntent {
+    const input = message.toLowerCase();
+    const { seen, patternHits } = scanMessage(input);
+    const anySeen = (ids: readonly number[]) => ids.some(id => seen[id] === 1);
+
+    // Intent scores, summed in the same order as the keyword tables
+    let bestIntent: ChatIntent = 'general';
+    let bestScore = 0;
+    intentRules.forEach(rule => {
+        let score = 0;
+        rule.keywords.forEach(id => {
+            if (seen[id]) score += KEYWORD_SCORE;
+        });
+        rule.patterns.forEach(index => {
+            if (patternHits[index]) score += PATTERN_SCORE;
+        });
+        sharedBoosts.forEach(([ids, boost]) => {
+            if (anySeen(ids)) score += boost;
+        });
+        if (score > bestScore) {
+            bestScore = score;
+            bestIntent = rule.intent;
+        }
+    });
+
+    const entities: ChatEntities = {};
+
+    const sport = sportKeywords.find(([, ids]) => anySeen(ids));
+    if (sport) entities.sport = sport[0];
+
+    const preference = timeOfDay.find(([, ids]) => anySeen(ids));
+    if (preference) entities.timePreference = preference[0];
+
+    if (seen[timeAnchor]) {
+        const timeMatch = input.match(TIME_PATTERN);
+        if (timeMatch) entities.time = timeMatch[0];
+    }
+
+    // Time ranges like "jam 5-6 sore" or "jam 7"
+    if (seen[timeRangeAnchor]) {
+        const timeRangeMatch = input.match(TIME_RANGE_PATTERN);
+        if (timeRangeMatch) {
+            const startHour = parseInt(timeRangeMatch[1]);
+            const endHour = timeRangeMatch[2] ? parseInt(timeRangeMatch[2]) : startHour + 1;
+            entities.timeRange = {
+                start: `${startHour.toString().padStart(2, '0')}:00`,
+                end: `${endHour.toString().padStart(2, '0')}:00`,
+                timePreference: timeRangeMatch[3]?.toLowerCase() === 'malem' ? 'evening' :
+                    (timeRangeMatch[3]?.toLowerCase() || 'afternoon')
+            };
+        }
+    }
+
+    if (anySeen(fieldAnchors)) {
+        for (const pattern of FIELD_PATTERNS) {
+            const match = input.match(pattern);
+            if (match) {
+                entities.fieldName = match[0];
+                break;
+            }
+        }
+    }
+
+    // Dates: relative words, then day names, then "29 nov" style dates
+    const relative = relativeDays.find(([id]) => seen[id]);
+    const weekday = relative ? undefined : weekdays.find(([id]) => seen[id]);
+    if (relative) {
+        const date = new Date();
+        date.setDate(date.getDate() + relative[1]);
+        entities.date = toIsoDay(date);
+    } else if (weekday) {
+        const date = new Date();
+        date.setDate(date.getDate() + ((weekday[1] - date.getDay() + 7) % 7 || 7));
+        entities.date = toIsoDay(date);
+        entities.dayName = weekday[2];
+    } else if (anySeen(monthAnchors)) {
+        const dateMatch = input.match(DATE_PATTERN);
+        if (dateMatch) {
+            // Local date, formatted as YYYY-MM-DD
+            const date = new Date(new Date().getFullYear(), MONTHS[dateMatch[2].toLowerCase()], parseInt(dateMatch[1]));
+            const month = String(date.getMonth() + 1).padStart(2, '0');
+            const dayOfMonth = String(date.getDate()).padStart(2, '0');
+            entities.date = `${date.getFullYear()}-${month}-${dayOfMonth}`;
+        }
+    }
+
+    return { intent: bestIntent, entities, confidence: bestScore };
+}
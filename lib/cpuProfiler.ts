@@ -0,0 +1,173 @@
+/**
+ * On-demand V8 CPU profiling of the running server.
+ *
+ * Enabled only when the server starts with CPU_PROFILE=1 (`npm run
+ * dev:profile`). startCpuProfile() begins sampling through the inspector
+ * protocol; stopCpuProfile() returns the .cpuprofile together with the
+ * window of every request withServerTiming handled meanwhile:
+ *
+ *   {"route":"GET /api/booking","start":1234.5,"end":1240.1}
+ *
+ * Window times are microseconds since the profile's startTime, the origin
+ * of its sample timestamps, so samples can be attributed to the requests in
+ * flight (testsprite_tests/cpu_profile.py). Node's profiler and
+ * process.hrtime share a clock; where they do not, the origin falls back to
+ * when sampling was requested and attribution is approximate.
+ */
+
+import { Session } from 'inspector';
+
+export interface RequestWindow {
+    route: string;
+    start: number;
+    end: number;
+}
+
+export interface CpuProfileCapture {
+    profile: unknown;
+    requests: RequestWindow[];
+}
+
+interface ProfilerState {
+    session: Session | null;
+    // Set from the moment a start is accepted until its session is up
+    starting: boolean;
+    // hrtime (µs) just before and after Profiler.start
+    requestedAt: number;
+    startedAt: number;
+    requests: RequestWindow[];
+}
+
+// Keep at most this many windows; a longer run still profiles, attribution gets coarser
+const MAX_REQUEST_WINDOWS = 200_000;
+
+// On globalThis so every route bundle records into the same capture
+const globalState = globalThis as typeof globalThis & { __cpuProfiler?: ProfilerState };
+const state: ProfilerState = globalState.__cpuProfiler
+    || (globalState.__cpuProfiler = { session: null, starting: false, requestedAt: 0, startedAt: 0, requests: [] });
+
+// A start while a profile runs or is starting, or a stop while none runs
+export class CpuProfileConflictError extends Error {
+    constructor(message: string) {
+        super(message);
+        this.name = 'CpuProfileConflictError';
+    }
+}
+
+export function isCpuProfilingEnabled(): boolean {
+    return process.env.CPU_PROFILE === '1';
+}
+
+export function isCpuProfileRunning(): boolean {
+    return state.session !== null;
+}
+
+function post<T = unknown>(session: Session, method: string, params?: object): Promise<T> {
+    return new Promise((resolve, reject) => {
+        session.post(method, params, (error, result) => (error ? reject(error) : resolve(result as T)));
+    });
+}
+
+const nowMicros = () => Number(process.hrtime.bigint() / BigInt(1000));
+
+export async function startCpuProfile(samplingIntervalUs = 1000): Promise<void> {
+    if (state.session || state.starting) throw new CpuProfileConflictError('A CPU profile is already running');
+    // Claimed before the first await, so a concurrent start is refused instead of orphaning a session
+    state.starting = true;
+    const session = new Session();
+    try {
+        session.connect();
+        await post(session, 'Profiler.enable');
+        await post(session, 'Profiler.setSamplingInterval', { interval: samplingIntervalUs });
+        const requestedAt = nowMicros();
+        await post(session, 'Profiler.start');
+        state.session = session;
+        state.requestedAt = requestedAt;
+        state.startedAt = nowMicros();
+        state.requests = [];
+    } catch (error) {
+        session.disconnect();
+        throw error;
+    } finally {
+        state.starting = false;
+    }
+}
+
+export async function stopCpuProfile(): Promise<CpuProfileCapture> {
+    const session = state.session;
+    if (!session) {
+        throw new CpuProfileConflictError(state.starting ? 'The CPU profile is still starting' : 'No CPU profile is running');
+    }
+    state.session = null;
+    try {
+        const { profile } = await post<{ profile: { startTime: number } }>(session, 'Profiler.stop');
+        const origin = profile.startTime >= state.requestedAt && profile.startTime <= state.startedAt
+            ? profile.startTime
+            : state.requestedAt;
+        const requests = state.requests.map(({ route, start, end }) => ({
+            route,
+            start: start - origin,
+            end: end - origin,
+        }));
+        return { profile, requests };
+    } finally {
+        state.requests = [];
+        session.disconnect();
+    }
+}
+
+/**
+ * Call when a request starts; the returned function closes its window.
+ * A no-op unless a profile is running.
+ */
+export function trackRequest(route: string): () => void {
+    if (!state.session) return () => {};
+    const requests = state.requests;
+    const start = nowMicros();
+    return () => {
+        if (state.requests === requests && requests.length < MAX_REQUEST_WINDOWS) {
+            requests.push({ route, start, end: nowMicros() });
+        }
+    };
+}
+
+/**
+ * Close `end` once the response body has been sent or dropped rather than
+ * when the handler returns: NDJSON responses (lib/ndjson) serialize their
+ * rows while the body streams, and that work belongs to the request.
+ */
+export function endAfterBody(response: Response, end: () => void): Response {
+    if (!response.body) {
+        end();
+        return response;
+    }
+    const reader = response.body.getReader();
+    let ended = false;
+    const finish = () => {
+        if (!ended) {
+            ended = true;
+            end();
+        }
+    };
+    const body = new ReadableStream<Uint8Array>({
+        async pull(controller) {
+            try {
+                const { done, value } = await reader.read();
+                if (done) {
+                    finish();
+                    controller.close();
+                } else {
+                    controller.enqueue(value);
+                }
+            } catch (error) {
+                finish();
+                controller.error(error);
+            }
+        },
+        cancel(reason) {
+            finish();
+            return reader.cancel(reason);
+        },
+    });
+    return new Response(body, { status: response.status, statusText: response.statusText, headers: response.headers });
+}
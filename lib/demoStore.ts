@@ -8,6 +8,8 @@
  * IMPORTANT: This is the single source of truth for demo data.
  */
 
+import type { SeedDataKey } from '@/lib/seedSync';
+
 // Storage Keys
 export const DEMO_STORAGE_KEYS = {
     INITIALIZED: 'demo_initialized',
@@ -19,6 +21,7 @@ export const DEMO_STORAGE_KEYS = {
     PEMASUKAN: 'demo_pemasukan',
     PEMASUKAN_DETAIL: 'demo_pemasukan_detail',
     SYSTEM_PROMPTS: 'demo_system_prompts',
+    SYNC_CURSOR: 'demo_sync_cursor',
 } as const;
 
 // Type definitions
@@ -118,28 +121,221 @@ function getLocalISOString(): string {
     return localTime.toISOString();
 }
 
-// Generic localStorage getter
+// ==================== APPEND-ONLY PERSISTENCE ====================
+
+/**
+ * Each collection is stored as a snapshot under its key (the JSON array the
+ * seed writes) plus a log of the mutations made since the last compaction:
+ *
+ *   demo_bookings            snapshot array
+ *   demo_bookings:log:<n>    one entry per mutation: {op:'put', rows} or {op:'del', ids}
+ *   demo_bookings:log        number of log entries
+ *   demo_bookings:rev        revision, bumped on every write
+ *   demo_bookings:next_id    next free id
+ *   demo_bookings:local      seed rows edited or deleted locally (seed deltas skip them)
+ *   demo_pemasukan:invoice_seq  {period, seq} of the last invoice number issued
+ *
+ * A write appends one entry the size of the changed rows instead of
+ * re-serializing the whole collection. Reads fold snapshot + log once and
+ * keep the result in memory until the revision changes. After
+ * LOG_COMPACT_THRESHOLD entries the log is folded back into the snapshot.
+ */
+export const LOG_COMPACT_THRESHOLD = 100;
+
+type LogEntry<T> = { op: 'put'; rows: T[] } | { op: 'del'; ids: number[] };
+
+interface MaterializedCollection {
+    rev: string;
+    byId: Map<number, any>;
+    rows: any[] | null;
+}
+
+const materialized = new Map<string, MaterializedCollection>();
+
+const logEntryKey = (key: string, n: number) => `${key}:log:${n}`;
+const logCountKey = (key: string) => `${key}:log`;
+const revisionKey = (key: string) => `${key}:rev`;
+const nextIdKey = (key: string) => `${key}:next_id`;
+const invoiceSeqKey = (key: string) => `${key}:invoice_seq`;
+const localChangesKey = (key: string) => `${key}:local`;
+
+// Ids of rows created here start at LOCAL_ID_BASE, above anything the
+// upstream seed uses, so a seed delta never brings in a row with the id of
+// one created locally
+export const LOCAL_ID_BASE = 1_000_000;
+
+function readCounter(storageKey: string): number {
+    return parseInt(localStorage.getItem(storageKey) || '0', 10) || 0;
+}
+
+// Revision of a collection; changes whenever it is written
+export function getCollectionRevision(key: string): string {
+    if (!isBrowser()) return '';
+    return localStorage.getItem(revisionKey(key)) || '';
+}
+
+function bumpRevision(key: string): string {
+    const rev = String(readCounter(revisionKey(key)) + 1);
+    localStorage.setItem(revisionKey(key), rev);
+    return rev;
+}
+
+function applyLogEntry(byId: Map<number, any>, entry: LogEntry<any>): void {
+    if (entry.op === 'put') {
+        entry.rows.forEach(row => byId.set(row.id, row));
+    } else {
+        entry.ids.forEach(id => byId.delete(id));
+    }
+}
+
+function loadCollection(key: string): MaterializedCollection {
+    const rev = getCollectionRevision(key);
+    const cached = materialized.get(key);
+    if (cached && cached.rev === rev) return cached;
+
+    const byId = new Map<number, any>();
+    const snapshot = localStorage.getItem(key);
+    (snapshot ? JSON.parse(snapshot) : []).forEach((row: any) => byId.set(row.id, row));
+
+    const count = readCounter(logCountKey(key));
+    for (let n = 0; n < count; n++) {
+        const entry = localStorage.getItem(logEntryKey(key, n));
+        if (entry) applyLogEntry(byId, JSON.parse(entry));
+    }
+
+    const collection: MaterializedCollection = { rev, byId, rows: null };
+    materialized.set(key, collection);
+    return collection;
+}
+
+function clearLog(key: string): void {
+    const count = readCounter(logCountKey(key));
+    for (let n = 0; n < count; n++) {
+        localStorage.removeItem(logEntryKey(key, n));
+    }
+    localStorage.removeItem(logCountKey(key));
+}
+
+// Generic localStorage getter (rows are shared with the in-memory copy; treat as read-only)
 export function getFromLocalStorage<T>(key: string): T[] {
     if (!isBrowser()) return [];
     try {
-        const data = localStorage.getItem(key);
-        return data ? JSON.parse(data) : [];
+        const collection = loadCollection(key);
+        if (!collection.rows) collection.rows = Array.from(collection.byId.values());
+        return collection.rows.slice();
     } catch (error) {
         console.error(`Error reading ${key} from localStorage:`, error);
         return [];
     }
 }
 
-// Generic localStorage setter
-export function setToLocalStorage<T>(key: string, data: T[]): void {
-    if (!isBrowser()) return;
+// Single row by id, served from the in-memory copy without cloning the collection
+function getRecordById<T>(key: string, id: number): T | null {
+    if (!isBrowser()) return null;
     try {
-        localStorage.setItem(key, JSON.stringify(data));
+        return loadCollection(key).byId.get(id) || null;
+    } catch (error) {
+        console.error(`Error reading ${key} from localStorage:`, error);
+        return null;
+    }
+}
+
+// Generic localStorage setter: replaces the whole collection with a fresh
+// snapshot and drops its log (returns the serialized value that was stored)
+export function setToLocalStorage<T>(key: string, data: T[]): string | null {
+    if (!isBrowser()) return null;
+    try {
+        const serialized = JSON.stringify(data);
+        localStorage.setItem(key, serialized);
+        clearLog(key);
+        const byId = new Map<number, any>();
+        data.forEach((row: any) => byId.set(row.id, row));
+        materialized.set(key, { rev: bumpRevision(key), byId, rows: null });
+
+        raiseNextId(key, data as any[]);
+        return serialized;
     } catch (error) {
         console.error(`Error writing ${key} to localStorage:`, error);
+        return null;
     }
 }
 
+// Append one mutation to the collection's log; returns the new revision,
+// or null when nothing could be written
+function appendToLog<T>(key: string, entry: LogEntry<T>): string | null {
+    if (!isBrowser()) return null;
+    try {
+        // Fold the current state first so the cached copy can be patched in place
+        const collection = loadCollection(key);
+        const count = readCounter(logCountKey(key));
+        localStorage.setItem(logEntryKey(key, count), JSON.stringify(entry));
+        localStorage.setItem(logCountKey(key), String(count + 1));
+
+        applyLogEntry(collection.byId, entry);
+        collection.rows = null;
+        collection.rev = bumpRevision(key);
+
+        if (count + 1 >= LOG_COMPACT_THRESHOLD) {
+            compactCollection(key);
+        }
+        return getCollectionRevision(key);
+    } catch (error) {
+        console.error(`Error writing ${key} to localStorage:`, error);
+        return null;
+    }
+}
+
+// Ids of seed rows changed locally, per collection (loaded once, then kept in step).
+// Rows created here are not tracked: their ids start at LOCAL_ID_BASE, which
+// no seed row reaches, so creating them never touches this set.
+const localChanges = new Map<string, Set<number>>();
+
+function getLocalChanges(key: string): Set<number> {
+    let ids = localChanges.get(key);
+    if (!ids) {
+        ids = new Set<number>(JSON.parse(localStorage.getItem(localChangesKey(key)) || '[]'));
+        localChanges.set(key, ids);
+    }
+    return ids;
+}
+
+function markLocalChanges(key: string, ids: number[]): void {
+    ids = ids.filter(id => id < LOCAL_ID_BASE);
+    if (ids.length === 0) return;
+    const changed = getLocalChanges(key);
+    const before = changed.size;
+    ids.forEach(id => changed.add(id));
+    if (changed.size !== before) {
+        localStorage.setItem(localChangesKey(key), JSON.stringify(Array.from(changed)));
+    }
+}
+
+function clearLocalChanges(key: string): void {
+    localStorage.removeItem(localChangesKey(key));
+    localChanges.delete(key);
+}
+
+// Insert or replace rows by id (a local change: seed deltas will not overwrite seed rows written here)
+export function putRecords<T extends { id: number }>(key: string, rows: T[]): string | null {
+    if (rows.length === 0) return getCollectionRevision(key);
+    const rev = appendToLog(key, { op: 'put', rows });
+    if (rev !== null) markLocalChanges(key, rows.map(row => row.id));
+    return rev;
+}
+
+export function deleteRecords(key: string, ids: number[]): string | null {
+    if (ids.length === 0) return getCollectionRevision(key);
+    const rev = appendToLog(key, { op: 'del', ids });
+    if (rev !== null) markLocalChanges(key, ids);
+    return rev;
+}
+
+// Fold the log back into the snapshot
+export function compactCollection(key: string): void {
+    if (!isBrowser()) return;
+    setToLocalStorage(key, getFromLocalStorage(key));
+}
+
 // Check if demo is initialized
 export function isDemoInitialized(): boolean {
     if (!isBrowser()) return false;
@@ -154,8 +350,33 @@ export function setDemoInitialized(): void {
 
 // Generate unique ID
 export function generateId(items: { id: number }[]): number {
-    if (items.length === 0) return 1;
-    return Math.max(...items.map(item => item.id)) + 1;
+    let max = 0;
+    for (const item of items) {
+        if (item.id > max) max = item.id;
+    }
+    return max + 1;
+}
+
+// Reserve `count` consecutive ids for a collection and return the first.
+// The counter is persisted, so ids are never reused after a delete.
+export function nextId(key: string, count: number = 1): number {
+    if (!isBrowser()) return 1;
+    const stored = localStorage.getItem(nextIdKey(key));
+    const first = Math.max(
+        stored !== null ? parseInt(stored, 10) : generateId(getFromLocalStorage<{ id: number }>(key)),
+        LOCAL_ID_BASE
+    );
+    localStorage.setItem(nextIdKey(key), String(first + count));
+    return first;
+}
+
+// Keep the id counter ahead of any id the new data brings in
+function raiseNextId(key: string, rows: { id: number }[]): void {
+    const stored = localStorage.getItem(nextIdKey(key));
+    const minNext = generateId(rows);
+    if (stored !== null && parseInt(stored, 10) < minNext) {
+        localStorage.setItem(nextIdKey(key), String(minNext));
+    }
 }
 
 // ==================== SPORTS CRUD ====================
@@ -167,41 +388,35 @@ export function getSports(showAll: boolean = false): Sport[] {
 }
 
 export function getSportById(id: number): Sport | null {
-    const sports = getSports(true);
-    return sports.find(s => s.id === id) || null;
+    return getRecordById<Sport>(DEMO_STORAGE_KEYS.SPORTS, id);
 }
 
 export function createSport(data: Omit<Sport, 'id'>): Sport {
-    const sports = getFromLocalStorage<Sport>(DEMO_STORAGE_KEYS.SPORTS);
     const newSport: Sport = {
         ...data,
-        id: generateId(sports),
+        id: nextId(DEMO_STORAGE_KEYS.SPORTS),
         updated_at: getLocalISOString(),
     };
-    sports.push(newSport);
-    setToLocalStorage(DEMO_STORAGE_KEYS.SPORTS, sports);
+    putRecords(DEMO_STORAGE_KEYS.SPORTS, [newSport]);
     return newSport;
 }
 
 export function updateSport(id: number, data: Partial<Sport>): Sport | null {
-    const sports = getSports(true);
-    const index = sports.findIndex(s => s.id === id);
-    if (index === -1) return null;
+    const sport = getSportById(id);
+    if (!sport) return null;
 
-    sports[index] = {
-        ...sports[index],
+    const updated: Sport = {
+        ...sport,
         ...data,
         updated_at: getLocalISOString(),
     };
-    setToLocalStorage(DEMO_STORAGE_KEYS.SPORTS, sports);
-    return sports[index];
+    putRecords(DEMO_STORAGE_KEYS.SPORTS, [updated]);
+    return updated;
 }
 
 export function deleteSport(id: number): boolean {
-    const sports = getSports(true);
-    const filteredSports = sports.filter(s => s.id !== id);
-    if (filteredSports.length === sports.length) return false;
-    setToLocalStorage(DEMO_STORAGE_KEYS.SPORTS, filteredSports);
+    if (!getSportById(id)) return false;
+    deleteRecords(DEMO_STORAGE_KEYS.SPORTS, [id]);
     return true;
 }
 
@@ -227,8 +442,7 @@ export function getFields(filters?: { sportId?: number; isAvailable?: boolean; f
 }
 
 export function getFieldById(id: number): Field | null {
-    const fields = getFromLocalStorage<Field>(DEMO_STORAGE_KEYS.FIELDS);
-    return fields.find(f => f.id === id) || null;
+    return getRecordById<Field>(DEMO_STORAGE_KEYS.FIELDS, id);
 }
 
 export function getFieldImages(fieldId?: number): FieldImage[] {
@@ -237,160 +451,743 @@ export function getFieldImages(fieldId?: number): FieldImage[] {
     return images;
 }
 
+function addFieldImages(fieldId: number, images: string[]): void {
+    if (images.length === 0) return;
+    const firstId = nextId(DEMO_STORAGE_KEYS.FIELD_IMAGES, images.length);
+    putRecords(DEMO_STORAGE_KEYS.FIELD_IMAGES, images.map((url, idx) => ({
+        id: firstId + idx,
+        field_id: fieldId,
+        url_image: url,
+    })));
+}
+
 export function createField(data: Omit<Field, 'id'>, images?: string[]): Field {
-    const fields = getFromLocalStorage<Field>(DEMO_STORAGE_KEYS.FIELDS);
+    const view = currentFieldsView();
     const newField: Field = {
         ...data,
-        id: generateId(fields),
+        id: nextId(DEMO_STORAGE_KEYS.FIELDS),
         updated_at: getLocalISOString(),
     };
-    fields.push(newField);
-    setToLocalStorage(DEMO_STORAGE_KEYS.FIELDS, fields);
+    putRecords(DEMO_STORAGE_KEYS.FIELDS, [newField]);
 
     // Handle images
     if (images && images.length > 0) {
-        const fieldImages = getFromLocalStorage<FieldImage>(DEMO_STORAGE_KEYS.FIELD_IMAGES);
-        const newImages = images.map((url, idx) => ({
-            id: generateId(fieldImages) + idx,
-            field_id: newField.id,
-            url_image: url,
-        }));
-        setToLocalStorage(DEMO_STORAGE_KEYS.FIELD_IMAGES, [...fieldImages, ...newImages]);
+        addFieldImages(newField.id, images);
     }
 
+    refreshFieldInView(view, newField.id);
     return newField;
 }
 
 export function updateField(id: number, data: Partial<Field>, images?: string[]): Field | null {
-    const fields = getFromLocalStorage<Field>(DEMO_STORAGE_KEYS.FIELDS);
-    const index = fields.findIndex(f => f.id === id);
-    if (index === -1) return null;
+    const field = getFieldById(id);
+    if (!field) return null;
 
-    fields[index] = {
-        ...fields[index],
+    const view = currentFieldsView();
+    const updated: Field = {
+        ...field,
         ...data,
         updated_at: getLocalISOString(),
     };
-    setToLocalStorage(DEMO_STORAGE_KEYS.FIELDS, fields);
+    putRecords(DEMO_STORAGE_KEYS.FIELDS, [updated]);
 
     // Handle images if provided
     if (images !== undefined) {
-        const fieldImages = getFromLocalStorage<FieldImage>(DEMO_STORAGE_KEYS.FIELD_IMAGES);
-        const otherImages = fieldImages.filter(i => i.field_id !== id);
-        const newImages = images.map((url, idx) => ({
-            id: generateId(fieldImages) + idx,
-            field_id: id,
-            url_image: url,
-        }));
-        setToLocalStorage(DEMO_STORAGE_KEYS.FIELD_IMAGES, [...otherImages, ...newImages]);
+        deleteRecords(DEMO_STORAGE_KEYS.FIELD_IMAGES, getFieldImages(id).map(i => i.id));
+        addFieldImages(id, images);
     }
 
-    return fields[index];
+    refreshFieldInView(view, id);
+    return updated;
 }
 
 export function deleteField(id: number): boolean {
-    const fields = getFromLocalStorage<Field>(DEMO_STORAGE_KEYS.FIELDS);
-    const filteredFields = fields.filter(f => f.id !== id);
-    if (filteredFields.length === fields.length) return false;
+    if (!getFieldById(id)) return false;
+    const view = currentFieldsView();
 
     // Also delete related images
-    const fieldImages = getFromLocalStorage<FieldImage>(DEMO_STORAGE_KEYS.FIELD_IMAGES);
-    setToLocalStorage(DEMO_STORAGE_KEYS.FIELD_IMAGES, fieldImages.filter(i => i.field_id !== id));
+    deleteRecords(DEMO_STORAGE_KEYS.FIELD_IMAGES, getFieldImages(id).map(i => i.id));
 
-    setToLocalStorage(DEMO_STORAGE_KEYS.FIELDS, filteredFields);
+    deleteRecords(DEMO_STORAGE_KEYS.FIELDS, [id]);
+    refreshFieldInView(view, id);
     return true;
 }
 
-// ==================== BOOKINGS CRUD ====================
+// ==================== FIELDS VIEW ====================
 
-export function getBookings(filters?: { fieldId?: number; date?: string; status?: string }): Booking[] {
-    let bookings = getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS);
+// A field joined with its sport and image list, as served by GET /api/fields
+export interface FieldWithSport extends Field {
+    sport_name: string | null;
+    sport_type: string | null;
+    images: string[];
+}
+
+/**
+ * Precomputed join of fields + sports + field images, sorted by field name.
+ *
+ * Built once per revision of the three collections. The field writers patch
+ * the affected row in place, so creating or editing a field does not force a
+ * rebuild; a sport change rebuilds it on the next read. Filtered results are
+ * memoized until the next change.
+ */
+interface FieldsView {
+    rev: string;
+    rows: FieldWithSport[];
+    byId: Map<number, FieldWithSport>;
+    queries: Map<string, FieldWithSport[]>;
+}
+
+let fieldsView: FieldsView | null = null;
+
+const fieldNameCollator = new Intl.Collator();
 
-    if (filters?.fieldId) {
-        bookings = bookings.filter(b => b.field_id === filters.fieldId);
+function fieldsViewRevision(): string {
+    return [DEMO_STORAGE_KEYS.FIELDS, DEMO_STORAGE_KEYS.SPORTS, DEMO_STORAGE_KEYS.FIELD_IMAGES]
+        .map(getCollectionRevision)
+        .join('|');
+}
+
+function joinField(field: Field, sport: Sport | null, images: string[]): FieldWithSport {
+    return {
+        ...field,
+        sport_name: sport ? sport.sport_name : null,
+        sport_type: sport ? sport.sport_type : null,
+        url_image: images.length > 0 ? images[0] : field.url_image,
+        images,
+    };
+}
+
+// Position after every row whose name sorts at or before row's
+function sortedPosition(rows: FieldWithSport[], row: FieldWithSport): number {
+    let lo = 0;
+    let hi = rows.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (fieldNameCollator.compare(rows[mid].field_name, row.field_name) <= 0) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+function buildFieldsView(rev: string): FieldsView {
+    const imagesByField = new Map<number, string[]>();
+    getFieldImages().forEach(img => {
+        const urls = imagesByField.get(img.field_id);
+        if (urls) {
+            urls.push(img.url_image);
+        } else {
+            imagesByField.set(img.field_id, [img.url_image]);
+        }
+    });
+
+    const rows = getFromLocalStorage<Field>(DEMO_STORAGE_KEYS.FIELDS)
+        .sort((a, b) => fieldNameCollator.compare(a.field_name, b.field_name))
+        .map(field => joinField(field, getSportById(field.sport_id), imagesByField.get(field.id) || []));
+
+    return {
+        rev,
+        rows,
+        byId: new Map(rows.map(row => [row.id, row])),
+        queries: new Map(),
+    };
+}
+
+function getFieldsView(): FieldsView {
+    const rev = fieldsViewRevision();
+    if (!fieldsView || fieldsView.rev !== rev) {
+        fieldsView = buildFieldsView(rev);
     }
+    return fieldsView;
+}
+
+// The view if it is current, so a writer can patch it after its own writes
+function currentFieldsView(): FieldsView | null {
+    return fieldsView && fieldsView.rev === fieldsViewRevision() ? fieldsView : null;
+}
+
+function refreshFieldInView(view: FieldsView | null, fieldId: number): void {
+    if (!view) return;
 
-    if (filters?.date) {
-        bookings = bookings.filter(b => b.booking_date === filters.date);
+    const previous = view.byId.get(fieldId);
+    if (previous) {
+        view.rows.splice(view.rows.indexOf(previous), 1);
+        view.byId.delete(fieldId);
     }
 
-    if (filters?.status) {
-        bookings = bookings.filter(b => b.booking_status === filters.status);
+    const field = getFieldById(fieldId);
+    if (field) {
+        const row = joinField(field, getSportById(field.sport_id), getFieldImages(fieldId).map(i => i.url_image));
+        view.rows.splice(sortedPosition(view.rows, row), 0, row);
+        view.byId.set(fieldId, row);
     }
 
-    return bookings.sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
+    view.queries.clear();
+    view.rev = fieldsViewRevision();
 }
 
-export function getPendingBookings(searchTerm?: string): Booking[] {
-    let bookings = getBookings({ status: 'pending' });
+export function getFieldsWithSport(filters?: { sportId?: number; isAvailable?: boolean; fieldCode?: string }): FieldWithSport[] {
+    const view = getFieldsView();
+    const key = `${filters?.isAvailable ?? ''}|${filters?.sportId ?? ''}|${filters?.fieldCode ?? ''}`;
+
+    let rows = view.queries.get(key);
+    if (!rows) {
+        rows = view.rows;
+        if (filters?.isAvailable !== undefined) {
+            const availableValue = filters.isAvailable ? 1 : 0;
+            rows = rows.filter(f => f.is_available === availableValue);
+        }
+        if (filters?.sportId) {
+            rows = rows.filter(f => f.sport_id === filters.sportId);
+        }
+        if (filters?.fieldCode) {
+            rows = rows.filter(f => f.field_code === filters.fieldCode);
+        }
+        view.queries.set(key, rows);
+    }
+    return rows.slice();
+}
 
-    // Also include unpaid bookings
-    const allBookings = getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS);
-    const pendingPayment = allBookings.filter(b => b.payment_status === 'pending');
+export function getFieldWithSportById(id: number): FieldWithSport | null {
+    return getFieldsView().byId.get(id) || null;
+}
 
-    // Merge and dedupe
-    const mergedBookings = [...new Map([...bookings, ...pendingPayment].map(b => [b.id, b])).values()];
+// ==================== BOOKINGS INDEX ====================
 
-    if (searchTerm) {
-        const term = searchTerm.toLowerCase();
-        return mergedBookings.filter(b =>
-            b.customer_name?.toLowerCase().includes(term) ||
-            b.customer_phone?.toLowerCase().includes(term) ||
-            b.field_name?.toLowerCase().includes(term)
-        );
+/**
+ * In-memory index over the bookings collection.
+ *
+ * Rebuilt only when the collection revision differs from the one it was
+ * built at, and patched in place by createBooking, so filtered reads and slot conflict
+ * checks no longer parse, scan and date-sort the whole history per call.
+ * All bucket arrays are kept in created_at descending order.
+ */
+interface BookingIndex {
+    rev: string;
+    sorted: Booking[];
+    byId: Map<number, Booking>;
+    byField: Map<number, Booking[]>;
+    byDate: Map<string, Booking[]>;
+    byStatus: Map<string, Booking[]>;
+    byFieldDate: Map<string, Booking[]>;
+    // Bitmap of slots held by non-cancelled bookings, per field and day
+    slotMasks: Map<string, number[]>;
+}
+
+let bookingIndex: BookingIndex | null = null;
+
+// Slot strings are interned to bit positions so any slot format ("09:00" or
+// "09:00-10:00") keeps the exact-match semantics of the old includes() check.
+const slotBits = new Map<string, number>();
+
+function slotBit(slot: string): number {
+    let bit = slotBits.get(slot);
+    if (bit === undefined) {
+        bit = slotBits.size;
+        slotBits.set(slot, bit);
+    }
+    return bit;
+}
+
+function fieldDateKey(fieldId: number, date: string): string {
+    return `${fieldId}|${date}`;
+}
+
+function pushToBucket<K>(map: Map<K, Booking[]>, key: K, booking: Booking, front: boolean): void {
+    const bucket = map.get(key);
+    if (!bucket) {
+        map.set(key, [booking]);
+    } else if (front) {
+        bucket.unshift(booking);
+    } else {
+        bucket.push(booking);
+    }
+}
+
+function markSlots(index: BookingIndex, booking: Booking): void {
+    if (booking.booking_status === 'cancelled' || !Array.isArray(booking.time_slots)) return;
+    const key = fieldDateKey(booking.field_id, booking.booking_date);
+    let mask = index.slotMasks.get(key);
+    if (!mask) {
+        mask = [];
+        index.slotMasks.set(key, mask);
+    }
+    for (const slot of booking.time_slots) {
+        const bit = slotBit(slot);
+        const word = bit >>> 5;
+        while (mask.length <= word) mask.push(0);
+        mask[word] |= 1 << (bit & 31);
+    }
+}
+
+function addToIndex(index: BookingIndex, booking: Booking, front: boolean): void {
+    index.byId.set(booking.id, booking);
+    pushToBucket(index.byField, booking.field_id, booking, front);
+    pushToBucket(index.byDate, booking.booking_date, booking, front);
+    pushToBucket(index.byStatus, booking.booking_status, booking, front);
+    pushToBucket(index.byFieldDate, fieldDateKey(booking.field_id, booking.booking_date), booking, front);
+    markSlots(index, booking);
+}
+
+function buildBookingIndex(rev: string, bookings: Booking[]): BookingIndex {
+    // Parse each created_at once instead of twice per comparison
+    const timestamps = new Map<Booking, number>();
+    bookings.forEach(b => timestamps.set(b, new Date(b.created_at).getTime()));
+    const sorted = bookings.sort((a, b) => timestamps.get(b)! - timestamps.get(a)!);
+
+    const index: BookingIndex = {
+        rev,
+        sorted,
+        byId: new Map(),
+        byField: new Map(),
+        byDate: new Map(),
+        byStatus: new Map(),
+        byFieldDate: new Map(),
+        slotMasks: new Map(),
+    };
+    sorted.forEach(b => addToIndex(index, b, false));
+    return index;
+}
+
+function getBookingIndex(): BookingIndex {
+    const rev = getCollectionRevision(DEMO_STORAGE_KEYS.BOOKINGS);
+    if (!bookingIndex || bookingIndex.rev !== rev) {
+        bookingIndex = buildBookingIndex(rev, getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS));
+    }
+    return bookingIndex;
+}
+
+// Returns true if any of the given slots is already held on that field and day
+export function hasBookingConflict(fieldId: number, date: string, timeSlots: string[]): boolean {
+    const mask = getBookingIndex().slotMasks.get(fieldDateKey(fieldId, date));
+    if (!mask) return false;
+    return timeSlots.some(slot => {
+        const bit = slotBits.get(slot);
+        return bit !== undefined && ((mask[bit >>> 5] || 0) & (1 << (bit & 31))) !== 0;
+    });
+}
+
+// Booked (non-cancelled) slots for one field and day
+export function getBookedSlots(fieldId: number, date: string): string[] {
+    const bookings = getBookingIndex().byFieldDate.get(fieldDateKey(fieldId, date)) || [];
+    const slots = new Set<string>();
+    bookings.forEach(b => {
+        if (b.booking_status !== 'cancelled' && Array.isArray(b.time_slots)) {
+            b.time_slots.forEach(slot => slots.add(slot));
+        }
+    });
+    return Array.from(slots);
+}
+
+// ==================== PENDING BOOKINGS SEARCH ====================
+
+/**
+ * Trigram index over the bookings awaiting the cashier: status pending or
+ * payment pending. Each entry keeps its lowercased customer name, phone and
+ * field name, and every trigram of those maps to the entries containing it,
+ * so a search intersects a few short posting lists instead of lowercasing
+ * every booking per keystroke. Terms shorter than a trigram scan the
+ * precomputed lowercase text. Built alongside the bookings index and
+ * patched by the same creates.
+ */
+interface PendingEntry {
+    booking: Booking;
+    // Result position; new status-pending bookings get a lower one than any before
+    order: number;
+    text: string[];
+}
+
+interface PendingSearchIndex {
+    rev: string;
+    entries: PendingEntry[];
+    // trigram -> ascending positions in entries
+    grams: Map<string, number[]>;
+    // Lowest and highest order handed out so far
+    first: number;
+    last: number;
+    queries: Map<string, Booking[]>;
+}
+
+const MAX_PENDING_QUERIES = 64;
+
+let pendingSearch: PendingSearchIndex | null = null;
+
+function addPendingEntry(index: PendingSearchIndex, booking: Booking, order: number): void {
+    const position = index.entries.length;
+    const text = [booking.customer_name, booking.customer_phone, booking.field_name]
+        .map(value => (typeof value === 'string' ? value.toLowerCase() : ''));
+    index.entries.push({ booking, order, text });
+
+    const seen = new Set<string>();
+    text.forEach(value => {
+        for (let i = 0; i + 3 <= value.length; i++) {
+            const gram = value.slice(i, i + 3);
+            if (seen.has(gram)) continue;
+            seen.add(gram);
+            const postings = index.grams.get(gram);
+            if (postings) {
+                postings.push(position);
+            } else {
+                index.grams.set(gram, [position]);
+            }
+        }
+    });
+}
+
+function buildPendingSearch(bookings: BookingIndex): PendingSearchIndex {
+    const index: PendingSearchIndex = { rev: bookings.rev, entries: [], grams: new Map(), first: 0, last: -1, queries: new Map() };
+
+    // Same order as before: status-pending bookings newest first, then the
+    // remaining unpaid ones in storage order
+    const statusPending = bookings.byStatus.get('pending') || [];
+    statusPending.forEach(booking => addPendingEntry(index, booking, ++index.last));
+    getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS).forEach(booking => {
+        if (booking.payment_status === 'pending' && booking.booking_status !== 'pending') {
+            addPendingEntry(index, booking, ++index.last);
+        }
+    });
+    return index;
+}
+
+function getPendingSearch(): PendingSearchIndex {
+    const bookings = getBookingIndex();
+    if (!pendingSearch || pendingSearch.rev !== bookings.rev) {
+        pendingSearch = buildPendingSearch(bookings);
+    }
+    return pendingSearch;
+}
+
+// Called by createBooking/createBookings with the search index as it was
+// before their write, mirroring how the bookings index is patched
+function patchPendingSearch(index: PendingSearchIndex, rev: string, created: Booking[]): void {
+    // Status-pending bookings go first, the earliest of the batch at the front
+    for (let i = created.length - 1; i >= 0; i--) {
+        if (created[i].booking_status === 'pending') {
+            addPendingEntry(index, created[i], --index.first);
+        }
+    }
+    // Other unpaid bookings follow storage order, i.e. go last
+    created.forEach(booking => {
+        if (booking.booking_status !== 'pending' && booking.payment_status === 'pending') {
+            addPendingEntry(index, booking, ++index.last);
+        }
+    });
+    index.rev = rev;
+    index.queries.clear();
+}
+
+// Ascending-list intersection, smallest list first
+function intersectPostings(lists: number[][]): number[] {
+    lists.sort((a, b) => a.length - b.length);
+    let result = lists[0];
+    for (let l = 1; l < lists.length && result.length > 0; l++) {
+        const other = lists[l];
+        const next: number[] = [];
+        let j = 0;
+        for (const position of result) {
+            while (j < other.length && other[j] < position) j++;
+            if (j === other.length) break;
+            if (other[j] === position) next.push(position);
+        }
+        result = next;
+    }
+    return result;
+}
+
+function searchPending(index: PendingSearchIndex, term: string): Booking[] {
+    let candidates: number[];
+    if (term.length >= 3) {
+        const lists: number[][] = [];
+        for (let i = 0; i + 3 <= term.length; i++) {
+            const postings = index.grams.get(term.slice(i, i + 3));
+            if (!postings) return [];
+            lists.push(postings);
+        }
+        candidates = intersectPostings(lists);
+    } else {
+        candidates = index.entries.map((_, position) => position);
     }
 
-    return mergedBookings;
+    // Trigrams can match out of sequence, so confirm the substring
+    const matches = candidates
+        .map(position => index.entries[position])
+        .filter(entry => entry.text.some(value => value.includes(term)));
+    return matches.sort((a, b) => a.order - b.order).map(entry => entry.booking);
+}
+
+// ==================== BOOKING ROLLUPS ====================
+
+/**
+ * Per-day x field x status aggregates of the bookings for the admin
+ * dashboard. `day` is the transaction date (created_at, falling back to the
+ * booking date), which the dashboard's period filter uses; `play_month`
+ * splits each row by the month the booking is played in, for the booking
+ * trend. Built once per bookings revision and patched by every booking
+ * write through writeBookings, so the dashboard reads a few hundred rows
+ * instead of the whole history.
+ */
+export interface BookingRollup {
+    day: string;
+    play_month: string;
+    field_id: number;
+    status: string;
+    count: number;
+    revenue: number;
+    // Time slots held by these bookings
+    slots: number;
+}
+
+interface BookingRollupIndex {
+    rev: string;
+    rows: Map<string, BookingRollup>;
+}
+
+let bookingRollups: BookingRollupIndex | null = null;
+
+function addToRollups(index: BookingRollupIndex, booking: Booking, sign: 1 | -1): void {
+    const day = (booking.created_at || booking.booking_date || '').slice(0, 10);
+    const playMonth = (booking.booking_date || '').slice(0, 7);
+    const key = `${day}|${playMonth}|${booking.field_id}|${booking.booking_status}`;
+
+    let row = index.rows.get(key);
+    if (!row) {
+        row = { day, play_month: playMonth, field_id: booking.field_id, status: booking.booking_status, count: 0, revenue: 0, slots: 0 };
+        index.rows.set(key, row);
+    }
+    row.count += sign;
+    row.revenue += sign * (Number(booking.total_price) || 0);
+    row.slots += sign * (Array.isArray(booking.time_slots) ? booking.time_slots.length : 0);
+    if (row.count === 0) index.rows.delete(key);
+}
+
+function getBookingRollupIndex(): BookingRollupIndex {
+    const rev = getCollectionRevision(DEMO_STORAGE_KEYS.BOOKINGS);
+    if (!bookingRollups || bookingRollups.rev !== rev) {
+        const index: BookingRollupIndex = { rev, rows: new Map() };
+        getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS).forEach(b => addToRollups(index, b, 1));
+        bookingRollups = index;
+    }
+    return bookingRollups;
+}
+
+// Every booking write goes through here so the rollups move with it
+function writeBookings(rows: Booking[]): string | null {
+    const rollups = bookingRollups?.rev === getCollectionRevision(DEMO_STORAGE_KEYS.BOOKINGS) ? bookingRollups : null;
+    const previous = rollups ? rows.map(row => getRecordById<Booking>(DEMO_STORAGE_KEYS.BOOKINGS, row.id)) : [];
+
+    const rev = putRecords(DEMO_STORAGE_KEYS.BOOKINGS, rows);
+    if (rollups && rev !== null) {
+        previous.forEach(booking => booking && addToRollups(rollups, booking, -1));
+        rows.forEach(booking => addToRollups(rollups, booking, 1));
+        rollups.rev = rev;
+    }
+    return rev;
+}
+
+/**
+ * Rollup rows, ordered by day, play month, field and status. `from`/`to` are inclusive
+ * YYYY-MM-DD bounds on `day`.
+ */
+export function getBookingRollups(filters?: {
+    from?: string;
+    to?: string;
+    fieldIds?: number[];
+    status?: string;
+}): BookingRollup[] {
+    const fieldIds = filters?.fieldIds ? new Set(filters.fieldIds) : null;
+    const rows: BookingRollup[] = [];
+    getBookingRollupIndex().rows.forEach(row => {
+        if (filters?.from && row.day < filters.from) return;
+        if (filters?.to && row.day > filters.to) return;
+        if (fieldIds && !fieldIds.has(row.field_id)) return;
+        if (filters?.status && row.status !== filters.status) return;
+        rows.push({ ...row });
+    });
+    return rows.sort((a, b) =>
+        a.day.localeCompare(b.day) || a.play_month.localeCompare(b.play_month) || a.field_id - b.field_id || a.status.localeCompare(b.status)
+    );
+}
+
+// ==================== BOOKINGS CRUD ====================
+
+export function getBookings(filters?: { fieldId?: number; date?: string; status?: string }): Booking[] {
+    const index = getBookingIndex();
+
+    // Start from the narrowest bucket available, then apply the remaining filters
+    let bookings: Booking[];
+    if (filters?.fieldId && filters?.date) {
+        bookings = index.byFieldDate.get(fieldDateKey(filters.fieldId, filters.date)) || [];
+    } else if (filters?.fieldId) {
+        bookings = index.byField.get(filters.fieldId) || [];
+    } else if (filters?.date) {
+        bookings = index.byDate.get(filters.date) || [];
+    } else if (filters?.status) {
+        bookings = index.byStatus.get(filters.status) || [];
+    } else {
+        bookings = index.sorted;
+    }
+
+    if (filters?.status && (filters.fieldId || filters.date)) {
+        return bookings.filter(b => b.booking_status === filters.status);
+    }
+
+    return bookings.slice();
+}
+
+export function getPendingBookings(searchTerm?: string): Booking[] {
+    const index = getPendingSearch();
+    const term = searchTerm ? searchTerm.toLowerCase() : '';
+
+    let result = index.queries.get(term);
+    if (!result) {
+        result = term
+            ? searchPending(index, term)
+            : index.entries.slice().sort((a, b) => a.order - b.order).map(entry => entry.booking);
+        // Cashier input is unbounded, so keep only the recent queries
+        if (index.queries.size >= MAX_PENDING_QUERIES) index.queries.clear();
+        index.queries.set(term, result);
+    }
+    return result.slice();
 }
 
 export function getBookingById(id: number): Booking | null {
-    const bookings = getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS);
-    return bookings.find(b => b.id === id) || null;
+    return getBookingIndex().byId.get(id) || null;
 }
 
 export function createBooking(data: Omit<Booking, 'id' | 'created_at'>): Booking {
-    const bookings = getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS);
     const now = new Date();
     // Use local time instead of UTC
     const localTime = new Date(now.getTime() - (now.getTimezoneOffset() * 60000)).toISOString().slice(0, -1);
 
     const newBooking: Booking = {
         ...data,
-        id: generateId(bookings),
+        id: nextId(DEMO_STORAGE_KEYS.BOOKINGS),
         created_at: localTime,
         updated_at: localTime,
     };
-    bookings.push(newBooking);
-    setToLocalStorage(DEMO_STORAGE_KEYS.BOOKINGS, bookings);
+    // The index is current here, so patch it instead of rebuilding on next read
+    const index = getBookingIndex();
+    const pending = pendingSearch?.rev === index.rev ? pendingSearch : null;
+    const rev = writeBookings([newBooking]);
+    if (rev !== null) {
+        index.rev = rev;
+        index.sorted.unshift(newBooking);
+        addToIndex(index, newBooking, true);
+        if (pending) patchPendingSearch(pending, rev, [newBooking]);
+    }
     return newBooking;
 }
 
+export interface BookingBatchConflict {
+    // Position of the rejected booking in the batch
+    index: number;
+    time_slots: string[];
+    // 'existing' for a stored booking, otherwise the batch position it collides with
+    conflicts_with: 'existing' | number;
+}
+
+/**
+ * Insert many bookings with a single append to the collection log.
+ *
+ * All-or-nothing: each booking is checked against the stored slots and
+ * against the earlier bookings of the same batch, and if any of them
+ * collides nothing is written and the conflicts are returned instead.
+ */
+export function createBookings(items: Omit<Booking, 'id' | 'created_at'>[]): { created: Booking[]; conflicts: BookingBatchConflict[] } {
+    const index = getBookingIndex();
+    const conflicts: BookingBatchConflict[] = [];
+    // field|date -> slot -> batch position holding it
+    const claimed = new Map<string, Map<string, number>>();
+
+    items.forEach((item, position) => {
+        if (item.booking_status === 'cancelled') return;
+        const key = fieldDateKey(item.field_id, item.booking_date);
+        if (hasBookingConflict(item.field_id, item.booking_date, item.time_slots)) {
+            const taken = new Set(getBookedSlots(item.field_id, item.booking_date));
+            conflicts.push({ index: position, time_slots: item.time_slots.filter(s => taken.has(s)), conflicts_with: 'existing' });
+            return;
+        }
+        let slots = claimed.get(key);
+        if (!slots) {
+            slots = new Map();
+            claimed.set(key, slots);
+        }
+        const clash = item.time_slots.filter(s => slots!.has(s));
+        if (clash.length > 0) {
+            conflicts.push({ index: position, time_slots: clash, conflicts_with: slots.get(clash[0])! });
+            return;
+        }
+        item.time_slots.forEach(s => slots!.set(s, position));
+    });
+
+    if (conflicts.length > 0 || items.length === 0) {
+        return { created: [], conflicts };
+    }
+
+    const localTime = getLocalISOString().slice(0, -1);
+    const firstId = nextId(DEMO_STORAGE_KEYS.BOOKINGS, items.length);
+    const created: Booking[] = items.map((item, i) => ({
+        ...item,
+        id: firstId + i,
+        created_at: localTime,
+        updated_at: localTime,
+    }));
+
+    const pending = pendingSearch?.rev === index.rev ? pendingSearch : null;
+    const rev = writeBookings(created);
+    if (rev !== null) {
+        // Same order a rebuild would give: equal created_at keeps insertion order
+        index.rev = rev;
+        index.sorted.unshift(...created);
+        for (let i = created.length - 1; i >= 0; i--) {
+            addToIndex(index, created[i], true);
+        }
+        if (pending) patchPendingSearch(pending, rev, created);
+    }
+    return { created, conflicts };
+}
+
 export function updateBooking(id: number, data: Partial<Booking>): Booking | null {
-    const bookings = getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS);
-    const index = bookings.findIndex(b => b.id === id);
-    if (index === -1) return null;
+    const booking = getBookingById(id);
+    if (!booking) return null;
 
     const now = new Date();
     const localTime = new Date(now.getTime() - (now.getTimezoneOffset() * 60000)).toISOString().slice(0, -1);
 
-    bookings[index] = {
-        ...bookings[index],
+    const updated: Booking = {
+        ...booking,
         ...data,
         updated_at: localTime,
     };
-    setToLocalStorage(DEMO_STORAGE_KEYS.BOOKINGS, bookings);
-    return bookings[index];
+    writeBookings([updated]);
+    return updated;
 }
 
 export function updateMultipleBookings(ids: number[], data: Partial<Booking>): void {
-    const bookings = getFromLocalStorage<Booking>(DEMO_STORAGE_KEYS.BOOKINGS);
-    const updatedBookings = bookings.map(b => {
-        if (ids.includes(b.id)) {
-            return { ...b, ...data, updated_at: getLocalISOString() };
+    updateBookingsById(ids, data);
+}
+
+// Apply the same change to every listed booking in one write; returns the
+// updated bookings and the ids that were not found
+export function updateBookingsById(ids: number[], data: Partial<Booking>): { updated: Booking[]; missing: number[] } {
+    const wanted = Array.from(new Set(ids));
+    const updatedAt = getLocalISOString();
+    const updated: Booking[] = [];
+    const missing: number[] = [];
+
+    wanted.forEach(id => {
+        const booking = getBookingById(id);
+        if (booking) {
+            updated.push({ ...booking, ...data, updated_at: updatedAt });
+        } else {
+            missing.push(id);
         }
-        return b;
     });
-    setToLocalStorage(DEMO_STORAGE_KEYS.BOOKINGS, updatedBookings);
+    writeBookings(updated);
+
+    return { updated, missing };
 }
 
 // ==================== BARANG CRUD ====================
@@ -412,23 +1209,20 @@ export function getBarang(filters?: { category?: string; search?: string }): Bar
 }
 
 export function getBarangById(id: number): Barang | null {
-    const items = getFromLocalStorage<Barang>(DEMO_STORAGE_KEYS.BARANG);
-    return items.find(i => i.id === id) || null;
+    return getRecordById<Barang>(DEMO_STORAGE_KEYS.BARANG, id);
 }
 
 export function updateBarangStock(id: number, newStock: number): void {
-    const items = getFromLocalStorage<Barang>(DEMO_STORAGE_KEYS.BARANG);
-    const index = items.findIndex(i => i.id === id);
-    if (index !== -1) {
-        items[index].stok = newStock;
-        setToLocalStorage(DEMO_STORAGE_KEYS.BARANG, items);
+    const item = getBarangById(id);
+    if (item) {
+        putRecords(DEMO_STORAGE_KEYS.BARANG, [{ ...item, stok: newStock }]);
     }
 }
 
 // ==================== PEMASUKAN CRUD ====================
 
 export function getPemasukan(filters?: { id?: number; invoice?: string }): Pemasukan[] {
-    let items = getFromLocalStorage<Pemasukan>(DEMO_STORAGE_KEYS.PEMASUKAN);
+    let items = getPemasukanIndex().sorted;
 
     if (filters?.id) {
         items = items.filter(p => p.id === filters.id);
@@ -438,53 +1232,316 @@ export function getPemasukan(filters?: { id?: number; invoice?: string }): Pemas
         items = items.filter(p => p.nomor_invoice === filters.invoice);
     }
 
-    return items.sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
+    return items.slice();
 }
 
 export function getPemasukanDetail(pemasukanId?: number): PemasukanDetail[] {
-    const details = getFromLocalStorage<PemasukanDetail>(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL);
-    if (pemasukanId) return details.filter(d => d.pemasukan_id === pemasukanId);
-    return details;
+    if (pemasukanId) return (getPemasukanDetailsByParent().get(pemasukanId) || []).slice();
+    return getFromLocalStorage<PemasukanDetail>(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL);
 }
 
+/**
+ * Issue the next INV/<seq>/<MMYYYY> number. The sequence is a persisted
+ * per-month counter; only the first invoice of a month (or after a reseed)
+ * counts that month's existing income rows to pick up where they left off.
+ */
 export function generateInvoiceNumber(): string {
     const now = new Date();
     const month = String(now.getMonth() + 1).padStart(2, '0');
     const year = now.getFullYear();
     const mmyyyy = `${month}${year}`;
 
-    const pemasukan = getPemasukan();
-    const startOfMonth = new Date(year, now.getMonth(), 1);
-    const currentMonthItems = pemasukan.filter(p => new Date(p.created_at) >= startOfMonth);
-    const sequence = String(currentMonthItems.length + 1).padStart(3, '0');
+    if (!isBrowser()) return `INV/001/${mmyyyy}`;
 
-    return `INV/${sequence}/${mmyyyy}`;
+    let counter: { period: string; seq: number } | null = null;
+    try {
+        counter = JSON.parse(localStorage.getItem(invoiceSeqKey(DEMO_STORAGE_KEYS.PEMASUKAN)) || 'null');
+    } catch {
+        counter = null;
+    }
+
+    let seq: number;
+    if (counter && counter.period === mmyyyy) {
+        seq = counter.seq + 1;
+    } else {
+        const startOfMonth = new Date(year, now.getMonth(), 1);
+        seq = getPemasukan().filter(p => new Date(p.created_at) >= startOfMonth).length + 1;
+    }
+    localStorage.setItem(invoiceSeqKey(DEMO_STORAGE_KEYS.PEMASUKAN), JSON.stringify({ period: mmyyyy, seq }));
+
+    return `INV/${String(seq).padStart(3, '0')}/${mmyyyy}`;
 }
 
 export function createPemasukan(data: Omit<Pemasukan, 'id' | 'created_at' | 'nomor_invoice'>): Pemasukan {
-    const items = getFromLocalStorage<Pemasukan>(DEMO_STORAGE_KEYS.PEMASUKAN);
     const newItem: Pemasukan = {
         ...data,
-        id: generateId(items),
+        id: nextId(DEMO_STORAGE_KEYS.PEMASUKAN),
         nomor_invoice: generateInvoiceNumber(),
         created_at: getLocalISOString(),
     };
-    items.push(newItem);
-    setToLocalStorage(DEMO_STORAGE_KEYS.PEMASUKAN, items);
+    putRecords(DEMO_STORAGE_KEYS.PEMASUKAN, [newItem]);
     return newItem;
 }
 
 export function createPemasukanDetail(data: Omit<PemasukanDetail, 'id'>): PemasukanDetail {
-    const details = getFromLocalStorage<PemasukanDetail>(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL);
     const newDetail: PemasukanDetail = {
         ...data,
-        id: generateId(details),
+        id: nextId(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL),
     };
-    details.push(newDetail);
-    setToLocalStorage(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL, details);
+    putRecords(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL, [newDetail]);
     return newDetail;
 }
 
+// ==================== CHECKOUT ====================
+
+export interface CheckoutInput {
+    amount: number;
+    user_name?: string;
+    booking_ids?: number[];
+    // Barang lines of the cart
+    items?: { id: number; quantity?: number }[];
+}
+
+/**
+ * Record a sale as one transaction: the income row, one invoice line per
+ * booking and per item, the stock deductions and the bookings marked paid.
+ *
+ * Every record is read once and every change is computed before anything
+ * is written, then each collection gets a single append. If one of those
+ * writes fails the ones already made are undone and the invoice number is
+ * handed back, so a sale is either stored completely or not at all.
+ */
+export function checkout(input: CheckoutInput): { payment: Pemasukan; details: PemasukanDetail[] } {
+    // Once per booking, however often it is listed: one rental line, one rollup update
+    const bookingIds = Array.from(new Set(input.booking_ids || []));
+    const createdBy = input.user_name || 'System';
+    const bookings = bookingIds
+        .map(id => getBookingById(id))
+        .filter((b): b is Booking => b !== null);
+
+    // Sum quantities per item so a product listed twice is deducted from the
+    // same starting stock
+    const stock = new Map<number, { item: Barang; stok: number }>();
+    const lines: { item: Barang; qty: number }[] = [];
+    (input.items || []).forEach(({ id, quantity }) => {
+        const item = getBarangById(id);
+        if (!item) return;
+        const qty = Number(quantity) || 1;
+        const entry = stock.get(id) || { item, stok: item.stok };
+        entry.stok = Math.max(0, entry.stok - qty);
+        stock.set(id, entry);
+        lines.push({ item, qty });
+    });
+
+    const invoiceCounter = isBrowser() ? localStorage.getItem(invoiceSeqKey(DEMO_STORAGE_KEYS.PEMASUKAN)) : null;
+    const payment: Pemasukan = {
+        id_booking: bookingIds.length > 0 ? bookingIds[0] : undefined,
+        amount: input.amount,
+        created_by: createdBy,
+        updated_by: createdBy,
+        id: nextId(DEMO_STORAGE_KEYS.PEMASUKAN),
+        nomor_invoice: generateInvoiceNumber(),
+        created_at: getLocalISOString(),
+    };
+
+    const firstDetailId = nextId(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL, bookings.length + lines.length);
+    const details: PemasukanDetail[] = [
+        ...bookings.map(booking => ({
+            pemasukan_id: payment.id,
+            nomor_invoice: payment.nomor_invoice,
+            barang_id: undefined,
+            nama_barang: `Sewa Lapangan: ${booking.field_name} (${booking.booking_date})`,
+            harga_satuan: booking.total_price,
+            qty: 1,
+            subtotal: booking.total_price,
+        })),
+        ...lines.map(({ item, qty }) => ({
+            pemasukan_id: payment.id,
+            nomor_invoice: payment.nomor_invoice,
+            barang_id: item.id,
+            nama_barang: item.nama_barang,
+            harga_satuan: item.harga,
+            qty,
+            subtotal: Number(item.harga) * qty,
+        })),
+    ].map((detail, i) => ({ ...detail, id: firstDetailId + i }));
+
+    const paidAt = getLocalISOString();
+    const paidBookings = bookings.map(booking => ({
+        ...booking,
+        payment_status: 'paid',
+        booking_status: 'confirmed',
+        updated_at: paidAt,
+    }));
+    const updatedStock = Array.from(stock.values()).map(({ item, stok }) => ({ ...item, stok }));
+
+    if (!isBrowser()) return { payment, details };
+
+    // The income row goes last: until it is written the sale is not visible
+    const undo: (() => void)[] = [];
+    const steps: [() => string | null, () => void][] = [
+        [() => putRecords(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL, details),
+            () => deleteRecords(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL, details.map(d => d.id))],
+        [() => putRecords(DEMO_STORAGE_KEYS.BARANG, updatedStock),
+            () => putRecords(DEMO_STORAGE_KEYS.BARANG, Array.from(stock.values()).map(({ item }) => item))],
+        [() => writeBookings(paidBookings),
+            () => writeBookings(bookings)],
+        [() => putRecords(DEMO_STORAGE_KEYS.PEMASUKAN, [payment]), () => {}],
+    ];
+    for (const [apply, revert] of steps) {
+        if (apply() === null) {
+            undo.reverse().forEach(fn => fn());
+            if (invoiceCounter === null) {
+                localStorage.removeItem(invoiceSeqKey(DEMO_STORAGE_KEYS.PEMASUKAN));
+            } else {
+                localStorage.setItem(invoiceSeqKey(DEMO_STORAGE_KEYS.PEMASUKAN), invoiceCounter);
+            }
+            throw new Error(`Checkout for ${payment.nomor_invoice} could not be saved`);
+        }
+        undo.push(revert);
+    }
+
+    return { payment, details };
+}
+
+// ==================== PEMASUKAN HISTORY ====================
+
+// An income row joined with its invoice lines and primary booking
+export interface PemasukanWithDetails extends Pemasukan {
+    pemasukan_detail: PemasukanDetail[];
+    bookings: (Booking & { fields: { field_name: string } }) | null;
+}
+
+/**
+ * Income rows sorted newest first (created_at, then id), built once per
+ * revision of the collection. `position` maps an id to its place in
+ * `sorted` so a pagination cursor resolves without a scan, and `days`
+ * holds each row's created_at date for binary-searching date ranges.
+ */
+interface PemasukanIndex {
+    rev: string;
+    sorted: Pemasukan[];
+    days: string[];
+    position: Map<number, number>;
+}
+
+let pemasukanIndex: PemasukanIndex | null = null;
+let pemasukanDetailsByParent: { rev: string; byParent: Map<number, PemasukanDetail[]> } | null = null;
+
+function getPemasukanIndex(): PemasukanIndex {
+    const rev = getCollectionRevision(DEMO_STORAGE_KEYS.PEMASUKAN);
+    if (!pemasukanIndex || pemasukanIndex.rev !== rev) {
+        const rows = getFromLocalStorage<Pemasukan>(DEMO_STORAGE_KEYS.PEMASUKAN);
+        // Parse each created_at once instead of twice per comparison
+        const timestamps = new Map<Pemasukan, number>();
+        rows.forEach(p => timestamps.set(p, new Date(p.created_at).getTime()));
+        const sorted = rows.sort((a, b) => (timestamps.get(b)! - timestamps.get(a)!) || b.id - a.id);
+
+        pemasukanIndex = {
+            rev,
+            sorted,
+            days: sorted.map(p => (p.created_at || '').slice(0, 10)),
+            position: new Map(sorted.map((p, i) => [p.id, i])),
+        };
+    }
+    return pemasukanIndex;
+}
+
+// Invoice lines grouped by pemasukan_id in one pass (the hash side of the join)
+function getPemasukanDetailsByParent(): Map<number, PemasukanDetail[]> {
+    const rev = getCollectionRevision(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL);
+    if (!pemasukanDetailsByParent || pemasukanDetailsByParent.rev !== rev) {
+        const byParent = new Map<number, PemasukanDetail[]>();
+        getFromLocalStorage<PemasukanDetail>(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL).forEach(detail => {
+            const lines = byParent.get(detail.pemasukan_id);
+            if (lines) {
+                lines.push(detail);
+            } else {
+                byParent.set(detail.pemasukan_id, [detail]);
+            }
+        });
+        pemasukanDetailsByParent = { rev, byParent };
+    }
+    return pemasukanDetailsByParent.byParent;
+}
+
+// Number of leading entries of the newest-first `days` that are after `day`
+// (or on/after it when `inclusive`), i.e. where that date range starts/ends
+function countNewerThan(days: string[], day: string, inclusive: boolean): number {
+    let lo = 0;
+    let hi = days.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (days[mid] > day || (inclusive && days[mid] === day)) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+type PemasukanFilters = { id?: number; invoice?: string; from?: string; to?: string };
+
+// Rows matching the filters, newest first and not yet joined; `start` lets a
+// cursor skip the rows already returned
+function selectPemasukan(index: PemasukanIndex, filters: PemasukanFilters | undefined, start: number, max?: number): Pemasukan[] {
+    start = Math.max(start, filters?.to ? countNewerThan(index.days, filters.to, false) : 0);
+    const end = filters?.from ? countNewerThan(index.days, filters.from, true) : index.sorted.length;
+
+    if (filters?.id || filters?.invoice) {
+        return index.sorted.slice(start, end).filter(p =>
+            (!filters.id || p.id === filters.id) && (!filters.invoice || p.nomor_invoice === filters.invoice)
+        );
+    }
+    return index.sorted.slice(start, max !== undefined ? Math.min(end, start + max) : end);
+}
+
+function joinPemasukan(pemasukan: Pemasukan, detailsByParent: Map<number, PemasukanDetail[]>): PemasukanWithDetails {
+    const booking = pemasukan.id_booking ? getBookingById(pemasukan.id_booking) : null;
+    return {
+        ...pemasukan,
+        pemasukan_detail: (detailsByParent.get(pemasukan.id) || []).slice(),
+        bookings: booking ? { ...booking, fields: { field_name: booking.field_name } } : null,
+    };
+}
+
+/**
+ * Page through income history, newest first, joined with invoice lines and
+ * bookings. `from`/`to` are inclusive YYYY-MM-DD bounds on created_at.
+ * `cursor` is the id of the last row of the previous page; `nextCursor` is
+ * null on the last page. Only the rows of the returned page are joined.
+ */
+export function getPemasukanHistory(filters?: PemasukanFilters & {
+    cursor?: number;
+    limit?: number;
+}): { data: PemasukanWithDetails[]; nextCursor: number | null } {
+    const index = getPemasukanIndex();
+
+    let start = 0;
+    if (filters?.cursor !== undefined) {
+        const after = index.position.get(filters.cursor);
+        if (after === undefined) return { data: [], nextCursor: null };
+        start = after + 1;
+    }
+
+    // One extra row tells whether another page follows
+    const candidates = selectPemasukan(index, filters, start, filters?.limit !== undefined ? filters.limit + 1 : undefined);
+    const hasMore = filters?.limit !== undefined && candidates.length > filters.limit;
+    const page = hasMore ? candidates.slice(0, filters!.limit) : candidates;
+
+    const detailsByParent = getPemasukanDetailsByParent();
+    const data = page.map(pemasukan => joinPemasukan(pemasukan, detailsByParent));
+
+    return { data, nextCursor: hasMore ? page[page.length - 1].id : null };
+}
+
+// Same rows as getPemasukanHistory without paging, joined one at a time as
+// the consumer pulls them (for streaming exports)
+export function* iteratePemasukanHistory(filters?: PemasukanFilters): Generator<PemasukanWithDetails> {
+    const rows = selectPemasukan(getPemasukanIndex(), filters, 0);
+    const detailsByParent = getPemasukanDetailsByParent();
+    for (const pemasukan of rows) {
+        yield joinPemasukan(pemasukan, detailsByParent);
+    }
+}
+
 // ==================== SYSTEM PROMPTS CRUD ====================
 
 export function getSystemPrompts(activeOnly?: boolean): SystemPrompt[] {
@@ -498,54 +1555,49 @@ export function getSystemPrompts(activeOnly?: boolean): SystemPrompt[] {
 }
 
 export function getSystemPromptById(id: number): SystemPrompt | null {
-    const prompts = getFromLocalStorage<SystemPrompt>(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS);
-    return prompts.find(p => p.id === id) || null;
+    return getRecordById<SystemPrompt>(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, id);
 }
 
 export function createSystemPrompt(data: Omit<SystemPrompt, 'id' | 'created_at' | 'updated_at' | 'version'>): SystemPrompt {
-    const prompts = getFromLocalStorage<SystemPrompt>(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS);
     const newPrompt: SystemPrompt = {
         ...data,
-        id: generateId(prompts),
+        id: nextId(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS),
         is_active: false,
         version: 1,
         created_at: getLocalISOString(),
         updated_at: getLocalISOString(),
     };
-    prompts.push(newPrompt);
-    setToLocalStorage(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, prompts);
+    putRecords(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, [newPrompt]);
     return newPrompt;
 }
 
 export function updateSystemPrompt(id: number, data: Partial<SystemPrompt>): SystemPrompt | null {
-    const prompts = getFromLocalStorage<SystemPrompt>(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS);
-    const index = prompts.findIndex(p => p.id === id);
-    if (index === -1) return null;
-
-    // If setting this as active, deactivate all others
-    if (data.is_active) {
-        prompts.forEach((p, i) => {
-            if (i !== index) p.is_active = false;
-        });
-    }
+    const prompt = getSystemPromptById(id);
+    if (!prompt) return null;
 
-    prompts[index] = {
-        ...prompts[index],
+    const updated: SystemPrompt = {
+        ...prompt,
         ...data,
         updated_at: getLocalISOString(),
-        version: data.prompt_content ? (prompts[index].version || 0) + 1 : prompts[index].version,
+        version: data.prompt_content ? (prompt.version || 0) + 1 : prompt.version,
     };
-    setToLocalStorage(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, prompts);
-    return prompts[index];
+
+    // If setting this as active, deactivate all others
+    const deactivated = data.is_active
+        ? getFromLocalStorage<SystemPrompt>(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS)
+            .filter(p => p.id !== id && p.is_active)
+            .map(p => ({ ...p, is_active: false }))
+        : [];
+
+    putRecords(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, [...deactivated, updated]);
+    return updated;
 }
 
 export function deleteSystemPrompt(id: number): boolean {
     if (id === 1) return false; // Cannot delete default prompt
 
-    const prompts = getFromLocalStorage<SystemPrompt>(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS);
-    const filteredPrompts = prompts.filter(p => p.id !== id);
-    if (filteredPrompts.length === prompts.length) return false;
-    setToLocalStorage(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, filteredPrompts);
+    if (!getSystemPromptById(id)) return false;
+    deleteRecords(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, [id]);
     return true;
 }
 
@@ -554,14 +1606,80 @@ export function deleteSystemPrompt(id: number): boolean {
 export function resetDemoData(): void {
     if (!isBrowser()) return;
 
-    // Clear all demo data
+    // Clear all demo data, including each collection's log and counters
     Object.values(DEMO_STORAGE_KEYS).forEach(key => {
+        clearLog(key);
         localStorage.removeItem(key);
+        localStorage.removeItem(revisionKey(key));
+        localStorage.removeItem(nextIdKey(key));
+        localStorage.removeItem(invoiceSeqKey(key));
+        clearLocalChanges(key);
+        materialized.delete(key);
     });
+    // Revisions restart after a reset, so drop everything derived from them
+    fieldsView = null;
+    bookingIndex = null;
+    pendingSearch = null;
+    bookingRollups = null;
+    pemasukanIndex = null;
+    pemasukanDetailsByParent = null;
 
     console.log('Demo data cleared. Refresh the page to re-seed from Supabase.');
 }
 
+// ==================== SEED SYNC ====================
+
+// Collections filled by /api/demo-seed, by the key they have in its response
+const SEED_STORAGE_KEYS: Record<SeedDataKey, string> = {
+    sports: DEMO_STORAGE_KEYS.SPORTS,
+    fields: DEMO_STORAGE_KEYS.FIELDS,
+    fieldImages: DEMO_STORAGE_KEYS.FIELD_IMAGES,
+    bookings: DEMO_STORAGE_KEYS.BOOKINGS,
+    barang: DEMO_STORAGE_KEYS.BARANG,
+    pemasukan: DEMO_STORAGE_KEYS.PEMASUKAN,
+    pemasukanDetail: DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL,
+    systemPrompts: DEMO_STORAGE_KEYS.SYSTEM_PROMPTS,
+};
+
+export type SeedRows = Partial<Record<SeedDataKey, { id: number }[]>>;
+
+// Cursor returned by the last applied /api/demo-seed delta, if any
+export function getSyncCursor(): string | null {
+    if (!isBrowser()) return null;
+    return localStorage.getItem(DEMO_STORAGE_KEYS.SYNC_CURSOR);
+}
+
+export function setSyncCursor(cursor: string): void {
+    if (!isBrowser()) return;
+    localStorage.setItem(DEMO_STORAGE_KEYS.SYNC_CURSOR, cursor);
+}
+
+/**
+ * Upsert one delta batch: changed rows replace the local copy with the same
+ * id, new rows are added. Seed rows edited or deleted locally are skipped,
+ * and rows created locally have ids no seed row uses, so a background sync
+ * never undoes what the user did (a confirmed or paid booking keeps its
+ * local state). The cursor only advances when every collection took its
+ * rows, so a failed batch is fetched again on the next sync.
+ */
+export function applySeedDelta(data: SeedRows, cursor: string): boolean {
+    if (!isBrowser()) return false;
+
+    let complete = true;
+    (Object.keys(SEED_STORAGE_KEYS) as SeedDataKey[]).forEach(name => {
+        const key = SEED_STORAGE_KEYS[name];
+        const local = getLocalChanges(key);
+        const rows = (data[name] || []).filter(row => !local.has(row.id));
+        if (rows.length === 0) return;
+        // Before the write, so no id handed out meanwhile can be one of these
+        raiseNextId(key, rows);
+        // Straight to the log: upstream rows are not local changes
+        if (appendToLog(key, { op: 'put', rows }) === null) complete = false;
+    });
+    if (complete) setSyncCursor(cursor);
+    return complete;
+}
+
 // Export for seeding
 export function seedDemoData(data: {
     sports: Sport[];
@@ -575,12 +1693,14 @@ export function seedDemoData(data: {
 }): void {
     if (!isBrowser()) return;
 
+    Object.values(SEED_STORAGE_KEYS).forEach(clearLocalChanges);
     setToLocalStorage(DEMO_STORAGE_KEYS.SPORTS, data.sports);
     setToLocalStorage(DEMO_STORAGE_KEYS.FIELDS, data.fields);
     setToLocalStorage(DEMO_STORAGE_KEYS.FIELD_IMAGES, data.fieldImages);
     setToLocalStorage(DEMO_STORAGE_KEYS.BOOKINGS, data.bookings);
     setToLocalStorage(DEMO_STORAGE_KEYS.BARANG, data.barang);
     setToLocalStorage(DEMO_STORAGE_KEYS.PEMASUKAN, data.pemasukan);
+    localStorage.removeItem(invoiceSeqKey(DEMO_STORAGE_KEYS.PEMASUKAN));
     setToLocalStorage(DEMO_STORAGE_KEYS.PEMASUKAN_DETAIL, data.pemasukanDetail);
     setToLocalStorage(DEMO_STORAGE_KEYS.SYSTEM_PROMPTS, data.systemPrompts);
     setDemoInitialized();
@@ -0,0 +1,123 @@
+/**
+ * Conditional GET and compression for catalog reads.
+ *
+ * The strong ETag is a hash of the serialized JSON body, so it is right by
+ * construction: it changes exactly when the response would. A request
+ * whose If-None-Match carries it gets an empty 304. The body is still read
+ * and serialized every time; what a 304 saves is the transfer. Compressed
+ * bodies (brotli or gzip, from COMPRESS_MIN_BYTES up, when the client
+ * accepts them) are kept per URL and reused for as long as the hash stays
+ * the same.
+ *
+ * Strong validators must differ per representation, so compressed bodies
+ * carry the ETag with a -br / -gzip suffix; If-None-Match matches any of
+ * them, and a 304 carries the ETag of the representation this request
+ * would have been sent. Responses are `Cache-Control: no-cache`: clients may keep them but
+ * revalidate every time, which costs a 304 while the data is unchanged.
+ */
+
+import { createHash } from 'crypto';
+import { brotliCompressSync, constants as zlibConstants, gzipSync } from 'zlib';
+import { NextRequest } from 'next/server';
+import { ServerTimer, SERVER_TIMING_PHASES } from '@/lib/serverTiming';
+
+export const COMPRESS_MIN_BYTES = 1024;
+
+// Distinct URLs (query strings) whose compressed bodies are kept; cleared when full
+const MAX_CACHED_BODIES = 64;
+
+type ContentEncoding = 'br' | 'gzip' | 'identity';
+
+interface CachedBody {
+    hash: string;
+    encoded: Partial<Record<ContentEncoding, Uint8Array>>;
+}
+
+const bodies = new Map<string, CachedBody>();
+const encoder = new TextEncoder();
+
+const etagFor = (hash: string, encoding: ContentEncoding) =>
+    `"c.${hash}${encoding === 'identity' ? '' : `-${encoding}`}"`;
+
+function matchesIfNoneMatch(header: string | null, hash: string): boolean {
+    if (!header) return false;
+    const current = etagFor(hash, 'identity');
+    return header.split(',').some(tag => {
+        const value = tag.trim().replace(/^W\//, '');
+        return value === '*' || value.replace(/-(br|gzip)"$/, '"') === current;
+    });
+}
+
+// Preferred encoding the client accepts (q > 0), brotli first
+function negotiateEncoding(header: string | null): ContentEncoding {
+    const accepted = new Map<string, number>();
+    (header || '').split(',').forEach(part => {
+        const [name, ...params] = part.trim().toLowerCase().split(';');
+        const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+        if (name) accepted.set(name, q ? parseFloat(q.slice(2)) || 0 : 1);
+    });
+    const allows = (name: string) => (accepted.get(name) ?? accepted.get('*') ?? 0) > 0;
+    if (allows('br')) return 'br';
+    if (allows('gzip')) return 'gzip';
+    return 'identity';
+}
+
+function compress(body: Uint8Array, encoding: ContentEncoding): Uint8Array {
+    if (encoding === 'br') {
+        return brotliCompressSync(body, { params: { [zlibConstants.BROTLI_PARAM_QUALITY]: 5 } });
+    }
+    return gzipSync(body);
+}
+
+/**
+ * JSON response for `load()` with a body-hash ETag: 304 when the client
+ * already has it, otherwise the (possibly compressed) body.
+ */
+export async function conditionalJson(
+    request: NextRequest,
+    timer: ServerTimer,
+    load: () => unknown
+): Promise<Response> {
+    const headers = new Headers({
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept-Encoding',
+    });
+
+    const data = await timer.time(SERVER_TIMING_PHASES.STORE, load);
+    const start = performance.now();
+    const identity = encoder.encode(JSON.stringify(data));
+    const hash = createHash('sha1').update(identity).digest('hex').slice(0, 20);
+    timer.add(SERVER_TIMING_PHASES.SERIALIZE, performance.now() - start);
+
+    const url = request.nextUrl.pathname + request.nextUrl.search;
+    let cached = bodies.get(url);
+    if (!cached || cached.hash !== hash) {
+        if (bodies.size >= MAX_CACHED_BODIES) bodies.clear();
+        cached = { hash, encoded: { identity } };
+        bodies.set(url, cached);
+    }
+
+    let encoding = identity.byteLength >= COMPRESS_MIN_BYTES
+        ? negotiateEncoding(request.headers.get('Accept-Encoding'))
+        : 'identity';
+    let body = cached.encoded[encoding];
+    if (!body) {
+        const start = performance.now();
+        body = compress(identity, encoding);
+        timer.add(SERVER_TIMING_PHASES.COMPRESS, performance.now() - start);
+        cached.encoded[encoding] = body;
+    }
+    if (encoding !== 'identity' && body.byteLength >= identity.byteLength) {
+        encoding = 'identity';
+        body = identity;
+    }
+
+    headers.set('ETag', etagFor(hash, encoding));
+    if (matchesIfNoneMatch(request.headers.get('If-None-Match'), hash)) {
+        return new Response(null, { status: 304, headers });
+    }
+
+    headers.set('Content-Type', 'application/json');
+    if (encoding !== 'identity') headers.set('Content-Encoding', encoding);
+    return new Response(body, { status: 200, headers });
+}
@@ -0,0 +1,113 @@
+/**
+ * Streaming image uploads into public/images.
+ *
+ * The body is written to a temporary file chunk by chunk while its size is
+ * counted and its SHA-256 computed, so an upload never sits in memory as a
+ * whole and an oversized one is cut off as soon as it crosses the limit.
+ * The finished file is named after its content hash: uploading the same
+ * image twice yields the same URL, and the URL of a file never changes
+ * content, which lets browsers and the variant cache keep it forever.
+ */
+
+import { createHash, randomUUID } from 'crypto';
+import { createWriteStream } from 'fs';
+import { access, mkdir, rename, unlink } from 'fs/promises';
+import path from 'path';
+
+export const MAX_UPLOAD_BYTES = 10 * 1024 * 1024;
+
+// Room for the boundaries and part headers around the file in a multipart body
+export const MULTIPART_OVERHEAD_BYTES = 64 * 1024;
+
+// Extension stored for each accepted image type
+export const IMAGE_TYPES: Record<string, string> = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif',
+};
+
+const IMAGE_EXTENSIONS = new Set([...Object.values(IMAGE_TYPES), '.jpeg']);
+
+export const UPLOAD_DIR = path.join(process.cwd(), 'public/images');
+
+export class UploadTooLargeError extends Error {
+    constructor(public readonly limit: number) {
+        super(`Upload exceeds ${limit} bytes`);
+        this.name = 'UploadTooLargeError';
+    }
+}
+
+// Extension for a multipart file name, or null when it is not an image
+export function imageExtension(filename: string): string | null {
+    const ext = path.extname(filename).toLowerCase();
+    return IMAGE_EXTENSIONS.has(ext) ? ext : null;
+}
+
+/**
+ * Pass `body` through unchanged, failing it with UploadTooLargeError once
+ * more than `maxBytes` have gone by.
+ */
+export function limitStream(body: ReadableStream<Uint8Array>, maxBytes: number): ReadableStream<Uint8Array> {
+    let bytes = 0;
+    return body.pipeThrough(new TransformStream<Uint8Array, Uint8Array>({
+        transform(chunk, controller) {
+            bytes += chunk.byteLength;
+            if (bytes > maxBytes) throw new UploadTooLargeError(maxBytes);
+            controller.enqueue(chunk);
+        },
+    }));
+}
+
+/**
+ * Write `body` under public/images as `<content hash><ext>` and return its
+ * public path (/images/...). Throws UploadTooLargeError once more than
+ * `maxBytes` have arrived; the partial file is removed.
+ */
+export async function saveImageStream(
+    body: ReadableStream<Uint8Array>,
+    ext: string,
+    maxBytes: number = MAX_UPLOAD_BYTES
+): Promise<{ url: string; bytes: number }> {
+    await mkdir(UPLOAD_DIR, { recursive: true });
+    const tmpPath = path.join(UPLOAD_DIR, `.upload-${randomUUID()}`);
+    const out = createWriteStream(tmpPath);
+    const failed = new Promise<never>((_, reject) => out.once('error', reject));
+    failed.catch(() => { });
+    const hash = createHash('sha256');
+    const reader = body.getReader();
+    let bytes = 0;
+
+    try {
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            bytes += value.byteLength;
+            if (bytes > maxBytes) {
+                await reader.cancel();
+                throw new UploadTooLargeError(maxBytes);
+            }
+            hash.update(value);
+            // Respect backpressure so a fast client cannot pile chunks up in memory
+            if (!out.write(value)) {
+                await Promise.race([new Promise<void>(resolve => out.once('drain', () => resolve())), failed]);
+            }
+        }
+        await Promise.race([new Promise<void>(resolve => out.end(() => resolve())), failed]);
+    } catch (error) {
+        out.destroy();
+        await unlink(tmpPath).catch(() => { });
+        throw error;
+    }
+
+    const filename = `${hash.digest('hex').slice(0, 32)}${ext}`;
+    const finalPath = path.join(UPLOAD_DIR, filename);
+    const exists = await access(finalPath).then(() => true, () => false);
+    if (exists) {
+        await unlink(tmpPath);
+    } else {
+        await rename(tmpPath, finalPath);
+    }
+    return { url: `/images/${filename}`, bytes };
+}
@@ -0,0 +1,48 @@
+/**
+ * Resized / WebP variants of local images.
+ *
+ * Variants come from the Next.js image optimizer (/_next/image), which
+ * resizes, re-encodes to WebP for browsers that accept it and keeps the
+ * result in its on-disk cache (.next/cache/images). Uploaded files are
+ * named by content hash, so a variant URL always maps to the same bytes.
+ *
+ * Only same-origin /images/... paths are rewritten; remote URLs are
+ * returned unchanged.
+ */
+
+// Must be members of the images.deviceSizes configured in next.config.js
+export const IMAGE_VARIANT_WIDTHS = [640, 1080, 1920] as const;
+export const IMAGE_VARIANT_QUALITY = 75;
+
+export function isLocalImage(src: string | null | undefined): src is string {
+    return !!src && src.startsWith('/images/');
+}
+
+export function imageVariantUrl(src: string, width: number): string {
+    if (!isLocalImage(src)) return src;
+    return `/_next/image?url=${encodeURIComponent(src)}&w=${width}&q=${IMAGE_VARIANT_QUALITY}`;
+}
+
+// srcSet covering every variant width, or undefined for remote images
+export function imageVariantSrcSet(src: string): string | undefined {
+    if (!isLocalImage(src)) return undefined;
+    return IMAGE_VARIANT_WIDTHS.map(width => `${imageVariantUrl(src, width)} ${width}w`).join(', ');
+}
+
+/**
+ * Ask the optimizer for every variant of a freshly uploaded image so the
+ * first visitor is served from cache. Failures are logged, not thrown.
+ */
+export async function prewarmImageVariants(origin: string, src: string): Promise<void> {
+    const results = await Promise.allSettled(IMAGE_VARIANT_WIDTHS.map(width =>
+        fetch(new URL(imageVariantUrl(src, width), origin), { headers: { Accept: 'image/webp,image/*' } })
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.arrayBuffer();
+            })
+    ));
+    const failed = results.filter(result => result.status === 'rejected').length;
+    if (failed > 0) {
+        console.warn(`Prewarming ${failed} variant(s) of ${src} failed`);
+    }
+}
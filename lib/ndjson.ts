@@ -0,0 +1,44 @@
+/**
+ * Newline-delimited JSON streaming for list endpoints.
+ *
+ * Rows are pulled from an iterable only as the client reads, serialized a
+ * chunk at a time, so exporting a long history never builds the whole
+ * response string in memory. Routes opt in with ?format=ndjson.
+ */
+
+export const NDJSON_CONTENT_TYPE = 'application/x-ndjson';
+
+const ROWS_PER_CHUNK = 200;
+
+export function wantsNdjson(searchParams: URLSearchParams): boolean {
+    return searchParams.get('format') === 'ndjson';
+}
+
+export function ndjsonResponse<T>(rows: Iterable<T>, init: ResponseInit = {}): Response {
+    const iterator = rows[Symbol.iterator]();
+    const encoder = new TextEncoder();
+
+    const stream = new ReadableStream<Uint8Array>({
+        pull(controller) {
+            let chunk = '';
+            for (let i = 0; i < ROWS_PER_CHUNK; i++) {
+                const next = iterator.next();
+                if (next.done) {
+                    if (chunk) controller.enqueue(encoder.encode(chunk));
+                    controller.close();
+                    return;
+                }
+                chunk += JSON.stringify(next.value) + '\n';
+            }
+            controller.enqueue(encoder.encode(chunk));
+        },
+        cancel() {
+            iterator.return?.();
+        },
+    });
+
+    const headers = new Headers(init.headers);
+    headers.set('Content-Type', NDJSON_CONTENT_TYPE);
+    headers.set('Cache-Control', 'no-store');
+    return new Response(stream, { ...init, headers });
+}
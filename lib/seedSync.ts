@@ -0,0 +1,168 @@
+/**
+ * Incremental sync protocol for /api/demo-seed.
+ *
+ * Instead of every client pulling whole tables, the client keeps a cursor
+ * holding one high-water mark per table and asks only for rows past it:
+ *
+ * - tables with updated_at are read in (updated_at, id) order, so edited
+ *   rows come back as well as new ones;
+ * - insert-only tables (field_images, pemasukan_detail) are read in id order.
+ *
+ * Each response carries at most `limit` rows per table, packed as
+ * { columns, rows } so keys are not repeated per row, plus the advanced
+ * cursor and whether any table has more to send. Rows deleted upstream are
+ * not detected; resetting the demo re-seeds from scratch.
+ *
+ * The query side takes the Supabase client as a parameter so this module
+ * stays importable from the browser bundle.
+ */
+
+export type SeedDataKey =
+    | 'sports'
+    | 'fields'
+    | 'fieldImages'
+    | 'bookings'
+    | 'barang'
+    | 'pemasukan'
+    | 'pemasukanDetail'
+    | 'systemPrompts';
+
+export interface SeedTable {
+    key: SeedDataKey;
+    table: string;
+    // false for tables without an updated_at column
+    tracksUpdates: boolean;
+}
+
+export const SEED_TABLES: SeedTable[] = [
+    { key: 'sports', table: 'sports', tracksUpdates: true },
+    { key: 'fields', table: 'fields', tracksUpdates: true },
+    { key: 'fieldImages', table: 'field_images', tracksUpdates: false },
+    { key: 'bookings', table: 'bookings', tracksUpdates: true },
+    { key: 'barang', table: 'barang', tracksUpdates: true },
+    { key: 'pemasukan', table: 'pemasukan', tracksUpdates: true },
+    { key: 'pemasukanDetail', table: 'pemasukan_detail', tracksUpdates: false },
+    { key: 'systemPrompts', table: 'system_prompts', tracksUpdates: true },
+];
+
+export const DEFAULT_SYNC_BATCH = 500;
+export const MAX_SYNC_BATCH = 2000;
+
+// Last row sent per table: [updated_at, id]; updated_at is null for insert-only tables
+export type SyncMark = [string | null, number];
+export type SyncCursor = Partial<Record<SeedDataKey, SyncMark>>;
+
+export interface PackedRows {
+    columns: string[];
+    rows: unknown[][];
+}
+
+export interface SeedDelta {
+    data: Record<SeedDataKey, PackedRows>;
+    cursor: string;
+    hasMore: boolean;
+}
+
+// ==================== CURSOR ====================
+
+export function encodeSyncCursor(cursor: SyncCursor): string {
+    return btoa(JSON.stringify(cursor)).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+}
+
+// Returns null for a malformed token; an empty token means "from the start"
+export function decodeSyncCursor(token: string | null): SyncCursor | null {
+    if (!token) return {};
+    try {
+        const cursor = JSON.parse(atob(token.replace(/-/g, '+').replace(/_/g, '/')));
+        if (!cursor || typeof cursor !== 'object' || Array.isArray(cursor)) return null;
+        for (const table of SEED_TABLES) {
+            const mark = cursor[table.key];
+            if (mark === undefined) continue;
+            if (!Array.isArray(mark) || mark.length !== 2 || typeof mark[1] !== 'number'
+                || (mark[0] !== null && typeof mark[0] !== 'string')) {
+                return null;
+            }
+        }
+        return cursor;
+    } catch {
+        return null;
+    }
+}
+
+// ==================== PACKING ====================
+
+export function packRows(rows: Record<string, unknown>[]): PackedRows {
+    const columns: string[] = [];
+    const seen = new Set<string>();
+    rows.forEach(row => Object.keys(row).forEach(column => {
+        if (!seen.has(column)) {
+            seen.add(column);
+            columns.push(column);
+        }
+    }));
+    return { columns, rows: rows.map(row => columns.map(column => row[column] ?? null)) };
+}
+
+export function unpackRows<T>(packed: PackedRows | undefined): T[] {
+    if (!packed) return [];
+    return packed.rows.map(values => {
+        const row: Record<string, unknown> = {};
+        packed.columns.forEach((column, i) => { row[column] = values[i]; });
+        return row as T;
+    });
+}
+
+// ==================== QUERY ====================
+
+// PostgREST needs values with reserved characters (":", ",", ".") quoted
+const quote = (value: string) => `"${value.replace(/"/g, '\\"')}"`;
+
+function deltaQuery(client: any, table: SeedTable, mark: SyncMark | undefined, limit: number) {
+    let query = client.from(table.table).select('*');
+
+    if (!table.tracksUpdates) {
+        if (mark) query = query.gt('id', mark[1]);
+        return query.order('id', { ascending: true }).limit(limit);
+    }
+
+    if (mark) {
+        const [updatedAt, id] = mark;
+        query = updatedAt === null
+            // Rows without updated_at sort first; finish them, then everything dated
+            ? query.or(`and(updated_at.is.null,id.gt.${id}),updated_at.not.is.null`)
+            : query.or(`updated_at.gt.${quote(updatedAt)},and(updated_at.eq.${quote(updatedAt)},id.gt.${id})`);
+    }
+    return query
+        .order('updated_at', { ascending: true, nullsFirst: true })
+        .order('id', { ascending: true })
+        .limit(limit);
+}
+
+/**
+ * Read the next batch of every table past `cursor`. A table that errors
+ * (e.g. does not exist yet) contributes no rows and keeps its mark, as the
+ * full seed does.
+ */
+export async function fetchSeedDelta(client: any, cursor: SyncCursor, limit: number = DEFAULT_SYNC_BATCH): Promise<SeedDelta> {
+    const results = await Promise.all(SEED_TABLES.map(table => deltaQuery(client, table, cursor[table.key], limit)));
+
+    const next: SyncCursor = { ...cursor };
+    const data = {} as Record<SeedDataKey, PackedRows>;
+    let hasMore = false;
+
+    SEED_TABLES.forEach((table, i) => {
+        const { data: rows, error } = results[i] as { data: Record<string, any>[] | null; error: any };
+        if (error) {
+            console.warn(`Error fetching ${table.table} delta:`, error.message);
+        }
+        const batch = error ? [] : rows || [];
+        if (batch.length > 0) {
+            const last = batch[batch.length - 1];
+            next[table.key] = [table.tracksUpdates ? last.updated_at ?? null : null, last.id];
+        }
+        hasMore = hasMore || batch.length >= limit;
+        data[table.key] = packRows(batch);
+    });
+
+    return { data, cursor: encodeSyncCursor(next), hasMore };
+}
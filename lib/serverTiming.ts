@@ -0,0 +1,116 @@
+/**
+ * Per-request timing for API routes.
+ *
+ * Wrap a handler with withServerTiming and time its phases through the
+ * timer it receives (parse, store, serialize, ...). Durations of the same
+ * phase are summed. The response carries them as a Server-Timing header
+ * together with the total, and one structured JSON line is logged per
+ * request:
+ *
+ *   {"type":"server_timing","route":"/api/booking","method":"POST","status":201,"timings":{"parse":0.4,...}}
+ *
+ * Set SERVER_TIMING_LOG=0 to silence the log lines; the header is always sent.
+ * While a CPU profile is running (lib/cpuProfiler) the request's window is
+ * recorded too, so samples can be attributed to routes; it stays open until
+ * the response body has been sent.
+ */
+
+import { NextRequest } from 'next/server';
+import { endAfterBody, isCpuProfileRunning, trackRequest } from '@/lib/cpuProfiler';
+
+export const SERVER_TIMING_PHASES = {
+    PARSE: 'parse',
+    STORE: 'store',
+    SERIALIZE: 'serialize',
+    COMPRESS: 'compress',
+    TOTAL: 'total',
+} as const;
+
+export class ServerTimer {
+    private readonly durations = new Map<string, number>();
+    private readonly startedAt = performance.now();
+
+    // Run fn and add its duration (sync or async) to the named phase
+    async time<T>(name: string, fn: () => T | Promise<T>): Promise<T> {
+        const start = performance.now();
+        try {
+            return await fn();
+        } finally {
+            this.add(name, performance.now() - start);
+        }
+    }
+
+    add(name: string, ms: number): void {
+        this.durations.set(name, (this.durations.get(name) || 0) + ms);
+    }
+
+    // JSON response whose stringify cost is recorded as the serialize phase
+    json(data: unknown, init: ResponseInit = {}): Response {
+        const start = performance.now();
+        const body = JSON.stringify(data);
+        this.add(SERVER_TIMING_PHASES.SERIALIZE, performance.now() - start);
+
+        const headers = new Headers(init.headers);
+        headers.set('Content-Type', 'application/json');
+        return new Response(body, { ...init, headers });
+    }
+
+    elapsed(): number {
+        return performance.now() - this.startedAt;
+    }
+
+    timings(): Record<string, number> {
+        const result: Record<string, number> = {};
+        this.durations.forEach((ms, name) => { result[name] = round(ms); });
+        result[SERVER_TIMING_PHASES.TOTAL] = round(this.elapsed());
+        return result;
+    }
+}
+
+export function formatServerTiming(timings: Record<string, number>): string {
+    return Object.entries(timings)
+        .map(([name, ms]) => `${name};dur=${ms}`)
+        .join(', ');
+}
+
+function round(ms: number): number {
+    return Math.round(ms * 100) / 100;
+}
+
+type TimedHandler<C> = (request: NextRequest, timer: ServerTimer, context: C) => Promise<Response>;
+
+export function withServerTiming<C = any>(route: string, handler: TimedHandler<C>) {
+    return async (request: NextRequest, context: C): Promise<Response> => {
+        const timer = new ServerTimer();
+        const endProfiledRequest = trackRequest(`${request.method} ${route}`);
+        let bodyEndsWindow = false;
+        let status = 500;
+        let timings: Record<string, number> | undefined;
+        try {
+            const response = await handler(request, timer, context);
+            status = response.status;
+            timings = timer.timings();
+            try {
+                response.headers.set('Server-Timing', formatServerTiming(timings));
+            } catch (e) {
+                // Immutable headers (e.g. a proxied fetch response); keep the log line only
+            }
+            if (isCpuProfileRunning()) {
+                bodyEndsWindow = true;
+                return endAfterBody(response, endProfiledRequest);
+            }
+            return response;
+        } finally {
+            if (!bodyEndsWindow) endProfiledRequest();
+            if (process.env.SERVER_TIMING_LOG !== '0') {
+                console.log(JSON.stringify({
+                    type: 'server_timing',
+                    route,
+                    method: request.method,
+                    status,
+                    timings: timings || timer.timings(),
+                }));
+            }
+        }
+    };
+}
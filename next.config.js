@@ -4,6 +4,8 @@ const nextConfig = {
     ignoreDuringBuilds: true,
   },
   images: { 
+    // Variants of /images/* (see lib/imageVariants.ts) are cached on disk for a day
+    minimumCacheTTL: 86400,
     remotePatterns: [
       {
         protocol: 'https',
@@ -25,6 +27,15 @@ const nextConfig = {
       }
     ]
   },
+  async headers() {
+    return [
+      {
+        // Uploads are named by content hash, so their bytes never change
+        source: '/images/:hash([0-9a-f]{32}).:ext',
+        headers: [{ key: 'Cache-Control', value: 'public, max-age=31536000, immutable' }],
+      },
+    ];
+  },
 };
 
 module.exports = nextConfig;
@@ -0,0 +1,198 @@
+#!/usr/bin/env node
+/**
+ * Prewarm the API before it takes traffic.
+ *
+ * Next compiles (next dev) or loads (next start) each route module on its
+ * first request, so the first booking after a restart waits a second or
+ * more. This script sends every route under app/api an OPTIONS request,
+ * which Next answers without running a handler, and then runs the catalog
+ * reads once, so their code paths are loaded and JIT-warm and the HTTP body
+ * cache (lib/httpCache) and the chat prompt and catalog cache
+ * (lib/catalogCache) are filled. The demo store itself lives in the
+ * browser's localStorage; on the server it is empty and has no indexes to
+ * build, so there is nothing of it to prime here.
+ *
+ *   node scripts/prewarm.mjs                        # warm a server already running on :4000
+ *   node scripts/prewarm.mjs --url http://localhost:3000
+ *   node scripts/prewarm.mjs --spawn dev            # npm run dev:warm
+ *   node scripts/prewarm.mjs --spawn start          # npm run start:warm
+ *
+ * With --spawn the script runs `next dev|start` itself and holds back Next's
+ * "Ready" line until prewarming is done, so "Ready" means warm. That only
+ * delays the log line: Next listens before it prints "Ready" and serves
+ * whatever arrives meanwhile, so traffic is not gated. Requests sent before
+ * the line still pay for compiling their route; a deploy that must not see
+ * them should wait for the line (or run this script) before routing users.
+ */
+
+import { spawn } from 'node:child_process';
+import { readdirSync, statSync } from 'node:fs';
+import { createRequire } from 'node:module';
+import path from 'node:path';
+import { createInterface } from 'node:readline';
+import { fileURLToPath } from 'node:url';
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..');
+const API_DIR = path.join(ROOT, 'app', 'api');
+
+// Reads that fill the server's HTTP body and chat caches; mirrors the chat route's catalog fetches
+const PRIME_REQUESTS = [
+  '/api/sports',
+  '/api/sports?isAvailable=true',
+  '/api/fields?isAvailable=true',
+  '/api/barang',
+  '/api/system-prompts',
+  '/api/ai-chat?prewarm=1',
+];
+
+const READY_LINE = /Ready in|ready started server/i;
+
+function parseArgs(argv) {
+  const args = { port: '4000', url: null, spawn: null, concurrency: 4, timeoutMs: 120_000 };
+  for (let i = 0; i < argv.length; i++) {
+    const [flag, value] = [argv[i], argv[i + 1]];
+    if (flag === '--spawn') { args.spawn = value; i++; }
+    else if (flag === '--port' || flag === '-p') { args.port = value; i++; }
+    else if (flag === '--url') { args.url = value; i++; }
+    else if (flag === '--concurrency') { args.concurrency = Math.max(1, parseInt(value, 10) || 1); i++; }
+    else if (flag === '--timeout') { args.timeoutMs = parseFloat(value) * 1000; i++; }
+    else throw new Error(`Unknown argument: ${flag}`);
+  }
+  if (args.spawn && !['dev', 'start'].includes(args.spawn)) {
+    throw new Error("--spawn takes 'dev' or 'start'");
+  }
+  args.url = args.url || `http://localhost:${args.port}`;
+  return args;
+}
+
+/** URL path of every route.ts under app/api; dynamic segments get a placeholder. */
+export function discoverRoutes(dir = API_DIR, segments = ['api']) {
+  const routes = [];
+  for (const entry of readdirSync(dir).sort()) {
+    const full = path.join(dir, entry);
+    if (statSync(full).isDirectory()) {
+      if (entry.startsWith('_')) continue;
+      // (group) folders do not appear in the URL
+      const segment = /^\(.*\)$/.test(entry) ? null : entry.replace(/^\[\.{0,3}.*\]$/, '0');
+      routes.push(...discoverRoutes(full, segment ? [...segments, segment] : segments));
+    } else if (/^route\.(ts|js)$/.test(entry)) {
+      routes.push('/' + segments.join('/'));
+    }
+  }
+  return routes;
+}
+
+async function timed(url, init) {
+  const start = performance.now();
+  try {
+    const response = await fetch(url, { ...init, cache: 'no-store' });
+    await response.arrayBuffer();
+    return { status: response.status, ms: performance.now() - start };
+  } catch (error) {
+    return { status: 0, ms: performance.now() - start, error: error.message };
+  }
+}
+
+async function inPool(items, concurrency, fn) {
+  const results = new Array(items.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index]);
+    }
+  };
+  await Promise.all(Array.from({ length: Math.min(concurrency, items.length) }, worker));
+  return results;
+}
+
+async function waitForServer(baseUrl, timeoutMs) {
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    const { status } = await timed(`${baseUrl}/api/health`, { method: 'OPTIONS' });
+    if (status > 0) return;
+    await new Promise(resolve => setTimeout(resolve, 250));
+  }
+  throw new Error(`No response from ${baseUrl} within ${timeoutMs / 1000}s`);
+}
+
+/** Compile/load every API route, then prime the caches. Returns a summary. */
+export async function prewarm(baseUrl, { concurrency = 4 } = {}) {
+  const start = performance.now();
+  const routes = discoverRoutes();
+  const compiled = await inPool(routes, concurrency, async route => ({
+    route,
+    ...(await timed(`${baseUrl}${route}`, { method: 'OPTIONS' })),
+  }));
+  // Sequential: several of these read what the previous ones cached
+  const primed = [];
+  for (const route of PRIME_REQUESTS) {
+    primed.push({ route, ...(await timed(`${baseUrl}${route}`)) });
+  }
+  const failed = [...compiled, ...primed].filter(r => r.status === 0 || r.status >= 500);
+  return { routes: compiled, primed, failed, ms: performance.now() - start };
+}
+
+function describe(summary) {
+  const warm = summary.routes.filter(r => r.status > 0 && r.status < 500).length;
+  return `${warm}/${summary.routes.length} API routes in ${(summary.ms / 1000).toFixed(1)}s`;
+}
+
+function reportFailures(summary) {
+  for (const { route, status, error } of summary.failed) {
+    console.warn(` ⚠ Prewarm ${route}: ${error || `status ${status}`}`);
+  }
+}
+
+function runNext(args) {
+  const require = createRequire(import.meta.url);
+  const nextBin = require.resolve('next/dist/bin/next');
+  const child = spawn(process.execPath, [nextBin, args.spawn, '-p', args.port], {
+    cwd: ROOT,
+    stdio: ['inherit', 'pipe', 'inherit'],
+  });
+  for (const signal of ['SIGINT', 'SIGTERM']) {
+    process.on(signal, () => child.kill(signal));
+  }
+  child.on('exit', (code, signal) => process.exit(code ?? (signal ? 1 : 0)));
+
+  let warming = false;
+  createInterface({ input: child.stdout }).on('line', line => {
+    if (warming || !READY_LINE.test(line)) {
+      console.log(line);
+      return;
+    }
+    // Hold Next's ready line back until the routes are warm (the server already takes requests)
+    warming = true;
+    console.log(' ○ Server listening, prewarming API routes...');
+    prewarm(args.url, args)
+      .then(summary => {
+        reportFailures(summary);
+        console.log(`${line} (prewarmed ${describe(summary)})`);
+      })
+      .catch(error => {
+        console.warn(` ⚠ Prewarm failed: ${error.message}`);
+        console.log(line);
+      });
+  });
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+  if (args.spawn) {
+    runNext(args);
+    return;
+  }
+  await waitForServer(args.url, args.timeoutMs);
+  const summary = await prewarm(args.url, args);
+  reportFailures(summary);
+  console.log(` ✓ Prewarmed ${describe(summary)}`);
+  process.exitCode = summary.failed.length ? 1 : 0;
+}
+
+if (process.argv[1] && path.resolve(process.argv[1]) === fileURLToPath(import.meta.url)) {
+  main().catch(error => {
+    console.error(error.message);
+    process.exit(1);
+  });
+}
@@ -1,8 +1,8 @@
 import requests
 
-BASE_URL = "http://localhost:4000"
+from harness import BASE_URL, TIMEOUT, get_session
+
 LOGIN_ENDPOINT = "/api/auth/login"
-TIMEOUT = 30
 
 def test_user_login_with_valid_credentials():
     url = BASE_URL + LOGIN_ENDPOINT
@@ -16,7 +16,7 @@ def test_user_login_with_valid_credentials():
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=TIMEOUT)
+        response = get_session().post(url, json=payload, headers=headers, timeout=TIMEOUT)
     except requests.RequestException as e:
         assert False, f"Request to {url} failed with exception: {e}"
 
@@ -44,4 +44,5 @@ def test_user_login_with_valid_credentials():
     assert "HttpOnly" in set_cookie, "Set-Cookie header missing HttpOnly flag"
     assert "jwt" in set_cookie.lower() or "token" in set_cookie.lower(), "Set-Cookie header does not appear to include JWT token"
 
-test_user_login_with_valid_credentials()
\ No newline at end of file
+if __name__ == "__main__":
+    test_user_login_with_valid_credentials()
@@ -1,8 +1,8 @@
 import requests
 
-BASE_URL = "http://localhost:4000"
+from harness import BASE_URL, TIMEOUT, get_session
+
 LOGIN_ENDPOINT = f"{BASE_URL}/api/auth/login"
-TIMEOUT = 30
 HEADERS = {"Content-Type": "application/json"}
 
 
@@ -20,7 +20,7 @@ def test_user_login_with_missing_credentials():
 
     for payload in test_payloads:
         try:
-            response = requests.post(LOGIN_ENDPOINT, json=payload, headers=HEADERS, timeout=TIMEOUT)
+            response = get_session().post(LOGIN_ENDPOINT, json=payload, headers=HEADERS, timeout=TIMEOUT)
         except requests.RequestException as e:
             assert False, f"Request failed: {e}"
 
@@ -28,4 +28,5 @@ def test_user_login_with_missing_credentials():
         assert response.status_code == 400, f"Expected 400 status for payload {payload}, got {response.status_code}"
 
 
-test_user_login_with_missing_credentials()
\ No newline at end of file
+if __name__ == "__main__":
+    test_user_login_with_missing_credentials()
@@ -1,8 +1,8 @@
 import requests
 
-BASE_URL = "http://localhost:4000"
+from harness import BASE_URL, TIMEOUT, get_session
+
 LOGIN_ENDPOINT = "/api/auth/login"
-TIMEOUT = 30
 
 def test_user_login_with_invalid_credentials():
     url = BASE_URL + LOGIN_ENDPOINT
@@ -12,7 +12,7 @@ def test_user_login_with_invalid_credentials():
         "password": "wrong_password"
     }
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=TIMEOUT)
+        response = get_session().post(url, json=payload, headers=headers, timeout=TIMEOUT)
     except requests.RequestException as e:
         assert False, f"Request failed: {e}"
     assert response.status_code == 401, f"Expected status code 401, got {response.status_code}"
@@ -23,4 +23,5 @@ def test_user_login_with_invalid_credentials():
         data = None
     # The API spec doesn't provide exact error JSON, so no further checks here
 
-test_user_login_with_invalid_credentials()
\ No newline at end of file
+if __name__ == "__main__":
+    test_user_login_with_invalid_credentials()
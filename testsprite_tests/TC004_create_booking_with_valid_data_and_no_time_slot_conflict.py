@@ -1,45 +1,12 @@
-import requests
 from datetime import datetime, timedelta
-import random
-import string
 
-BASE_URL = "http://localhost:4000"
-TIMEOUT = 30
-
-def random_string(length=8):
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+from harness import BASE_URL, TIMEOUT, field_fixture, get_session
 
 def test_create_booking_with_valid_data_no_conflict():
-    headers = {
-        "Content-Type": "application/json"
-    }
-
-    # Step 1: Create a new sport (required to create a field)
-    sport_payload = {
-        "sport_name": f"Sport_{random_string()}",
-        "sport_type": "Outdoor"
-    }
-    sport_resp = requests.post(f"{BASE_URL}/api/sports", json=sport_payload, headers=headers, timeout=TIMEOUT)
-    assert sport_resp.status_code == 201, f"Failed to create sport: {sport_resp.text}"
+    session = get_session()
 
-    sport_data = sport_resp.json()
-    sport_id = sport_data.get("id")
-    assert sport_id is not None, "Sport ID not returned on sport creation"
-
-    # Step 2: Create a new field under this sport
-    field_payload = {
-        "field_name": f"Field_{random_string()}",
-        "field_code": f"FC_{random_string(5)}",
-        "sport_id": sport_id,
-        "price_per_hour": 100.0,
-        "description": "Test field for booking",
-        "url_image": "http://example.com/image.jpg",
-        "is_available": True
-    }
-    field_resp = requests.post(f"{BASE_URL}/api/fields", json=field_payload, headers=headers, timeout=TIMEOUT)
-    assert field_resp.status_code == 201, f"Failed to create field: {field_resp.text}"
-
-    field_data = field_resp.json()
+    # Shared field fixture (created once per run together with its sport)
+    field_data = field_fixture()
     field_id = field_data.get("id")
     field_name = field_data.get("field_name")
     assert field_id is not None and field_name is not None, "Field ID or name not returned on field creation"
@@ -62,7 +29,7 @@ def test_create_booking_with_valid_data_no_conflict():
 
     booking_id = None
     try:
-        booking_resp = requests.post(f"{BASE_URL}/api/booking", json=booking_payload, headers=headers, timeout=TIMEOUT)
+        booking_resp = session.post(f"{BASE_URL}/api/booking", json=booking_payload, timeout=TIMEOUT)
         assert booking_resp.status_code == 201, f"Expected 201, got {booking_resp.status_code}, Response: {booking_resp.text}"
         booking_resp_json = booking_resp.json()
         booking_id = booking_resp_json.get("id")
@@ -74,22 +41,9 @@ def test_create_booking_with_valid_data_no_conflict():
         # Clean up: delete booking if created
         if booking_id is not None:
             try:
-                requests.delete(f"{BASE_URL}/api/booking/{booking_id}", timeout=TIMEOUT)
-            except Exception:
-                pass
-
-        # Clean up: delete the field created
-        if field_id is not None:
-            try:
-                requests.delete(f"{BASE_URL}/api/fields/{field_id}", timeout=TIMEOUT)
-            except Exception:
-                pass
-
-        # Clean up: delete the sport created
-        if sport_id is not None:
-            try:
-                requests.delete(f"{BASE_URL}/api/sports/{sport_id}", timeout=TIMEOUT)
+                session.delete(f"{BASE_URL}/api/booking/{booking_id}", timeout=TIMEOUT)
             except Exception:
                 pass
 
-test_create_booking_with_valid_data_no_conflict()
\ No newline at end of file
+if __name__ == "__main__":
+    test_create_booking_with_valid_data_no_conflict()
@@ -1,7 +1,7 @@
 import requests
 
-BASE_URL = "http://localhost:4000"
-TIMEOUT = 30
+from harness import BASE_URL, TIMEOUT, get_session
+
 
 def test_create_booking_with_missing_required_fields():
     url = f"{BASE_URL}/api/booking"
@@ -18,7 +18,7 @@ def test_create_booking_with_missing_required_fields():
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=TIMEOUT)
+        response = get_session().post(url, json=payload, headers=headers, timeout=TIMEOUT)
     except requests.RequestException as e:
         assert False, f"Request failed: {e}"
 
@@ -33,4 +33,5 @@ def test_create_booking_with_missing_required_fields():
         # Response is not valid JSON, that's acceptable as long as status code is 400
         pass
 
-test_create_booking_with_missing_required_fields()
\ No newline at end of file
+if __name__ == "__main__":
+    test_create_booking_with_missing_required_fields()
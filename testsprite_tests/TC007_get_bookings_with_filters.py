@@ -1,7 +1,7 @@
 import requests
 
-BASE_URL = "http://localhost:4000"
-TIMEOUT = 30
+from harness import BASE_URL, TIMEOUT, get_session
+
 
 def test_get_bookings_with_filters():
     # Define filter parameters for the GET request
@@ -11,7 +11,7 @@ def test_get_bookings_with_filters():
         "status": "confirmed"
     }
     try:
-        response = requests.get(
+        response = get_session().get(
             f"{BASE_URL}/api/booking",
             params=params,
             timeout=TIMEOUT
@@ -38,4 +38,5 @@ def test_get_bookings_with_filters():
         if "status" in booking:
             assert booking["status"] == params["status"], f"Booking status {booking['status']} does not match filter {params['status']}"
 
-test_get_bookings_with_filters()
\ No newline at end of file
+if __name__ == "__main__":
+    test_get_bookings_with_filters()
@@ -1,14 +1,12 @@
-import requests
+from harness import BASE_URL, TIMEOUT, get_session, namespaced
 
-BASE_URL = "http://localhost:4000"
 FIELDS_ENDPOINT = f"{BASE_URL}/api/fields"
-TIMEOUT = 30
 
 def test_create_new_field_with_valid_data():
     # Sample valid field data
     field_data = {
-        "field_name": "Test Field Alpha",
-        "field_code": "TFALPHA001",
+        "field_name": namespaced("Test Field Alpha"),
+        "field_code": namespaced("TFALPHA001"),
         "sport_id": 1,
         "price_per_hour": 150000,
         "description": "A test field created for automated testing.",
@@ -19,7 +17,7 @@ def test_create_new_field_with_valid_data():
 
     try:
         # POST request to create a new field
-        response = requests.post(
+        response = get_session().post(
             FIELDS_ENDPOINT,
             json=field_data,
             timeout=TIMEOUT
@@ -41,7 +39,7 @@ def test_create_new_field_with_valid_data():
         # Cleanup: delete the created field if creation was successful
         if field_id is not None:
             try:
-                del_response = requests.delete(
+                del_response = get_session().delete(
                     f"{FIELDS_ENDPOINT}/{field_id}",
                     timeout=TIMEOUT
                 )
@@ -49,4 +47,5 @@ def test_create_new_field_with_valid_data():
             except Exception:
                 pass
 
-test_create_new_field_with_valid_data()
\ No newline at end of file
+if __name__ == "__main__":
+    test_create_new_field_with_valid_data()
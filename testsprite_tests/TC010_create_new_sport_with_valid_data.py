@@ -1,12 +1,10 @@
-import requests
+from harness import BASE_URL, TIMEOUT, get_session, namespaced
 
-BASE_URL = "http://localhost:4000"
 SPORTS_ENDPOINT = f"{BASE_URL}/api/sports"
-TIMEOUT = 30
 
 def test_create_new_sport_with_valid_data():
     sport_data = {
-        "sport_name": "Test Sport Name",
+        "sport_name": namespaced("Test Sport Name"),
         "sport_type": "Indoor",
         "description": "Automated test sport creation",
         "is_available": True
@@ -18,7 +16,7 @@ def test_create_new_sport_with_valid_data():
     created_sport_id = None
     try:
         # Create new sport
-        response = requests.post(SPORTS_ENDPOINT, json=sport_data, headers=headers, timeout=TIMEOUT)
+        response = get_session().post(SPORTS_ENDPOINT, json=sport_data, headers=headers, timeout=TIMEOUT)
         assert response.status_code == 201, f"Expected 201 Created, got {response.status_code}"
         resp_json = response.json()
         # Expect response to contain at least the created resource identifier or the sent data echo
@@ -31,10 +29,11 @@ def test_create_new_sport_with_valid_data():
         if created_sport_id is not None:
             delete_url = f"{SPORTS_ENDPOINT}/{created_sport_id}"
             try:
-                del_resp = requests.delete(delete_url, timeout=TIMEOUT)
+                del_resp = get_session().delete(delete_url, timeout=TIMEOUT)
                 # Accept 200 or 204 for successful deletion
                 assert del_resp.status_code in (200, 204), f"Failed to delete sport in cleanup, status: {del_resp.status_code}"
             except Exception:
                 pass
 
-test_create_new_sport_with_valid_data()
\ No newline at end of file
+if __name__ == "__main__":
+    test_create_new_sport_with_valid_data()
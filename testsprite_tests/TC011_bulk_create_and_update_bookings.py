@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from harness import BASE_URL, TIMEOUT, field_fixture, get_session
+
+# Each assertion rests on a single request: in demo mode the bookings live in
+# the browser's localStorage, so the server keeps nothing between requests.
+
+def test_bulk_create_and_update_bookings():
+    session = get_session()
+
+    field_data = field_fixture()
+    field_id = field_data.get("id")
+    field_name = field_data.get("field_name")
+    assert field_id is not None and field_name is not None, "Field ID or name not returned on field creation"
+
+    # A weekly league slot: same court and hour for eight weeks
+    first_week = datetime.now() + timedelta(days=30)
+    time_slots = ["19:00-20:00"]
+    weekly = [
+        {
+            "field_id": field_id,
+            "field_name": field_name,
+            "booking_date": (first_week + timedelta(weeks=i)).strftime("%Y-%m-%d"),
+            "time_slots": time_slots,
+            "total_price": 100.0,
+            "customer_name": "League Organizer",
+            "customer_phone": "081234567890",
+        }
+        for i in range(8)
+    ]
+    bulk_url = f"{BASE_URL}/api/booking/bulk"
+
+    booking_ids = []
+    try:
+        # A batch that double-books one of its own weeks is rejected as a whole
+        conflict_resp = session.post(bulk_url, json={"bookings": weekly + [weekly[3]]}, timeout=TIMEOUT)
+        assert conflict_resp.status_code == 409, f"Expected 409, got {conflict_resp.status_code}, Response: {conflict_resp.text}"
+        conflicts = conflict_resp.json().get("conflicts")
+        assert conflicts and conflicts[0].get("index") == len(weekly) and conflicts[0].get("conflicts_with") == 3, \
+            f"Unexpected conflicts: {conflicts}"
+
+        # Malformed, out-of-range and repeated slots are reported by booking index
+        bad_slots = [dict(weekly[0], time_slots=slots) for slots in (["19:00"], ["25:00"], ["10:00-09:00"], ["07:00", "07:00"])]
+        invalid_resp = session.post(bulk_url, json={"bookings": bad_slots}, timeout=TIMEOUT)
+        assert invalid_resp.status_code == 400, f"Expected 400, got {invalid_resp.status_code}, Response: {invalid_resp.text}"
+        errors = invalid_resp.json().get("errors", [])
+        assert [e.get("index") for e in errors] == [1, 2, 3], f"Unexpected errors: {errors}"
+        assert "time_slots[1]" in errors[2].get("error", ""), f"Duplicate slot not located: {errors[2]}"
+
+        create_resp = session.post(bulk_url, json={"bookings": weekly}, timeout=TIMEOUT)
+        assert create_resp.status_code == 201, f"Expected 201, got {create_resp.status_code}, Response: {create_resp.text}"
+        created = create_resp.json().get("bookings")
+        assert isinstance(created, list) and len(created) == len(weekly)
+        booking_ids = [b.get("id") for b in created]
+        assert all(booking_id is not None for booking_id in booking_ids), "Booking ID not returned after creation"
+        assert len(set(booking_ids)) == len(booking_ids), f"Booking IDs are not unique: {booking_ids}"
+        assert [b.get("booking_date") for b in created] == [w["booking_date"] for w in weekly]
+        assert all(b.get("booking_status") == "pending" and b.get("payment_status") == "pending" for b in created), \
+            f"New bookings should be pending: {created}"
+
+        action_resp = session.put(bulk_url, json={"ids": booking_ids, "action": "archive"}, timeout=TIMEOUT)
+        assert action_resp.status_code == 400, f"Expected 400, got {action_resp.status_code}, Response: {action_resp.text}"
+
+        empty_resp = session.put(bulk_url, json={"ids": [], "action": "confirm"}, timeout=TIMEOUT)
+        assert empty_resp.status_code == 400, f"Expected 400, got {empty_resp.status_code}, Response: {empty_resp.text}"
+
+        # An id that never existed is named in the 404, and nothing is updated
+        missing_resp = session.put(bulk_url, json={"ids": [999999999], "action": "cancel"}, timeout=TIMEOUT)
+        assert missing_resp.status_code == 404, f"Expected 404, got {missing_resp.status_code}, Response: {missing_resp.text}"
+        assert missing_resp.json().get("missing") == [999999999]
+    finally:
+        # Clean up where bookings do persist: cancel the season so its slots are free again
+        if booking_ids:
+            try:
+                session.put(bulk_url, json={"ids": booking_ids, "action": "cancel"}, timeout=TIMEOUT)
+            except Exception:
+                pass
+
+if __name__ == "__main__":
+    test_bulk_create_and_update_bookings()
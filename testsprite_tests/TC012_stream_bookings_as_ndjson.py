@@ -0,0 +1,29 @@
+from harness import BASE_URL, TIMEOUT, field_fixture, get_session, iter_ndjson
+
+# Compares exports with the JSON reads of the same data; nothing here relies on
+# rows written by an earlier request, which demo mode keeps in the browser only.
+
+def test_stream_bookings_as_ndjson():
+    session = get_session()
+
+    field_data = field_fixture()
+    field_id = field_data.get("id")
+    assert field_id is not None, "Field ID not returned on field creation"
+
+    # The stream carries the same records as the JSON array, one per line
+    for params in ({}, {"fieldId": field_id}, {"status": "pending"}):
+        json_resp = session.get(f"{BASE_URL}/api/booking", params=params, timeout=TIMEOUT)
+        assert json_resp.status_code == 200, f"Expected 200, got {json_resp.status_code}, Response: {json_resp.text}"
+        streamed = list(iter_ndjson("/api/booking", params))
+        assert streamed == json_resp.json(), f"NDJSON export differs from the JSON response for {params}"
+        assert all(isinstance(b, dict) and "id" in b for b in streamed), "Export line is not a booking record"
+
+    # Income history streams too; every line is a complete record
+    for record in iter_ndjson("/api/pemasukan"):
+        assert "nomor_invoice" in record and "pemasukan_detail" in record, f"Unexpected record: {record}"
+
+    bad_resp = session.get(f"{BASE_URL}/api/pemasukan", params={"format": "ndjson", "from": "yesterday"}, timeout=TIMEOUT)
+    assert bad_resp.status_code == 400, f"Expected 400, got {bad_resp.status_code}, Response: {bad_resp.text}"
+
+if __name__ == "__main__":
+    test_stream_bookings_as_ndjson()
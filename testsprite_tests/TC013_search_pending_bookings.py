@@ -0,0 +1,45 @@
+from harness import BASE_URL, TIMEOUT, get_session, random_string
+
+# Demo-mode bookings live in the browser, so the server's list may be empty;
+# every check below holds for whatever bookings the server does return.
+
+def matches(booking, term):
+    term = term.lower()
+    return any(term in (booking.get(key) or "").lower() for key in ("customer_name", "customer_phone", "field_name"))
+
+def test_search_pending_bookings():
+    session = get_session()
+
+    def search(term=None):
+        resp = session.get(f"{BASE_URL}/api/bookings/pending", params={"q": term} if term else None, timeout=TIMEOUT)
+        assert resp.status_code == 200, f"Expected 200, got {resp.status_code}, Response: {resp.text}"
+        data = resp.json().get("data")
+        assert isinstance(data, list), f"Expected a data list, got {resp.json()}"
+        return data
+
+    # Unfiltered: bookings still waiting at the counter (status or payment pending)
+    everything = search()
+    assert all(b.get("booking_status") == "pending" or b.get("payment_status") == "pending" for b in everything), \
+        f"Listed a booking that is neither pending nor unpaid: {everything}"
+    all_ids = [b.get("id") for b in everything]
+
+    # Every result contains the term, in any letter case, and comes from the unfiltered list
+    terms = [random_string(12)]
+    for booking in everything[:3]:
+        name = booking.get("customer_name") or booking.get("field_name") or ""
+        terms += [t for t in (name, name[1:5].upper(), booking.get("customer_phone")) if t]
+    for term in terms:
+        found = search(term)
+        assert all(matches(b, term) for b in found), f"Result does not contain {term!r}: {found}"
+        assert {b.get("id") for b in found} <= set(all_ids), f"Search for {term!r} returned unlisted bookings"
+        # Matches the unfiltered list exactly, in its order
+        assert [b.get("id") for b in found] == [b.get("id") for b in everything if matches(b, term)], \
+            f"Search for {term!r} missed or reordered bookings"
+        # Typing on only narrows the results
+        assert {b.get("id") for b in search(term + "zq")} <= {b.get("id") for b in found}
+
+    # A term nobody has matches nothing
+    assert search(terms[0]) == [], f"Random term {terms[0]!r} matched bookings"
+
+if __name__ == "__main__":
+    test_search_pending_bookings()
@@ -0,0 +1,58 @@
+import re
+from datetime import datetime, timedelta
+
+from harness import BASE_URL, TIMEOUT, field_fixture, get_session
+
+INVOICE_PATTERN = re.compile(r"^INV/(\d{3,})/(\d{6})$")
+
+# Checks only what the checkout response itself shows: the demo-mode server
+# keeps no invoices or booking updates for a later request to read back.
+
+def test_checkout_bookings_into_one_invoice():
+    session = get_session()
+
+    field_data = field_fixture()
+    field_id = field_data.get("id")
+    field_name = field_data.get("field_name")
+    assert field_id is not None and field_name is not None, "Field ID or name not returned on field creation"
+
+    day = (datetime.now() + timedelta(days=150)).strftime("%Y-%m-%d")
+    bookings = [
+        {
+            "field_id": field_id,
+            "field_name": field_name,
+            "booking_date": day,
+            "time_slots": [f"{16 + i}:00-{17 + i}:00"],
+            "total_price": 150.0,
+            "customer_name": "Checkout Test",
+            "customer_phone": "081234567890",
+        }
+        for i in range(2)
+    ]
+
+    create_resp = session.post(f"{BASE_URL}/api/booking/bulk", json={"bookings": bookings}, timeout=TIMEOUT)
+    assert create_resp.status_code == 201, f"Expected 201, got {create_resp.status_code}, Response: {create_resp.text}"
+    booking_ids = [b.get("id") for b in create_resp.json().get("bookings", [])]
+    assert len(booking_ids) == 2 and None not in booking_ids, f"Unexpected bookings: {create_resp.text}"
+
+    # Both bookings are paid with a single invoice; a booking listed twice is still one booking
+    pay_resp = session.post(f"{BASE_URL}/api/pemasukan", json={
+        "amount": 300.0,
+        "user_name": "Kasir",
+        "booking_ids": booking_ids + booking_ids[:1],
+        "items": [],
+    }, timeout=TIMEOUT)
+    assert pay_resp.status_code == 200, f"Expected 200, got {pay_resp.status_code}, Response: {pay_resp.text}"
+    assert pay_resp.json().get("success") is True, f"Unexpected response: {pay_resp.text}"
+    payment = pay_resp.json().get("payment")
+    assert payment and payment.get("id_booking") == booking_ids[0], f"Unexpected payment: {payment}"
+    assert payment.get("amount") == 300.0 and payment.get("created_by") == "Kasir", f"Unexpected payment: {payment}"
+    invoice = INVOICE_PATTERN.match(payment.get("nomor_invoice", ""))
+    assert invoice and invoice.group(2) == datetime.now().strftime("%m%Y"), \
+        f"Unexpected invoice number: {payment.get('nomor_invoice')}"
+
+    missing_resp = session.post(f"{BASE_URL}/api/pemasukan", json={"booking_ids": booking_ids}, timeout=TIMEOUT)
+    assert missing_resp.status_code == 400, f"Expected 400, got {missing_resp.status_code}, Response: {missing_resp.text}"
+
+if __name__ == "__main__":
+    test_checkout_bookings_into_one_invoice()
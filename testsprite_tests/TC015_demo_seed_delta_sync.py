@@ -0,0 +1,52 @@
+from harness import BASE_URL, TIMEOUT, get_session
+
+TABLES = ["sports", "fields", "fieldImages", "bookings", "barang", "pemasukan", "pemasukanDetail", "systemPrompts"]
+BATCH = 25
+
+def unpack(packed):
+    return [dict(zip(packed["columns"], values)) for values in packed["rows"]]
+
+def sync(session, cursor=None):
+    """Follow the delta cursor until the server has nothing more to send."""
+    rows = {table: [] for table in TABLES}
+    batches = 0
+    while True:
+        params = {"limit": BATCH, **({"cursor": cursor} if cursor else {"delta": 1})}
+        resp = session.get(f"{BASE_URL}/api/demo-seed", params=params, timeout=TIMEOUT)
+        assert resp.status_code == 200, f"Expected 200, got {resp.status_code}, Response: {resp.text}"
+        body = resp.json()
+        assert body.get("success") is True and body.get("cursor"), f"Unexpected delta response: {body}"
+        for table in TABLES:
+            batch = unpack(body["data"][table])
+            assert len(batch) <= BATCH, f"{table} sent {len(batch)} rows for limit {BATCH}"
+            rows[table].extend(batch)
+        cursor = body["cursor"]
+        batches += 1
+        if not body.get("hasMore"):
+            return rows, cursor, batches
+
+def test_demo_seed_delta_sync():
+    session = get_session()
+
+    full_resp = session.get(f"{BASE_URL}/api/demo-seed", timeout=TIMEOUT)
+    assert full_resp.status_code == 200, f"Expected 200, got {full_resp.status_code}, Response: {full_resp.text}"
+    full = full_resp.json().get("data")
+
+    # Paging through the deltas from an empty cursor yields the full seed, each row once
+    rows, cursor, batches = sync(session)
+    for table in TABLES:
+        ids = [row["id"] for row in rows[table]]
+        assert len(ids) == len(set(ids)), f"{table} sent a row twice across batches"
+        assert set(ids) == {row["id"] for row in full[table]}, f"{table} delta rows differ from the full seed"
+    largest = max(len(full[table]) for table in TABLES)
+    assert batches >= largest // BATCH, f"Expected batches of {BATCH}, got {batches} for {largest} rows"
+
+    # Nothing changed upstream since, so the final cursor has nothing to send
+    rows, _, batches = sync(session, cursor)
+    assert batches == 1 and not any(rows.values()), f"Expected an empty delta, got {rows}"
+
+    bad_resp = session.get(f"{BASE_URL}/api/demo-seed", params={"cursor": "not-a-cursor"}, timeout=TIMEOUT)
+    assert bad_resp.status_code == 400, f"Expected 400, got {bad_resp.status_code}, Response: {bad_resp.text}"
+
+if __name__ == "__main__":
+    test_demo_seed_delta_sync()
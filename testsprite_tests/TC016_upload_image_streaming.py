@@ -0,0 +1,44 @@
+import base64
+import re
+
+from harness import BASE_URL, TIMEOUT, get_session
+
+# 1x1 transparent PNG; identical bytes on every run, so the upload is deduplicated
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+URL_PATTERN = re.compile(r"^/images/[0-9a-f]{32}\.png$")
+
+def test_upload_image_streaming():
+    session = get_session()
+    upload_url = f"{BASE_URL}/api/upload"
+
+    # Raw body upload is stored under its content hash
+    resp = session.post(upload_url, data=PIXEL_PNG, headers={"Content-Type": "image/png"}, timeout=TIMEOUT)
+    assert resp.status_code == 200, f"Expected 200, got {resp.status_code}, Response: {resp.text}"
+    body = resp.json()
+    url = body.get("url")
+    assert url and URL_PATTERN.match(url), f"Unexpected upload URL: {url}"
+    assert body.get("bytes") == len(PIXEL_PNG)
+    assert body.get("variants") and all(v.get("url", "").startswith("/_next/image?") for v in body["variants"]), \
+        f"Unexpected variants: {body.get('variants')}"
+
+    stored = session.get(f"{BASE_URL}{url}", timeout=TIMEOUT)
+    assert stored.status_code == 200 and stored.content == PIXEL_PNG, "Stored file differs from the upload"
+
+    # The same image through the multipart form maps to the same file
+    multipart = session.post(upload_url, files={"file": ("pixel.png", PIXEL_PNG, "image/png")},
+                             headers={"Content-Type": None}, timeout=TIMEOUT)
+    assert multipart.status_code == 200, f"Expected 200, got {multipart.status_code}, Response: {multipart.text}"
+    assert multipart.json().get("url") == url, "Identical content should reuse the stored file"
+
+    # A body past the limit is cut off while streaming
+    too_large = session.post(upload_url, data=bytes(MAX_UPLOAD_BYTES + 1), headers={"Content-Type": "image/png"}, timeout=TIMEOUT)
+    assert too_large.status_code == 413, f"Expected 413, got {too_large.status_code}, Response: {too_large.text}"
+
+    not_image = session.post(upload_url, data=b"hello", headers={"Content-Type": "text/plain"}, timeout=TIMEOUT)
+    assert not_image.status_code == 415, f"Expected 415, got {not_image.status_code}, Response: {not_image.text}"
+
+if __name__ == "__main__":
+    test_upload_image_streaming()
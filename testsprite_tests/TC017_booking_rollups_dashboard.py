@@ -0,0 +1,48 @@
+import re
+from datetime import datetime
+
+from harness import BASE_URL, TIMEOUT, field_fixture, get_session
+
+# Each filter is checked on the rows of its own response: demo-mode bookings
+# are kept in the browser, so the server may hold no rollups at all.
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+ROLLUP_KEYS = ("day", "play_month", "field_id", "status", "count", "revenue", "slots", "field_name", "sport_id", "sport_name")
+
+def test_booking_rollups_dashboard():
+    session = get_session()
+
+    def rollups(**params):
+        resp = session.get(f"{BASE_URL}/api/bookings/rollups", params=params or None, timeout=TIMEOUT)
+        assert resp.status_code == 200, f"Expected 200, got {resp.status_code}, Response: {resp.text}"
+        data = resp.json().get("data")
+        assert isinstance(data, list), f"Expected a data list, got {resp.json()}"
+        return data
+
+    rows = rollups()
+    for row in rows:
+        assert all(key in row for key in ROLLUP_KEYS), f"Rollup row is missing keys: {row}"
+        assert min(row["count"], row["revenue"], row["slots"]) >= 0, f"Unexpected totals: {row}"
+        assert MONTH_PATTERN.match(row["play_month"]) and DATE_PATTERN.match(row["day"]), f"Unexpected rollup keys: {row}"
+
+    confirmed = rollups(status="confirmed")
+    assert all(r.get("status") == "confirmed" for r in confirmed), f"Status filter let other rows through: {confirmed}"
+
+    field_data = field_fixture()
+    field_id = field_data.get("id")
+    assert field_id is not None, "Field ID not returned on field creation"
+    by_field = rollups(fieldId=field_id)
+    assert all(r.get("field_id") == field_id for r in by_field), f"Field filter let other rows through: {by_field}"
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    recent = rollups(**{"from": today})
+    assert all(r.get("day") >= today for r in recent), f"Rows before {today} returned: {recent}"
+    assert len(recent) <= len(rows)
+
+    for params in ({"from": "yesterday"}, {"to": "2024-1-1"}, {"fieldId": "court"}, {"sportId": "padel"}):
+        bad_resp = session.get(f"{BASE_URL}/api/bookings/rollups", params=params, timeout=TIMEOUT)
+        assert bad_resp.status_code == 400, f"Expected 400 for {params}, got {bad_resp.status_code}, Response: {bad_resp.text}"
+
+if __name__ == "__main__":
+    test_booking_rollups_dashboard()
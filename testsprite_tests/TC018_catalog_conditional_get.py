@@ -0,0 +1,40 @@
+from harness import BASE_URL, TIMEOUT, get_session
+
+CATALOG = [("/api/sports", {}), ("/api/fields", {"isAvailable": "true"}), ("/api/barang", {})]
+
+def fetch(session, path, params, **headers):
+    # stream=True keeps the body as sent, so the wire size can be measured before decoding
+    resp = session.get(f"{BASE_URL}{path}", params=params, headers=headers, timeout=TIMEOUT, stream=True)
+    raw = resp.raw.read(decode_content=False)
+    return resp, len(raw)
+
+def test_catalog_conditional_get():
+    session = get_session()
+
+    for path, params in CATALOG:
+        first, identity_bytes = fetch(session, path, params, **{"Accept-Encoding": "identity"})
+        assert first.status_code == 200, f"{path}: expected 200, got {first.status_code}"
+        etag = first.headers.get("ETag")
+        assert etag, f"{path}: response has no ETag"
+        assert "no-cache" in first.headers.get("Cache-Control", ""), f"{path}: expected Cache-Control no-cache"
+
+        # Revalidating with the ETag returns an empty 304 while nothing changed
+        again, not_modified_bytes = fetch(session, path, params, **{"If-None-Match": etag})
+        assert again.status_code == 304, f"{path}: expected 304, got {again.status_code}"
+        assert not_modified_bytes == 0, f"{path}: 304 carried a {not_modified_bytes} byte body"
+
+        # A compressed representation has its own ETag but validates the same data
+        packed, gzip_bytes = fetch(session, path, params, **{"Accept-Encoding": "gzip"})
+        if packed.headers.get("Content-Encoding") == "gzip":
+            assert packed.headers.get("ETag") != etag, f"{path}: gzip body reused the identity ETag"
+            assert gzip_bytes < identity_bytes, f"{path}: gzip body is not smaller"
+            revalidated, _ = fetch(session, path, params, **{"If-None-Match": packed.headers["ETag"]})
+            assert revalidated.status_code == 304, f"{path}: gzip ETag did not revalidate"
+            # The 304 names the representation this request would have received
+            switched, _ = fetch(session, path, params, **{"If-None-Match": etag, "Accept-Encoding": "gzip"})
+            assert switched.status_code == 304 and switched.headers.get("ETag") == packed.headers["ETag"], \
+                f"{path}: 304 for a gzip request carried ETag {switched.headers.get('ETag')}"
+        print(f"{path}: identity {identity_bytes} B, gzip {gzip_bytes} B, 304 {not_modified_bytes} B")
+
+if __name__ == "__main__":
+    test_catalog_conditional_get()
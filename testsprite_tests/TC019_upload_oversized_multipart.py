@@ -0,0 +1,26 @@
+from urllib3 import encode_multipart_formdata
+
+from harness import BASE_URL, TIMEOUT, get_session
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+CHUNK = 64 * 1024
+
+def chunks(data):
+    for start in range(0, len(data), CHUNK):
+        yield data[start:start + CHUNK]
+
+def test_upload_oversized_multipart():
+    session = get_session()
+    upload_url = f"{BASE_URL}/api/upload"
+    form, content_type = encode_multipart_formdata({"file": ("big.png", bytes(MAX_UPLOAD_BYTES + 1), "image/png")})
+
+    # Content-Length announces the oversized form; refused before it is parsed
+    declared = session.post(upload_url, data=form, headers={"Content-Type": content_type}, timeout=TIMEOUT * 4)
+    assert declared.status_code == 413, f"Expected 413, got {declared.status_code}, Response: {declared.text}"
+
+    # Chunked, so no length up front; cut off while the form arrives
+    chunked = session.post(upload_url, data=chunks(form), headers={"Content-Type": content_type}, timeout=TIMEOUT * 4)
+    assert chunked.status_code == 413, f"Expected 413, got {chunked.status_code}, Response: {chunked.text}"
+
+if __name__ == "__main__":
+    test_upload_oversized_multipart()
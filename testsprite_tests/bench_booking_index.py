@@ -0,0 +1,199 @@
+"""Benchmark: full-scan bookings lookup vs. the (field_id, booking_date) index.
+
+Mirrors the two code paths in ``lib/demoStore.ts`` on the same synthetic
+data so their cost can be compared at 10k, 100k and 1M bookings:
+
+* scan  - the old ``getBookings`` + ``POST /api/booking`` path: parse the
+  whole JSON blob, run the fieldId/date/status filters, sort by created_at
+  parsing both dates on every comparison, then check slot overlap with
+  nested loops.
+* index - the new path: a dict keyed by (field_id, booking_date) holding a
+  slot bitmap per day, rebuilt only when the collection's revision counter
+  (``demo_bookings:rev``, bumped on every append to the bookings log)
+  differs from the one it was built at.
+
+    python testsprite_tests/bench_booking_index.py
+    python testsprite_tests/bench_booking_index.py --sizes 10000 100000 --lookups 500
+"""
+
+import argparse
+import functools
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+TIME_SLOTS = [f"{h:02d}:00-{h + 1:02d}:00" for h in range(6, 23)]
+STATUSES = ["pending", "confirmed", "cancelled"]
+
+
+def generate_bookings(count, fields=50, days=365, seed=42):
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=days // 2)
+    created = datetime(2025, 1, 1)
+    bookings = []
+    for i in range(1, count + 1):
+        slot = rng.randrange(len(TIME_SLOTS) - 1)
+        bookings.append({
+            "id": i,
+            "field_id": rng.randint(1, fields),
+            "field_name": "Field",
+            "booking_date": (start + timedelta(days=rng.randrange(days))).isoformat(),
+            "time_slots": TIME_SLOTS[slot:slot + rng.randint(1, 2)],
+            "total_price": 100000,
+            "booking_status": rng.choice(STATUSES),
+            "payment_status": "pending",
+            "created_at": (created + timedelta(seconds=i)).isoformat(),
+        })
+    return bookings
+
+
+# ---- scan path (old demoStore behaviour) ----
+
+def _by_created_desc(a, b):
+    return datetime.fromisoformat(b["created_at"]).timestamp() - datetime.fromisoformat(a["created_at"]).timestamp()
+
+
+def scan_get_bookings(raw, field_id=None, booking_date=None, status=None):
+    bookings = json.loads(raw)
+    if field_id:
+        bookings = [b for b in bookings if b["field_id"] == field_id]
+    if booking_date:
+        bookings = [b for b in bookings if b["booking_date"] == booking_date]
+    if status:
+        bookings = [b for b in bookings if b["booking_status"] == status]
+    return sorted(bookings, key=functools.cmp_to_key(_by_created_desc))
+
+
+def scan_has_conflict(raw, field_id, booking_date, slots):
+    existing = [b for b in scan_get_bookings(raw, field_id, booking_date) if b["booking_status"] != "cancelled"]
+    for booking in existing:
+        if any(slot in booking["time_slots"] for slot in slots):
+            return True
+    return False
+
+
+# ---- index path (new demoStore behaviour) ----
+
+class BookingIndex:
+    def __init__(self, raw):
+        self.raw = raw
+        self.slot_bits = {}
+        self.by_field_date = {}
+        self.masks = {}
+        bookings = json.loads(raw)
+        bookings.sort(key=lambda b: b["created_at"], reverse=True)
+        for booking in bookings:
+            key = (booking["field_id"], booking["booking_date"])
+            self.by_field_date.setdefault(key, []).append(booking)
+            if booking["booking_status"] != "cancelled":
+                mask = self.masks.get(key, 0)
+                for slot in booking["time_slots"]:
+                    mask |= 1 << self._bit(slot)
+                self.masks[key] = mask
+
+    def _bit(self, slot):
+        return self.slot_bits.setdefault(slot, len(self.slot_bits))
+
+    def get_bookings(self, field_id, booking_date, status=None):
+        bucket = self.by_field_date.get((field_id, booking_date), [])
+        if status:
+            return [b for b in bucket if b["booking_status"] == status]
+        return list(bucket)
+
+    def has_conflict(self, field_id, booking_date, slots):
+        mask = self.masks.get((field_id, booking_date), 0)
+        for slot in slots:
+            bit = self.slot_bits.get(slot)
+            if bit is not None and mask >> bit & 1:
+                return True
+        return False
+
+
+_index = None
+
+
+def reset_index():
+    global _index
+    _index = None
+
+
+def index_for(raw):
+    global _index
+    if _index is None or _index.raw is not raw:
+        _index = BookingIndex(raw)
+    return _index
+
+
+def make_queries(bookings, count, seed=7):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        sample = rng.choice(bookings)
+        queries.append((sample["field_id"], sample["booking_date"], [rng.choice(TIME_SLOTS)]))
+    return queries
+
+
+def time_per_call(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def run(sizes, lookups):
+    results = []
+    for size in sizes:
+        raw = json.dumps(generate_bookings(size))
+        bookings = json.loads(raw)
+        # The scan path costs a full parse per call, so sample fewer calls at large sizes.
+        scan_queries = make_queries(bookings, max(3, min(lookups, 2_000_000 // size)))
+        index_queries = make_queries(bookings, lookups)
+
+        for field_id, booking_date, slots in scan_queries[:3]:
+            assert scan_has_conflict(raw, field_id, booking_date, slots) == index_for(raw).has_conflict(field_id, booking_date, slots)
+
+        reset_index()
+        build_start = time.perf_counter()
+        index_for(raw)
+        build = time.perf_counter() - build_start
+
+        scan_conflict = time_per_call(lambda f, d, s: scan_has_conflict(raw, f, d, s), scan_queries)
+        index_conflict = time_per_call(lambda f, d, s: index_for(raw).has_conflict(f, d, s), index_queries)
+        scan_read = time_per_call(lambda f, d, s: scan_get_bookings(raw, f, d), scan_queries)
+        index_read = time_per_call(lambda f, d, s: index_for(raw).get_bookings(f, d), index_queries)
+
+        results.append({
+            "bookings": size,
+            "index_build_ms": build * 1000,
+            "scan_conflict_ms": scan_conflict * 1000,
+            "index_conflict_us": index_conflict * 1e6,
+            "scan_read_ms": scan_read * 1000,
+            "index_read_us": index_read * 1e6,
+            "conflict_speedup": scan_conflict / index_conflict if index_conflict else float("inf"),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare scan vs. indexed booking lookups.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.lookups)
+    print(f"{'bookings':>10}{'build ms':>11}{'scan conflict ms':>18}{'index conflict us':>19}"
+          f"{'scan read ms':>14}{'index read us':>15}{'speedup':>10}")
+    for r in results:
+        print(f"{r['bookings']:>10}{r['index_build_ms']:>11.1f}{r['scan_conflict_ms']:>18.2f}"
+              f"{r['index_conflict_us']:>19.2f}{r['scan_read_ms']:>14.2f}{r['index_read_us']:>15.2f}"
+              f"{r['conflict_speedup']:>9.0f}x")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
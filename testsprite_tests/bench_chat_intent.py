@@ -0,0 +1,539 @@
+"""Benchmark: keyword-loop intent matching vs. the compiled chat matcher.
+
+Mirrors the two ways ``POST /api/ai-chat`` has recognized a message's intent
+and entities, run over a corpus of Indonesian/English customer messages:
+
+* loops - the old route: ``keyword in message`` for every keyword of every
+  intent, every ``a.* b`` pattern as its own regex search, then a chain of
+  day-name / time-of-day checks and the number regexes on every message.
+* compiled - ``lib/chatIntent.ts``: all phrases in one Aho-Corasick DFA, a
+  single scan per message, and the number regexes only when the scan saw
+  their anchor word (``:``, ``jam``, a month, ``court``/``field``/``padel-``).
+
+Both paths read their phrase tables, scores and number regexes out of
+``lib/chatIntent.ts`` itself, and must agree on every message before
+anything is timed. ``--node`` checks the Python side against the real thing:
+it transpiles ``lib/chatIntent.ts`` with the project's ``typescript``
+package, runs the corpus through ``recognizeIntent`` under node and fails
+on any message where intent, confidence or entities differ.
+
+    python testsprite_tests/bench_chat_intent.py
+    python testsprite_tests/bench_chat_intent.py --corpus chats.txt --repeat 20
+    python testsprite_tests/bench_chat_intent.py --node
+
+``--corpus`` reads one message per line (or JSON lines with a "message" key).
+``--live`` instead posts the corpus to ``/api/ai-chat`` on the running server
+and reports end-to-end and server-side latency.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from harness import BASE_URL, TIMEOUT, get_session, percentile
+from server_timing import parse_server_timing
+
+CORPUS = [
+    "Halo kak",
+    "Hi, is anyone there?",
+    "jadwal futsal besok sore masih kosong?",
+    "Kapan bisa main badminton sabtu malam?",
+    "kak lapangan padel hari ini jam 7 malem ada yg kosong ga",
+    "berapa harga lapangan padel per jam",
+    "harga sewa mini soccer weekend berapa ya",
+    "How much is the basketball court per hour?",
+    "I want to book futsal field A for tomorrow evening",
+    "mau booking mini soccer jam 5-6 sore tanggal 29 nov",
+    "bisa pesan lapangan bulu tangkis untuk 12 des?",
+    "slot kosong jam 19:00 malem buat futsal",
+    "minggu tersedia ga buat basket?",
+    "senin pagi bisa main badminton court 2?",
+    "reservasi padel-a rabu siang",
+    "What time is free on Saturday afternoon?",
+    "when can we play padel this week",
+    "is the schedule available for friday night",
+    "tarif per jam lapangan futsal berapa kak",
+    "biaya sewa lapangan basket murah ga?",
+    "ada diskon kalo booking 3 jam?",
+    "cek jadwal kamis sore dong",
+    "butuh lapangan futsal untuk 10 orang jumat malam",
+    "cari lapangan badminton yang masih kosong hari ini",
+    "mau sewa lapangan mini soccer 3 jan jam 8-10 pagi",
+    "book the mini soccer field B at 16:00",
+    "booking now please, padel-b tomorrow",
+    "tolong buat booking atas nama Andi besok jam 9",
+    "saya mau daftar main futsal rutin tiap selasa",
+    "order lapangan basketball court 1 untuk 2 jam",
+    "cek omset hari ini",
+    "laporan keuangan bulan ini dong",
+    "rekap transaksi minggu ini",
+    "bagaimana bisnis kita hari ini?",
+    "How is the business doing today?",
+    "performance report for this month please",
+    "kinerja hari ini gimana? performa penjualan naik?",
+    "total pemasukan dan pengeluaran kemarin berapa",
+    "show me revenue and profit for October",
+    "summary of financial results",
+    "Terima kasih ya kak",
+    "ok siap",
+    "lokasi venue dimana?",
+    "parkir mobil ada?",
+    "bisa bayar pakai QRIS?",
+    "lapangan futsalnya rumput sintetis atau vinyl?",
+    "padle murah ga",
+    "minisoccer 10:30 masih ada?",
+    "jam 7 malem kamis",
+    "hari masih ada slot?",
+    "KAK MAU SEWA LAPANGAN BASKET JUMAT SORE",
+    "ada lapangan futsal kosong tgl 3 jan?",
+    "sabtu\nkosong?",
+    "mau main bola besok pagi jam 6",
+    "lapangan badminton ada berapa court?",
+    "what's the price list for all sports",
+    "cost per session for padel tennis?",
+    "reserve a badminton court for 4 people on sunday",
+    "can I cancel my booking?",
+    "refund kalau hujan gimana?",
+]
+
+
+def load_corpus(path):
+    messages = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if line.lstrip().startswith("{"):
+                line = json.loads(line).get("message", "")
+            messages.append(line)
+    return messages
+
+
+# ---- shared rules (lib/chatIntent.ts) ----
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHAT_INTENT_TS = os.path.join(ROOT, "lib", "chatIntent.ts")
+
+
+def ts_constant(source, name):
+    """Source text assigned to the top-level ``const name``, without the closing ``;``."""
+    match = re.search(rf"^const {name}\b[^=]*=\s*", source, re.M)
+    if not match:
+        raise ValueError(f"{name} not found in {CHAT_INTENT_TS}")
+    return source[match.end():source.index(";\n", match.end())]
+
+
+def ts_literal(text):
+    """Evaluate a TS array/object literal of strings and numbers."""
+    text = re.sub(r"//[^\n]*", "", text)
+    text = re.sub(r"^(\s*)(\w+):", r'\1"\2":', text, flags=re.M)
+    text = re.sub(r"([{,]\s*)(\w+):", r'\1"\2":', text)
+    return ast.literal_eval(text)
+
+
+def ts_regex(text):
+    match = re.fullmatch(r"\s*/(.+)/(\w*)\s*", text)
+    return match.group(1), re.I if "i" in match.group(2) else 0
+
+
+def read_chat_rules(path=CHAT_INTENT_TS):
+    """Phrase tables, scores, anchors and regexes of lib/chatIntent.ts, as Python values."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    rules = {name: ts_literal(ts_constant(source, name)) for name in (
+        "KEYWORD_SCORE", "PATTERN_SCORE", "INTENT_RULES", "SHARED_BOOSTS", "SPORT_KEYWORDS", "TIME_OF_DAY",
+        "RELATIVE_DAYS", "WEEKDAYS", "MONTHS")}
+    for name in ("TIME_PATTERN", "TIME_RANGE_PATTERN", "DATE_PATTERN"):
+        rules[name] = ts_regex(ts_constant(source, name))
+    rules["FIELD_PATTERNS"] = [ts_regex(line.rstrip(",")) for line in
+                               ts_constant(source, "FIELD_PATTERNS").strip()[1:-1].split("\n") if line.strip()]
+    rules["ANCHORS"] = {
+        anchor: ts_literal(re.search(rf"^const {name} = phraseId(?:sOf)?\((.*)\);$", source, re.M).group(1))
+        for anchor, name in (("time", "timeAnchor"), ("range", "timeRangeAnchor"), ("field", "fieldAnchors"))
+    }
+    return rules
+
+
+RULES = read_chat_rules()
+KEYWORD_SCORE = RULES["KEYWORD_SCORE"]
+PATTERN_SCORE = RULES["PATTERN_SCORE"]
+INTENT_RULES = [(rule["intent"], rule["keywords"], rule["patterns"]) for rule in RULES["INTENT_RULES"]]
+SHARED_BOOSTS = RULES["SHARED_BOOSTS"]
+SPORT_KEYWORDS = RULES["SPORT_KEYWORDS"]
+TIME_OF_DAY = RULES["TIME_OF_DAY"]
+RELATIVE_DAYS = RULES["RELATIVE_DAYS"]
+# (phrase, JS getDay() number, name)
+WEEKDAYS = [tuple(w) for w in RULES["WEEKDAYS"]]
+# JS Date month numbers (0 = January), as the TS table has them
+MONTHS = RULES["MONTHS"]
+ANCHORS = {name: [phrase] if isinstance(phrase, str) else phrase for name, phrase in RULES["ANCHORS"].items()}
+
+TIME_PATTERN = re.compile(*RULES["TIME_PATTERN"])
+TIME_RANGE_PATTERN = re.compile(*RULES["TIME_RANGE_PATTERN"])
+DATE_PATTERN = re.compile(*RULES["DATE_PATTERN"])
+FIELD_PATTERNS = [re.compile(*pattern) for pattern in RULES["FIELD_PATTERNS"]]
+
+
+def number_entities(message, entities, find):
+    """Clock time, time range and field name; ``find(name)`` says whether to try each regex."""
+    if find("time"):
+        match = TIME_PATTERN.search(message)
+        if match:
+            entities["time"] = match.group(0)
+    if find("range"):
+        match = TIME_RANGE_PATTERN.search(message)
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else start + 1
+            suffix = (match.group(3) or "").lower()
+            entities["timeRange"] = {"start": f"{start:02d}:00", "end": f"{end:02d}:00",
+                                     "timePreference": "evening" if suffix == "malem" else (suffix or "afternoon")}
+    if find("field"):
+        for pattern in FIELD_PATTERNS:
+            match = pattern.search(message)
+            if match:
+                entities["fieldName"] = match.group(0)
+                break
+
+
+def utc_day(days):
+    """Local now plus ``days``, as the UTC day ``Date.toISOString()`` gives."""
+    return (datetime.now() + timedelta(days=days)).astimezone(timezone.utc).date().isoformat()
+
+
+def date_entity(entities, relative, weekday, find_date):
+    today = date.today()
+    if relative is not None:
+        entities["date"] = utc_day(relative)
+    elif weekday is not None:
+        _, day, name = weekday
+        js_today = (today.weekday() + 1) % 7
+        entities["date"] = utc_day((day - js_today + 7) % 7 or 7)
+        entities["dayName"] = name
+    elif find_date():
+        match = DATE_PATTERN.search(entities.pop("_message"))
+        if match:
+            # Like JS new Date(y, m, d), out-of-range months and days roll over
+            month = MONTHS[match.group(2).lower()]
+            first = date(today.year + month // 12, month % 12 + 1, 1)
+            entities["date"] = (first + timedelta(days=int(match.group(1)) - 1)).isoformat()
+    entities.pop("_message", None)
+
+
+def best_intent(scores):
+    intent, best = "general", 0
+    for name, score in scores:
+        if score > best:
+            intent, best = name, score
+    return intent, best
+
+
+# ---- loops path (old route) ----
+
+def recognize_loops(message):
+    text = message.lower()
+    scores = []
+    for intent, keywords, patterns in INTENT_RULES:
+        score = 0
+        for keyword in keywords:
+            if keyword in text:
+                score += KEYWORD_SCORE
+        for pattern in patterns:
+            if re.search(pattern, text):
+                score += PATTERN_SCORE
+        for phrases, boost in SHARED_BOOSTS:
+            if any(p in text for p in phrases):
+                score += boost
+        scores.append((intent, score))
+    intent, confidence = best_intent(scores)
+
+    entities = {}
+    for sport, keywords in SPORT_KEYWORDS:
+        if any(k in text for k in keywords):
+            entities["sport"] = sport
+            break
+    for preference, keywords in TIME_OF_DAY:
+        if any(k in text for k in keywords):
+            entities["timePreference"] = preference
+            break
+    number_entities(text, entities, lambda _: True)
+    relative = next((offset for phrase, offset in RELATIVE_DAYS if phrase in text), None)
+    weekday = None if relative is not None else next((w for w in WEEKDAYS if w[0] in text), None)
+    entities["_message"] = text
+    date_entity(entities, relative, weekday, lambda: True)
+    return intent, confidence, entities
+
+
+# ---- compiled path (lib/chatIntent.ts) ----
+
+class PhraseAutomaton:
+    """Aho-Corasick DFA: ``delta[state]`` maps every phrase character to the next state."""
+
+    def __init__(self, phrases):
+        self.phrases = phrases
+        goto = [{}]
+        outputs = [[]]
+        for pid, phrase in enumerate(phrases):
+            state = 0
+            for ch in phrase:
+                if ch not in goto[state]:
+                    goto[state][ch] = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                state = goto[state][ch]
+            outputs[state].append(pid)
+
+        alphabet = {ch for phrase in phrases for ch in phrase}
+        delta = [dict() for _ in goto]
+        fail = [0] * len(goto)
+        queue = []
+        for ch in alphabet:
+            nxt = goto[0].get(ch, 0)
+            delta[0][ch] = nxt
+            if nxt:
+                queue.append(nxt)
+        for state in queue:
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch in alphabet:
+                nxt = goto[state].get(ch)
+                fallback = delta[fail[state]][ch]
+                if nxt:
+                    fail[nxt] = fallback
+                    delta[state][ch] = nxt
+                    queue.append(nxt)
+                else:
+                    delta[state][ch] = fallback
+        self.delta = delta
+        self.outputs = outputs
+
+
+class CompiledMatcher:
+    def __init__(self):
+        self.ids = {}
+
+        def pid(phrase):
+            return self.ids.setdefault(phrase, len(self.ids))
+
+        self.patterns = []
+        self.rules = []
+        for intent, keywords, patterns in INTENT_RULES:
+            indexes = []
+            for pattern in patterns:
+                first, _, then = pattern.partition(".*")
+                self.patterns.append((pid(first), pid(then) if then else -1))
+                indexes.append(len(self.patterns) - 1)
+            self.rules.append((intent, [pid(k) for k in keywords], indexes))
+        self.boosts = [([pid(p) for p in phrases], boost) for phrases, boost in SHARED_BOOSTS]
+        self.sports = [(sport, [pid(k) for k in keywords]) for sport, keywords in SPORT_KEYWORDS]
+        self.times = [(pref, [pid(k) for k in keywords]) for pref, keywords in TIME_OF_DAY]
+        self.relative = [(pid(phrase), offset) for phrase, offset in RELATIVE_DAYS]
+        self.weekdays = [(pid(w[0]), w) for w in WEEKDAYS]
+        self.months = [pid(m) for m in MONTHS]
+        self.anchors = {name: [pid(a) for a in phrases] for name, phrases in ANCHORS.items()}
+
+        self.by_last = {}
+        for index, (_, then) in enumerate(self.patterns):
+            if then != -1:
+                self.by_last.setdefault(then, []).append(index)
+        phrases = sorted(self.ids, key=self.ids.get)
+        self.lengths = [len(p) for p in phrases]
+        self.automaton = PhraseAutomaton(phrases)
+
+    def scan(self, text):
+        delta, outputs = self.automaton.delta, self.automaton.outputs
+        seen = set()
+        hits = set()
+        first_end = {}
+        line = 0
+        state = 0
+        for i, ch in enumerate(text):
+            if ch in "\n\r\u2028\u2029":
+                line += 1
+            state = delta[state].get(ch, 0)
+            for pid in outputs[state]:
+                seen.add(pid)
+                if first_end.get(pid, (-1,))[0] != line:
+                    first_end[pid] = (line, i + 1)
+                for index in self.by_last.get(pid, ()):
+                    first = first_end.get(self.patterns[index][0])
+                    if first and first[0] == line and first[1] <= i + 1 - self.lengths[pid]:
+                        hits.add(index)
+        for index, (first, then) in enumerate(self.patterns):
+            if then == -1 and first in seen:
+                hits.add(index)
+        return seen, hits
+
+    def recognize(self, message):
+        text = message.lower()
+        seen, hits = self.scan(text)
+        scores = []
+        for intent, keywords, patterns in self.rules:
+            score = 0
+            for k in keywords:
+                if k in seen:
+                    score += KEYWORD_SCORE
+            for p in patterns:
+                if p in hits:
+                    score += PATTERN_SCORE
+            for ids, boost in self.boosts:
+                if not seen.isdisjoint(ids):
+                    score += boost
+            scores.append((intent, score))
+        intent, confidence = best_intent(scores)
+
+        entities = {}
+        sport = next((s for s, ids in self.sports if not seen.isdisjoint(ids)), None)
+        if sport:
+            entities["sport"] = sport
+        preference = next((p for p, ids in self.times if not seen.isdisjoint(ids)), None)
+        if preference:
+            entities["timePreference"] = preference
+        number_entities(text, entities, lambda name: not seen.isdisjoint(self.anchors[name]))
+        relative = next((offset for pid, offset in self.relative if pid in seen), None)
+        weekday = None if relative is not None else next((w for pid, w in self.weekdays if pid in seen), None)
+        entities["_message"] = text
+        date_entity(entities, relative, weekday, lambda: not seen.isdisjoint(self.months))
+        return intent, confidence, entities
+
+
+def time_path(fn, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            fn(message)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1e6 / (repeat * len(messages))
+
+
+def run(messages, repeat):
+    matcher = CompiledMatcher()
+    mismatches = [m for m in messages if recognize_loops(m) != matcher.recognize(m)]
+    assert not mismatches, f"Paths disagree on {len(mismatches)} message(s), e.g. {mismatches[0]!r}"
+
+    intents = {}
+    for message in messages:
+        intent = matcher.recognize(message)[0]
+        intents[intent] = intents.get(intent, 0) + 1
+
+    loops_us = time_path(recognize_loops, messages, repeat)
+    compiled_us = time_path(matcher.recognize, messages, repeat)
+    return {
+        "messages": len(messages),
+        "phrases": len(matcher.ids),
+        "states": len(matcher.automaton.delta),
+        "intents": intents,
+        "loops_us_per_message": loops_us,
+        "compiled_us_per_message": compiled_us,
+        "speedup": loops_us / compiled_us if compiled_us else float("inf"),
+    }
+
+
+# Transpiles lib/chatIntent.ts with the project's typescript and prints
+# recognizeIntent() of every message read from stdin as one JSON array
+NODE_RUNNER = """
+const fs = require('fs');
+const path = require('path');
+const Module = require('module');
+const root = process.argv[1];
+const ts = Module.createRequire(path.join(root, 'package.json'))('typescript');
+const source = fs.readFileSync(path.join(root, 'lib', 'chatIntent.ts'), 'utf8');
+const { outputText } = ts.transpileModule(source, {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019 }
+});
+const chatIntent = new Module('chatIntent');
+chatIntent._compile(outputText, 'chatIntent.js');
+const messages = JSON.parse(fs.readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify(messages.map(message => chatIntent.exports.recognizeIntent(message))));
+"""
+
+
+def run_node(messages, node="node"):
+    """Compare the compiled Python matcher with recognizeIntent() from lib/chatIntent.ts under node."""
+    proc = subprocess.run([node, "-e", NODE_RUNNER, ROOT], input=json.dumps(messages),
+                          capture_output=True, text=True, encoding="utf-8")
+    if proc.returncode != 0:
+        raise RuntimeError(f"node could not run lib/chatIntent.ts:\n{proc.stderr.strip()}")
+    matcher = CompiledMatcher()
+    mismatches = []
+    for message, expected in zip(messages, json.loads(proc.stdout)):
+        intent, confidence, entities = matcher.recognize(message)
+        got = {"intent": intent, "entities": entities, "confidence": confidence}
+        if got != expected:
+            mismatches.append({"message": message, "python": got, "node": expected})
+    return {"messages": len(messages), "mismatches": mismatches}
+
+
+def run_live(messages, repeat):
+    """Post every corpus message to /api/ai-chat and time the responses."""
+    session = get_session()
+    samples = []
+    server = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            sent = time.perf_counter()
+            response = session.post(f"{BASE_URL}/api/ai-chat",
+                                    json={"message": message, "conversationHistory": []}, timeout=TIMEOUT)
+            samples.append((time.perf_counter() - sent) * 1000)
+            total = parse_server_timing(response.headers.get("Server-Timing")).get("total")
+            if total is not None:
+                server.append(total)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    server.sort()
+    return {
+        "requests": len(samples),
+        "messages_per_s": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "server_p50_ms": percentile(server, 50),
+        "server_p95_ms": percentile(server, 95),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare keyword-loop intent matching with the compiled matcher.")
+    parser.add_argument("--corpus", help="file with one chat message per line (or JSON lines with 'message')")
+    parser.add_argument("--repeat", type=int, default=50, help="passes over the corpus")
+    parser.add_argument("--live", action="store_true", help="post the corpus to /api/ai-chat on the server instead")
+    parser.add_argument("--node", nargs="?", const="node", metavar="BIN",
+                        help="check the Python matcher against lib/chatIntent.ts run under node")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    messages = load_corpus(args.corpus) if args.corpus else CORPUS
+    if args.node:
+        results = run_node(messages, args.node)
+        for mismatch in results["mismatches"]:
+            print(f"{mismatch['message']!r}\n  python {mismatch['python']}\n  node   {mismatch['node']}")
+        print(f"{results['messages'] - len(results['mismatches'])} of {results['messages']} messages "
+              f"agree with lib/chatIntent.ts")
+    elif args.live:
+        results = run_live(messages, max(1, args.repeat // 10))
+        print(f"POST /api/ai-chat x{results['requests']}: {results['messages_per_s']:.0f} msg/s  "
+              f"p50 {results['p50_ms']:.1f}  p95 {results['p95_ms']:.1f}  p99 {results['p99_ms']:.1f} ms  "
+              f"(server p50 {results['server_p50_ms']:.1f}  p95 {results['server_p95_ms']:.1f} ms)")
+    else:
+        results = run(messages, args.repeat)
+        print(f"{results['messages']} messages, {results['phrases']} phrases, {results['states']} automaton states")
+        print("intents: " + ", ".join(f"{k} {v}" for k, v in sorted(results["intents"].items())))
+        print(f"loops     {results['loops_us_per_message']:8.1f} us/message")
+        print(f"compiled  {results['compiled_us_per_message']:8.1f} us/message  ({results['speedup']:.1f}x)")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.node and results["mismatches"]:
+        sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
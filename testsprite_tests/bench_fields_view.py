@@ -0,0 +1,206 @@
+"""Benchmark: per-request fields join vs. the precomputed fields view.
+
+Mirrors the two ``GET /api/fields`` code paths of ``lib/demoStore.ts`` on
+synthetic catalogs of thousands of fields (three images each):
+
+* join - the old route: parse and locale-sort the fields, parse every image
+  row, then call ``getSportById`` per field, which re-parses the whole
+  sports collection each time.
+* view - the new ``getFieldsWithSport``: the joined, sorted rows are built
+  once per catalog revision and filtered results are memoized, so a request
+  only pays for serialization.
+
+    python testsprite_tests/bench_fields_view.py
+    python testsprite_tests/bench_fields_view.py --sizes 1000 5000 --requests 50
+
+``--live`` instead seeds that many fields through ``POST /api/fields`` on the
+running server, times ``GET /api/fields`` and deletes what it created.
+"""
+
+import argparse
+import functools
+import json
+import locale
+import random
+import string
+import time
+
+from harness import BASE_URL, TIMEOUT, get_session, namespaced, percentile, random_string, sport_fixture
+
+IMAGES_PER_FIELD = 3
+
+
+def generate_catalog(fields, sports=20, seed=42):
+    rng = random.Random(seed)
+
+    def rng_string(length):
+        return "".join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+    sport_rows = [
+        {"id": i, "sport_name": f"Sport {i}", "sport_type": rng.choice(["Indoor", "Outdoor"]), "is_available": 1}
+        for i in range(1, sports + 1)
+    ]
+    field_rows = []
+    image_rows = []
+    for i in range(1, fields + 1):
+        field_rows.append({
+            "id": i,
+            "field_name": f"Lapangan {rng_string(6)}",
+            "field_code": f"F{i:06d}",
+            "sport_id": rng.randint(1, sports),
+            "price_per_hour": 100000,
+            "description": None,
+            "url_image": None,
+            "is_available": rng.choice([0, 1]),
+        })
+        for _ in range(IMAGES_PER_FIELD):
+            image_rows.append({"id": len(image_rows) + 1, "field_id": i, "url_image": f"/uploads/{rng_string(12)}.jpg"})
+    return json.dumps(sport_rows), json.dumps(field_rows), json.dumps(image_rows)
+
+
+def join_row(field, sport, images):
+    return {
+        **field,
+        "sport_name": sport["sport_name"] if sport else None,
+        "sport_type": sport["sport_type"] if sport else None,
+        "url_image": images[0] if images else field["url_image"],
+        "images": images,
+    }
+
+
+# ---- join path (old route) ----
+
+def get_sport_by_id(raw_sports, sport_id):
+    return next((s for s in json.loads(raw_sports) if s["id"] == sport_id), None)
+
+
+def join_request(raw_sports, raw_fields, raw_images, is_available=None):
+    fields = json.loads(raw_fields)
+    if is_available is not None:
+        fields = [f for f in fields if f["is_available"] == is_available]
+    fields.sort(key=functools.cmp_to_key(lambda a, b: locale.strcoll(a["field_name"], b["field_name"])))
+    images = {}
+    for img in json.loads(raw_images):
+        images.setdefault(img["field_id"], []).append(img["url_image"])
+    rows = [join_row(f, get_sport_by_id(raw_sports, f["sport_id"]), images.get(f["id"], [])) for f in fields]
+    return json.dumps(rows)
+
+
+# ---- view path (new demoStore) ----
+
+class FieldsView:
+    def __init__(self, raw_sports, raw_fields, raw_images):
+        sports = {s["id"]: s for s in json.loads(raw_sports)}
+        images = {}
+        for img in json.loads(raw_images):
+            images.setdefault(img["field_id"], []).append(img["url_image"])
+        fields = sorted(json.loads(raw_fields), key=lambda f: locale.strxfrm(f["field_name"]))
+        self.rows = [join_row(f, sports.get(f["sport_id"]), images.get(f["id"], [])) for f in fields]
+        self.queries = {}
+
+    def get(self, is_available=None):
+        rows = self.queries.get(is_available)
+        if rows is None:
+            rows = self.rows if is_available is None else [r for r in self.rows if r["is_available"] == is_available]
+            self.queries[is_available] = rows
+        return list(rows)
+
+
+def view_request(view, is_available=None):
+    return json.dumps(view.get(is_available))
+
+
+def time_requests(fn, requests):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def run(sizes, requests):
+    results = []
+    for size in sizes:
+        raw_sports, raw_fields, raw_images = generate_catalog(size)
+        view_build_start = time.perf_counter()
+        view = FieldsView(raw_sports, raw_fields, raw_images)
+        view_build = (time.perf_counter() - view_build_start) * 1000
+
+        assert json.loads(join_request(raw_sports, raw_fields, raw_images, 1)) == json.loads(view_request(view, 1))
+
+        # The join path re-parses the sports list per field, so sample fewer requests at large sizes.
+        join = time_requests(lambda: join_request(raw_sports, raw_fields, raw_images, 1), max(3, min(requests, 20_000 // size)))
+        served = time_requests(lambda: view_request(view, 1), requests)
+        results.append({
+            "fields": size,
+            "images": size * IMAGES_PER_FIELD,
+            "view_build_ms": view_build,
+            "join_p50_ms": percentile(join, 50),
+            "view_p50_ms": percentile(served, 50),
+            "view_p95_ms": percentile(served, 95),
+            "speedup": percentile(join, 50) / percentile(served, 50) if percentile(served, 50) else float("inf"),
+        })
+    return results
+
+
+def run_live(count, requests):
+    """Seed ``count`` fields through the API, time GET /api/fields, then clean up."""
+    session = get_session()
+    sport = sport_fixture()
+    created = []
+    try:
+        for i in range(count):
+            response = session.post(f"{BASE_URL}/api/fields", json={
+                "field_name": namespaced(f"Bench Field {i:05d}"),
+                "field_code": namespaced(f"BFV_{i:05d}_{random_string(4)}"),
+                "sport_id": sport["id"],
+                "price_per_hour": 100.0,
+                "images": [f"http://example.com/{random_string()}.jpg" for _ in range(IMAGES_PER_FIELD)],
+                "is_available": True,
+            }, timeout=TIMEOUT)
+            if response.status_code == 201:
+                created.append(response.json().get("id"))
+        samples = time_requests(
+            lambda: session.get(f"{BASE_URL}/api/fields", params={"isAvailable": "true"}, timeout=TIMEOUT), requests)
+        return {
+            "fields": len(created),
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+        }
+    finally:
+        for field_id in created:
+            try:
+                session.delete(f"{BASE_URL}/api/fields/{field_id}", timeout=TIMEOUT)
+            except Exception:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the per-request fields join with the precomputed view.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--live", type=int, metavar="FIELDS", help="seed this many fields on the server and time GET /api/fields")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    locale.setlocale(locale.LC_COLLATE, "")
+    if args.live:
+        results = run_live(args.live, args.requests)
+        print(f"GET /api/fields with {results['fields']} seeded fields: "
+              f"p50 {results['p50_ms']:.1f}  p95 {results['p95_ms']:.1f}  p99 {results['p99_ms']:.1f} ms")
+    else:
+        results = run(args.sizes, args.requests)
+        print(f"{'fields':>8}{'images':>9}{'build ms':>11}{'join p50 ms':>14}{'view p50 ms':>14}{'view p95 ms':>14}{'speedup':>10}")
+        for r in results:
+            print(f"{r['fields']:>8}{r['images']:>9}{r['view_build_ms']:>11.1f}{r['join_p50_ms']:>14.2f}"
+                  f"{r['view_p50_ms']:>14.2f}{r['view_p95_ms']:>14.2f}{r['speedup']:>9.0f}x")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
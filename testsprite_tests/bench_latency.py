@@ -0,0 +1,268 @@
+"""Latency regression benchmark for the API routes.
+
+Hits each route with payloads modelled on the TC scripts, records the
+latency distribution per route and compares it with a stored baseline.
+
+    python testsprite_tests/bench_latency.py --record          # write a new baseline
+    python testsprite_tests/bench_latency.py                   # compare, exit 1 on regression
+    python testsprite_tests/bench_latency.py --threshold 0.5 --route "POST /api/ai-chat=1.0"
+
+A route regresses when its p50 or p95 exceeds the baseline by more than the
+threshold (a fraction, default 0.25) plus ``--slack-ms`` of absolute noise
+allowance. Latency is only comparable over the same outcomes, so a route
+whose share of any response status moved by more than ``--status-tolerance``
+(default 0.05) from the baseline fails the run on that instead, and a run
+with 5xx responses cannot be recorded as a baseline. Every run is also
+appended to ``tmp/latency_history.jsonl`` so trends stay visible between
+baseline updates.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from harness import (
+    BASE_URL, TIMEOUT, field_fixture, get_session, namespaced, percentile, random_string, sport_fixture,
+)
+from server_timing import ServerTimingCollector
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "baselines", "latency_baseline.json")
+HISTORY_PATH = os.path.join(HERE, "tmp", "latency_history.jsonl")
+STATUS_TOLERANCE = 0.05
+
+CHAT_MESSAGES = [
+    "Ada jadwal futsal kosong besok sore?",
+    "Berapa harga sewa lapangan badminton per jam?",
+    "Mau booking padel hari sabtu jam 7-8 malam",
+    "What time is the basketball court free tomorrow?",
+    "Halo, bisa bantu saya?",
+]
+
+
+def build_routes(created):
+    """Return [(route name, callable returning a response)] for every benchmarked route.
+
+    IDs of sports and fields created while benchmarking are appended to
+    ``created`` so ``cleanup`` can remove them afterwards.
+    """
+    session = get_session()
+    sport = sport_fixture()
+    field = field_fixture()
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    counter = {"booking": 0, "chat": 0}
+
+    def remember(kind, response):
+        if response.status_code == 201:
+            created.append((kind, response.json().get("id")))
+        return response
+
+    def create_booking():
+        # Walk across days and slots so every request is conflict-free
+        counter["booking"] += 1
+        n = counter["booking"]
+        booking_date = (date.today() + timedelta(days=2 + n // 17)).isoformat()
+        hour = 6 + n % 17
+        return session.post(f"{BASE_URL}/api/booking", json={
+            "field_id": field["id"],
+            "field_name": field["field_name"],
+            "booking_date": booking_date,
+            "time_slots": [f"{hour:02d}:00-{hour + 1:02d}:00"],
+            "total_price": 100.0,
+            "customer_name": "Bench Customer",
+            "customer_phone": "081234567890",
+            "customer_email": "bench.customer@example.com",
+        }, timeout=TIMEOUT)
+
+    def chat():
+        counter["chat"] += 1
+        message = CHAT_MESSAGES[counter["chat"] % len(CHAT_MESSAGES)]
+        return session.post(f"{BASE_URL}/api/ai-chat", json={
+            "message": message,
+            "conversationHistory": [],
+        }, timeout=TIMEOUT)
+
+    return [
+        ("POST /api/auth/login", lambda: session.post(f"{BASE_URL}/api/auth/login", json={
+            "username": "invalid_user", "password": "wrong_password"}, timeout=TIMEOUT)),
+        ("GET /api/sports", lambda: session.get(f"{BASE_URL}/api/sports", timeout=TIMEOUT)),
+        ("POST /api/sports", lambda: remember("sports", session.post(f"{BASE_URL}/api/sports", json={
+            "sport_name": namespaced(f"Bench Sport {random_string()}"), "sport_type": "Indoor",
+            "is_available": True}, timeout=TIMEOUT))),
+        ("GET /api/fields", lambda: session.get(f"{BASE_URL}/api/fields", params={
+            "isAvailable": "true", "sportId": sport["id"]}, timeout=TIMEOUT)),
+        ("POST /api/fields", lambda: remember("fields", session.post(f"{BASE_URL}/api/fields", json={
+            "field_name": namespaced(f"Bench Field {random_string()}"),
+            "field_code": namespaced(f"BF_{random_string(5)}"), "sport_id": sport["id"],
+            "price_per_hour": 100.0, "is_available": True}, timeout=TIMEOUT))),
+        ("GET /api/booking", lambda: session.get(f"{BASE_URL}/api/booking", params={
+            "fieldId": field["id"], "date": tomorrow}, timeout=TIMEOUT)),
+        ("POST /api/booking", create_booking),
+        ("GET /api/booking/check-availability", lambda: session.get(
+            f"{BASE_URL}/api/booking/check-availability", params={
+                "fieldId": field["id"], "date": tomorrow}, timeout=TIMEOUT)),
+        ("GET /api/bookings/pending", lambda: session.get(f"{BASE_URL}/api/bookings/pending", params={
+            "q": "bench"}, timeout=TIMEOUT)),
+        ("GET /api/barang", lambda: session.get(f"{BASE_URL}/api/barang", timeout=TIMEOUT)),
+        ("GET /api/pemasukan", lambda: session.get(f"{BASE_URL}/api/pemasukan", timeout=TIMEOUT)),
+        ("GET /api/pemasukan?limit", lambda: session.get(f"{BASE_URL}/api/pemasukan", params={
+            "limit": 50}, timeout=TIMEOUT)),
+        ("POST /api/ai-chat", chat),
+    ]
+
+
+def cleanup(created):
+    session = get_session()
+    # Fields first so their parent sports can be deleted
+    for kind, resource_id in sorted(created, key=lambda item: item[0] != "fields"):
+        if resource_id is not None:
+            try:
+                session.delete(f"{BASE_URL}/api/{kind}/{resource_id}", timeout=TIMEOUT)
+            except Exception:
+                pass
+
+
+def measure(fn, iterations, warmup):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    statuses = {}
+    server_timing = ServerTimingCollector()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        server_timing.record("route", response.headers.get("Server-Timing"))
+    ordered = sorted(samples)
+    phases = server_timing.summary().get("route", {})
+    return {
+        "samples": len(ordered),
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "mean_ms": sum(ordered) / len(ordered),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        # Server-side p50 per Server-Timing phase (parse, store, serialize, total)
+        "server_timing_p50_ms": {phase: stats["p50_ms"] for phase, stats in phases.items()},
+    }
+
+
+def status_shares(stats):
+    total = sum(stats["statuses"].values())
+    return {code: count / total for code, count in stats["statuses"].items()} if total else {}
+
+
+def server_errors(results):
+    """Return {route: 5xx response count} for routes that answered with server errors."""
+    errors = {}
+    for route, stats in results.items():
+        count = sum(n for code, n in stats["statuses"].items() if code.startswith("5"))
+        if count:
+            errors[route] = count
+    return errors
+
+
+def compare(current, baseline, threshold, slack_ms, overrides, status_tolerance=STATUS_TOLERANCE):
+    """Return a list of human-readable regression messages."""
+    regressions = []
+    for route, stats in current.items():
+        base = baseline.get(route)
+        if not base:
+            continue
+        # Timings of different outcomes (a 401 instead of a 200) say nothing about speed
+        shares, base_shares = status_shares(stats), status_shares(base)
+        moved = {code for code in set(shares) | set(base_shares)
+                 if abs(shares.get(code, 0) - base_shares.get(code, 0)) > status_tolerance}
+        if moved:
+            regressions.append(
+                f"{route} statuses: {stats['statuses']} (baseline {base['statuses']}); latency not compared"
+            )
+            continue
+        limit = overrides.get(route, threshold)
+        for metric in ("p50_ms", "p95_ms"):
+            allowed = base[metric] * (1 + limit) + slack_ms
+            if stats[metric] > allowed:
+                regressions.append(
+                    f"{route} {metric}: {stats[metric]:.1f}ms > {allowed:.1f}ms "
+                    f"(baseline {base[metric]:.1f}ms, +{limit:.0%})"
+                )
+    return regressions
+
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values or []:
+        route, _, limit = value.rpartition("=")
+        overrides[route] = float(limit)
+    return overrides
+
+
+def append_history(routes):
+    os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+    with open(HISTORY_PATH, "a") as f:
+        f.write(json.dumps({"timestamp": datetime.now().isoformat(), "base_url": BASE_URL, "routes": routes}) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark API route latency against a stored baseline.")
+    parser.add_argument("--record", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional slowdown")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="absolute noise allowance per metric")
+    parser.add_argument("--status-tolerance", type=float, default=STATUS_TOLERANCE,
+                        help="allowed change in the share of any response status")
+    parser.add_argument("--route", action="append", metavar="ROUTE=THRESHOLD", help="per-route threshold override")
+    parser.add_argument("--only", action="append", help="benchmark only these routes")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    results = {}
+    created = []
+    try:
+        for route, fn in build_routes(created):
+            if args.only and route not in args.only:
+                continue
+            results[route] = measure(fn, args.iterations, args.warmup)
+            stats = results[route]
+            print(f"{route:<40}p50 {stats['p50_ms']:>8.1f}  p95 {stats['p95_ms']:>8.1f}  p99 {stats['p99_ms']:>8.1f} ms")
+    finally:
+        cleanup(created)
+    append_history(results)
+
+    if args.record:
+        errors = server_errors(results)
+        if errors:
+            print("\nNot recording a baseline with server errors:")
+            for route, count in errors.items():
+                print(f"  {route}: {count} of {results[route]['samples']} responses were 5xx")
+            return 1
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"recorded_at": datetime.now().isoformat(), "routes": results}, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --record first.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["routes"]
+    regressions = compare(results, baseline, args.threshold, args.slack_ms, parse_overrides(args.route),
+                          args.status_tolerance)
+    if regressions:
+        print("\nLatency regressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo latency regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Scaling benchmark: read-endpoint latency as the venue grows.
+
+Loads synthetic venue data (``datagen.py``) into the Supabase seed tables in
+steps up to each requested scale - 1x, 10x and 100x by default - and after
+every step times the read endpoints that serve those tables, so each route
+gets a latency curve over data size:
+
+    python testsprite_tests/bench_scaling.py
+    python testsprite_tests/bench_scaling.py --scales 1 5 25 --json scaling.json
+    python testsprite_tests/bench_scaling.py --only "GET /api/demo-seed" --days-back 7
+
+Loading needs NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY of a
+scratch project (see ``datagen.load_via_seed``). Only /api/demo-seed and
+/api/booking/check-availability read those tables. The other demo-mode
+routes read the browser's localStorage store, which is empty on the server
+whatever is loaded, so they have no curve to measure here; the store's own
+costs are covered by ``bench_booking_index.py`` and ``bench_fields_view.py``.
+
+Data is added incrementally (10x loads nine more 1x-sized slices on top of
+1x), so nothing is loaded twice. Before a route is timed at a step, one
+response is checked for the loaded rows (at least as many bookings as were
+loaded, or booked slots on a day known to have bookings). A route that does
+not return them is dropped with a message instead of recording a curve over
+data it never read. For each pair of neighbouring scales the report shows
+the growth exponent of p50 latency, log(p50 ratio) / log(scale ratio):
+about 0 is flat, about 1 grows linearly with the data. A route "bends" at
+the first step whose exponent exceeds ``--bend`` (0.5 by default).
+
+Loaded data is removed at the end unless ``--keep`` is given.
+"""
+
+import argparse
+import json
+import math
+import sys
+from datetime import date, timedelta
+
+from bench_latency import measure
+from datagen import BASE_VOLUMES, cleanup, generate_venue, load_via_seed, summarize
+from harness import BASE_URL, TIMEOUT, get_session
+
+BEND_EXPONENT = 0.5
+DELTA_LIMIT = 500
+RANGE_FIELDS = 10
+RANGE_DAYS = 7
+
+
+def booked_slot_count(response):
+    booked = response.json().get("bookedSlots") or {}
+    if isinstance(booked, list):
+        return len(booked)
+    return sum(len(slots) for by_date in booked.values() for slots in by_date.values())
+
+
+def build_read_routes(venue):
+    """Return [(route name, callable returning a response, rows(response), minimum rows)].
+
+    ``venue`` holds the loaded volume and ids of loaded rows, so every route
+    hits real data and its response can be checked for it.
+    """
+    session = get_session()
+    field_ids = ",".join(str(i) for i in venue["field_ids"][:RANGE_FIELDS])
+    end_date = (date.fromisoformat(venue["date"]) + timedelta(days=RANGE_DAYS - 1)).isoformat()
+
+    def get(path, **params):
+        return lambda: session.get(f"{BASE_URL}{path}", params=params or None, timeout=TIMEOUT * 4)
+
+    return [
+        ("GET /api/demo-seed", get("/api/demo-seed"),
+         lambda r: len(r.json()["data"]["bookings"]), venue["bookings"]),
+        ("GET /api/demo-seed?delta", get("/api/demo-seed", delta=1, limit=DELTA_LIMIT),
+         lambda r: len(r.json()["data"]["bookings"]["rows"]), min(DELTA_LIMIT, venue["bookings"])),
+        ("GET /api/booking/check-availability", get("/api/booking/check-availability",
+                                                    fieldId=venue["field_id"], date=venue["date"]),
+         booked_slot_count, 1),
+        ("GET /api/booking/check-availability?range", get("/api/booking/check-availability",
+                                                          fieldIds=field_ids, startDate=venue["date"],
+                                                          endDate=end_date),
+         booked_slot_count, 1),
+    ]
+
+
+def returned_rows(fn, rows):
+    """Rows of loaded data in one response, or None when the request failed."""
+    response = fn()
+    if response.status_code != 200:
+        return None
+    try:
+        return rows(response)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def remember_venue(venue, data, created):
+    """Record ids of the first slice: a field with a booked day, and the fields for range queries."""
+    venue["field_ids"].extend(created.get("fields", []))
+    if "field_id" in venue:
+        return
+    field_ids = dict(zip((f["id"] for f in data["fields"]), created.get("fields", [])))
+    booking = next((b for b in data["bookings"] if b["booking_status"] != "cancelled"), None)
+    if booking is None or booking["field_id"] not in field_ids:
+        sys.exit("The first venue slice has no loaded booking to query; raise --days-back/--days-ahead.")
+    venue["field_id"] = field_ids[booking["field_id"]]
+    venue["date"] = booking["booking_date"]
+
+
+def growth_exponents(scales, p50s):
+    """Exponent of p50 growth between neighbouring scales (None when a sample is missing)."""
+    exponents = []
+    for (a, b), (ta, tb) in zip(zip(scales, scales[1:]), zip(p50s, p50s[1:])):
+        if not ta or not tb:
+            exponents.append(None)
+        else:
+            exponents.append(math.log(tb / ta) / math.log(b / a))
+    return exponents
+
+
+def run(scales, iterations, warmup, only=None, keep=False, bend=BEND_EXPONENT, **volumes):
+    loaded = []
+    venue = {"field_ids": [], "bookings": 0}
+    results = {"scales": scales, "volumes": [], "routes": {}, "dropped": {}}
+    done = 0
+    try:
+        for scale in scales:
+            # Top up with 1x-sized slices, each with its own seed and names so rows differ
+            counts = {}
+            while done < scale:
+                step = min(1, scale - done)
+                data = generate_venue(step, seed=1000 + len(loaded), tag=f"S{len(loaded) + 1}", **volumes)
+                created = load_via_seed(data)
+                loaded.append(created)
+                remember_venue(venue, data, created)
+                venue["bookings"] += len(created.get("bookings", []))
+                for key, count in summarize(data).items():
+                    counts[key] = counts.get(key, 0) + count
+                done += step
+            total = dict(results["volumes"][-1]["rows"]) if results["volumes"] else {}
+            for key, count in counts.items():
+                total[key] = total.get(key, 0) + count
+            results["volumes"].append({"scale": scale, "rows": total})
+            print(f"{scale:g}x venue: " + ", ".join(f"{k} {v}" for k, v in total.items()), flush=True)
+
+            for name, fn, rows, minimum in build_read_routes(venue):
+                if (only and name not in only) or name in results["dropped"]:
+                    continue
+                got = returned_rows(fn, rows)
+                if got is None or got < minimum:
+                    reason = (f"returned {'no readable body' if got is None else f'{got} rows'} at {scale:g}x, "
+                              f"expected at least {minimum}")
+                    print(f"dropping {name}: {reason}", flush=True)
+                    results["dropped"][name] = reason
+                    results["routes"].pop(name, None)
+                    continue
+                stats = measure(fn, iterations, warmup)
+                stats["rows"] = got
+                results["routes"].setdefault(name, []).append(stats)
+    finally:
+        if not keep:
+            for created in loaded:
+                cleanup(created)
+
+    for name, series in results["routes"].items():
+        exponents = growth_exponents(scales, [s["p50_ms"] for s in series])
+        bends_at = next((scales[i + 1] for i, e in enumerate(exponents) if e is not None and e > bend), None)
+        results["routes"][name] = {"series": series, "exponents": exponents, "bends_at": bends_at}
+    return results
+
+
+def print_report(results):
+    scales = results["scales"]
+    header = f"{'route':<44}" + "".join(f"{f'{s:g}x p50/p95 ms':>20}" for s in scales) + f"{'exponents':>18}{'bends':>8}"
+    print(header)
+    for name, route in results["routes"].items():
+        cells = "".join(f"{s['p50_ms']:>11.1f}/{s['p95_ms']:<8.1f}" for s in route["series"])
+        exponents = " ".join("-" if e is None else f"{e:.2f}" for e in route["exponents"])
+        bend = f"{route['bends_at']:g}x" if route["bends_at"] else "-"
+        print(f"{name:<44}{cells}{exponents:>18}{bend:>8}")
+    for name, reason in results["dropped"].items():
+        print(f"{name:<44}dropped: {reason}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the seed-table read endpoints at growing data sizes.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--days-back", type=int, default=BASE_VOLUMES["days_back"])
+    parser.add_argument("--days-ahead", type=int, default=BASE_VOLUMES["days_ahead"])
+    parser.add_argument("--only", action="append", help="benchmark only these routes")
+    parser.add_argument("--bend", type=float, default=BEND_EXPONENT, help="growth exponent that counts as a bend")
+    parser.add_argument("--keep", action="store_true", help="leave the loaded data in the seed tables")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(sorted(args.scales), args.iterations, args.warmup, only=args.only, keep=args.keep,
+                  bend=args.bend, days_back=args.days_back, days_ahead=args.days_ahead)
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
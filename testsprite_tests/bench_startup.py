@@ -0,0 +1,212 @@
+"""Startup benchmark: time-to-ready and first-request latency per route.
+
+Starts the server, waits for its "Ready" line and then hits every route
+under ``app/api`` twice: the first request pays for compiling (next dev)
+or loading (next start) the route, the second shows the warm latency.
+By default this runs the plain server and the prewarmed one
+(``scripts/prewarm.mjs``) for comparison:
+
+    python testsprite_tests/bench_startup.py
+    python testsprite_tests/bench_startup.py --modes warm --runs 3 --json startup.json
+    python testsprite_tests/bench_startup.py --prod          # next start (run next build first)
+
+Routes that export GET are requested with GET, the others with OPTIONS,
+which loads the module without running a handler, so nothing is written.
+In dev mode the first route also compiles the modules shared by all
+routes, so first-request times depend on the order (alphabetical here).
+``--clean`` removes ``.next/cache`` before every start to measure a
+restart without the webpack disk cache.
+
+Nothing may already listen on the benchmark port.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import threading
+import time
+from urllib.parse import urlparse
+
+from harness import BASE_URL, TIMEOUT, get_session
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+API_DIR = os.path.join(REPO, "app", "api")
+
+READY_LINE = re.compile(r"Ready in|ready started server", re.IGNORECASE)
+EXPORTED_GET = re.compile(r"export\s+(?:const|async\s+function)\s+GET\b")
+
+COMMANDS = {
+    ("cold", False): ["npm", "run", "dev"],
+    ("warm", False): ["npm", "run", "dev:warm"],
+    ("cold", True): ["npm", "run", "start", "--", "-p", "4000"],
+    ("warm", True): ["npm", "run", "start:warm", "--", "--port", "4000"],
+}
+
+
+def discover_routes():
+    """[(url path, method)] for every route.ts under app/api; dynamic segments become 1."""
+    routes = []
+    for directory, subdirs, files in os.walk(API_DIR):
+        subdirs[:] = sorted(d for d in subdirs if not d.startswith("_"))
+        for name in ("route.ts", "route.js"):
+            if name not in files:
+                continue
+            segments = os.path.relpath(directory, os.path.dirname(API_DIR)).split(os.sep)
+            path = "/" + "/".join("1" if s.startswith("[") else s for s in segments
+                                  if not (s.startswith("(") and s.endswith(")")))
+            with open(os.path.join(directory, name)) as f:
+                method = "GET" if EXPORTED_GET.search(f.read()) else "OPTIONS"
+            routes.append((path, method))
+    return sorted(routes)
+
+
+def port_in_use(url):
+    parsed = urlparse(url)
+    with socket.socket() as sock:
+        sock.settimeout(0.5)
+        return sock.connect_ex((parsed.hostname, parsed.port or 80)) == 0
+
+
+class ServerProcess:
+    """The server under test; records when its ready line appears."""
+
+    def __init__(self, command):
+        self.command = command
+        self.lines = []
+        self.ready = threading.Event()
+        self.ready_after = None
+        self.process = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(self.command, cwd=REPO, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        text=True, start_new_session=True)
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.lines.append(line.rstrip())
+            if not self.ready.is_set() and READY_LINE.search(line):
+                self.ready_after = time.perf_counter() - self.started
+                self.ready.set()
+
+    def wait_ready(self, timeout):
+        if not self.ready.wait(timeout):
+            tail = "\n".join(self.lines[-20:])
+            raise RuntimeError(f"{' '.join(self.command)} was not ready within {timeout}s:\n{tail}")
+        return self.ready_after
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        # npm and next run as children; signal the whole group
+        os.killpg(self.process.pid, signal.SIGINT)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+
+def timed_request(session, method, path):
+    start = time.perf_counter()
+    try:
+        status = session.request(method, f"{BASE_URL}{path}", timeout=TIMEOUT * 4).status_code
+    except Exception:
+        status = 0
+    return (time.perf_counter() - start) * 1000, status
+
+
+def run_once(command, routes, ready_timeout, clean):
+    if clean:
+        shutil.rmtree(os.path.join(REPO, ".next", "cache"), ignore_errors=True)
+    server = ServerProcess(command)
+    server.start()
+    try:
+        ready_s = server.wait_ready(ready_timeout)
+        session = get_session()
+        results = {}
+        for path, method in routes:
+            first_ms, status = timed_request(session, method, path)
+            second_ms, _ = timed_request(session, method, path)
+            results[f"{method} {path}"] = {"first_ms": first_ms, "second_ms": second_ms, "status": status}
+        return {"ready_s": ready_s, "routes": results}
+    finally:
+        server.stop()
+
+
+def median_routes(samples):
+    routes = {}
+    for route, last in samples[-1]["routes"].items():
+        routes[route] = {
+            "first_ms": statistics.median(s["routes"][route]["first_ms"] for s in samples),
+            "second_ms": statistics.median(s["routes"][route]["second_ms"] for s in samples),
+            "status": last["status"],
+        }
+    return routes
+
+
+def run(modes, prod, runs, ready_timeout, clean=False):
+    routes = discover_routes()
+    results = {}
+    for mode in modes:
+        command = COMMANDS[(mode, prod)]
+        samples = []
+        for i in range(runs):
+            print(f"{mode}: run {i + 1}/{runs} ({' '.join(command)})", flush=True)
+            samples.append(run_once(command, routes, ready_timeout, clean))
+        results[mode] = {
+            "command": command,
+            "ready_s": statistics.median(s["ready_s"] for s in samples),
+            "routes": median_routes(samples),
+        }
+        # Time the first requests spend above warm latency, summed over routes
+        results[mode]["stall_ms"] = sum(max(0.0, r["first_ms"] - r["second_ms"])
+                                        for r in results[mode]["routes"].values())
+    return results
+
+
+def print_report(results):
+    modes = list(results)
+    print()
+    print(f"{'':<44}" + "".join(f"{mode:>22}" for mode in modes))
+    print(f"{'time to ready (s)':<44}" + "".join(f"{results[m]['ready_s']:>22.2f}" for m in modes))
+    print(f"{'first-request stall, all routes (ms)':<44}" + "".join(f"{results[m]['stall_ms']:>22.0f}" for m in modes))
+    print(f"\n{'route (first / second request ms)':<44}" + "".join(f"{mode:>22}" for mode in modes))
+    for route in results[modes[0]]["routes"]:
+        cells = "".join(
+            f"{results[m]['routes'][route]['first_ms']:>13.1f} /{results[m]['routes'][route]['second_ms']:>7.1f}"
+            for m in modes)
+        print(f"{route:<44}{cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure server time-to-ready and first-request latency per route.")
+    parser.add_argument("--modes", nargs="+", choices=["cold", "warm"], default=["cold", "warm"],
+                        help="cold: plain server; warm: prewarmed with scripts/prewarm.mjs")
+    parser.add_argument("--prod", action="store_true", help="benchmark next start instead of next dev")
+    parser.add_argument("--runs", type=int, default=1, help="restarts per mode; medians are reported")
+    parser.add_argument("--ready-timeout", type=float, default=300, help="seconds to wait for the ready line")
+    parser.add_argument("--clean", action="store_true", help="remove .next/cache before every start")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    if port_in_use(BASE_URL):
+        parser.error(f"something already listens on {BASE_URL}; stop it first")
+    results = run(args.modes, args.prod, args.runs, args.ready_timeout, clean=args.clean)
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
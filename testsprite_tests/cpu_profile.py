@@ -0,0 +1,302 @@
+"""CPU profile of the server while the Python suite drives it.
+
+Samples the Next server with the V8 profiler (``/api/cpu-profile``, needs
+``npm run dev:profile``) for the length of a load run. Each sample is then
+attributed to the requests in flight at that moment, so hot frames are
+ranked per route:
+
+    python testsprite_tests/cpu_profile.py                         # each bench_latency route in turn
+    python testsprite_tests/cpu_profile.py --scenario --users 20 --duration 30
+    python testsprite_tests/cpu_profile.py --analyze CPU.20260101.123456.1234.0.001.cpuprofile
+
+The default mode profiles every route of ``bench_latency.py`` separately.
+``--scenario`` profiles one mixed ``load_test.py`` closed-loop run instead;
+a sample taken while several requests overlap counts for each of them in
+equal parts. ``--analyze`` reads a saved capture or any .cpuprofile, e.g.
+one written by ``node --cpu-prof``; without request windows that is a
+single "(all)" ranking.
+
+Results go to ``tmp/profiles/<timestamp>/``: the raw ``.cpuprofile``
+(Chrome DevTools, speedscope), a ``<route>.folded`` file per route in the
+collapsed-stack format that flamegraph.pl and speedscope read (weights in
+microseconds), and ``report.json`` with the top frames.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+from harness import BASE_URL, TIMEOUT, get_session
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROFILES_DIR = os.path.join(HERE, "tmp", "profiles")
+
+OUTSIDE_REQUESTS = "(outside requests)"
+ALL_SAMPLES = "(all)"
+IDLE_FRAME = "(idle)"
+ROOT_FRAME = "(root)"
+
+# Bundler and file prefixes that only add noise to frame labels
+URL_PREFIXES = re.compile(r"^(webpack-internal:///|file://)?(\([a-z-]+\)/)?(\./)?")
+
+
+def start_profile(session, sampling_interval_us):
+    resp = session.post(f"{BASE_URL}/api/cpu-profile", json={
+        "action": "start", "samplingIntervalUs": sampling_interval_us}, timeout=TIMEOUT)
+    if resp.status_code == 404:
+        sys.exit("CPU profiling is off; start the server with `npm run dev:profile` (CPU_PROFILE=1).")
+    if resp.status_code == 409:
+        # Left running by an interrupted run; discard it and start over
+        stop_profile(session)
+        return start_profile(session, sampling_interval_us)
+    assert resp.status_code == 200, f"Could not start the CPU profile: {resp.status_code} {resp.text}"
+
+
+def stop_profile(session):
+    """Return {"profile": .cpuprofile dict, "requests": [{route, start, end}]}."""
+    resp = session.post(f"{BASE_URL}/api/cpu-profile", json={"action": "stop"}, timeout=TIMEOUT * 4)
+    assert resp.status_code == 200, f"Could not stop the CPU profile: {resp.status_code} {resp.text}"
+    return resp.json()
+
+
+def frame_label(call_frame, root=None):
+    name = call_frame.get("functionName") or "(anonymous)"
+    url = call_frame.get("url") or ""
+    if not url:
+        return name
+    if root and root in url:
+        url = url.split(root, 1)[1].lstrip("/")
+    url = URL_PREFIXES.sub("", url)
+    return f"{name} ({url}:{call_frame.get('lineNumber', -1) + 1})"
+
+
+def sample_timeline(profile):
+    """[(node id, µs since profile start, weight µs)] with each sample weighted by the gap to the next."""
+    samples = profile.get("samples") or []
+    deltas = profile.get("timeDeltas") or []
+    times = []
+    elapsed = 0
+    for delta in deltas[:len(samples)]:
+        elapsed += delta
+        times.append(elapsed)
+    if not times:
+        return []
+    mean_gap = times[-1] / len(times) if len(times) > 1 else 0
+    weights = [max(0, b - a) for a, b in zip(times, times[1:])] + [mean_gap]
+    return list(zip(samples, times, weights))
+
+
+def stacks_by_node(profile, root=None):
+    """{node id: [frame labels root to leaf]} without the synthetic (root) frame."""
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    parent = {}
+    for node in nodes.values():
+        for child in node.get("children", []):
+            parent[child] = node["id"]
+    stacks = {}
+
+    def stack_of(node_id):
+        if node_id not in stacks:
+            label = frame_label(nodes[node_id]["callFrame"], root)
+            above = stack_of(parent[node_id]) if node_id in parent else []
+            stacks[node_id] = above + ([] if label == ROOT_FRAME else [label])
+        return stacks[node_id]
+
+    for node_id in nodes:
+        stack_of(node_id)
+    return stacks
+
+
+def attribute(timeline, windows):
+    """Yield (node id, weight, [(route, share)]) with samples split among overlapping requests."""
+    windows = sorted(windows, key=lambda w: w["start"])
+    active = []
+    next_window = 0
+    for node_id, at, weight in timeline:
+        while next_window < len(windows) and windows[next_window]["start"] <= at:
+            active.append(windows[next_window])
+            next_window += 1
+        active = [w for w in active if w["end"] >= at]
+        if active:
+            share = 1 / len(active)
+            yield node_id, weight, [(w["route"], share) for w in active]
+        else:
+            yield node_id, weight, [(OUTSIDE_REQUESTS, 1.0)]
+
+
+def new_route_stats():
+    return {"requests": 0, "cpu": 0.0, "idle": 0.0, "self": Counter(), "total": Counter(), "folded": Counter()}
+
+
+def accumulate(capture, per_route, root=None):
+    """Add the samples of ``capture`` to ``per_route`` ({route: stats}, microseconds).
+
+    ``capture`` is a stop_profile() result or a bare .cpuprofile, which has
+    no request windows and lands in a single "(all)" entry.
+    """
+    profile = capture.get("profile", capture)
+    windows = capture.get("requests")
+    stacks = stacks_by_node(profile, root)
+    timeline = sample_timeline(profile)
+    if windows is None:
+        assigned = ((node_id, weight, [(ALL_SAMPLES, 1.0)]) for node_id, _, weight in timeline)
+    else:
+        assigned = attribute(timeline, windows)
+        for window in windows:
+            per_route.setdefault(window["route"], new_route_stats())["requests"] += 1
+
+    for node_id, weight, routes in assigned:
+        stack = stacks.get(node_id) or [ROOT_FRAME]
+        for route, share in routes:
+            stats = per_route.setdefault(route, new_route_stats())
+            micros = weight * share
+            if stack[-1] == IDLE_FRAME:
+                stats["idle"] += micros
+                continue
+            stats["cpu"] += micros
+            stats["self"][stack[-1]] += micros
+            for label in set(stack):
+                stats["total"][label] += micros
+            stats["folded"][";".join(stack)] += micros
+    return per_route
+
+
+def rank(per_route, top):
+    """{route: {"requests", "cpu_ms", "idle_ms", "self", "total"}}, busiest route first."""
+    report = {}
+    for route, stats in sorted(per_route.items(), key=lambda item: -item[1]["cpu"]):
+        cpu = stats["cpu"] or 1.0
+
+        def ranked(counter):
+            return [{"frame": label, "ms": micros / 1000, "pct": 100 * micros / cpu}
+                    for label, micros in counter.most_common(top)]
+
+        report[route] = {
+            "requests": stats["requests"],
+            "cpu_ms": stats["cpu"] / 1000,
+            "idle_ms": stats["idle"] / 1000,
+            "self": ranked(stats["self"]),
+            "total": ranked(stats["total"]),
+        }
+    return report
+
+
+def route_slug(route):
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "route"
+
+
+def write_outputs(report, per_route, captures, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, capture in captures.items():
+        with open(os.path.join(out_dir, f"{route_slug(name)}.cpuprofile"), "w") as f:
+            json.dump(capture.get("profile", capture), f)
+    for route, stats in per_route.items():
+        with open(os.path.join(out_dir, f"{route_slug(route)}.folded"), "w") as f:
+            for stack, micros in stats["folded"].most_common():
+                if round(micros):
+                    f.write(f"{stack} {round(micros)}\n")
+    with open(os.path.join(out_dir, "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def print_report(report, top):
+    for route, stats in report.items():
+        per_request = f" ({stats['cpu_ms'] / stats['requests']:.2f} ms/req)" if stats["requests"] else ""
+        print(f"\n{route}: {stats['requests']} requests, CPU {stats['cpu_ms']:.1f} ms{per_request}, "
+              f"idle {stats['idle_ms']:.1f} ms")
+        totals = {entry["frame"]: entry["ms"] for entry in stats["total"]}
+        print(f"  {'self ms':>9}{'self %':>8}{'total ms':>10}  frame")
+        for entry in stats["self"][:top]:
+            total = totals.get(entry["frame"])
+            total_cell = f"{total:>10.1f}" if total is not None else f"{'-':>10}"
+            print(f"  {entry['ms']:>9.1f}{entry['pct']:>7.1f}%{total_cell}  {entry['frame']}")
+
+
+def profile_routes(session, only, iterations, warmup, interval):
+    """Profile each bench_latency route on its own; returns {route: capture}."""
+    from bench_latency import build_routes, cleanup
+
+    captures = {}
+    created = []
+    try:
+        for route, fn in build_routes(created):
+            if only and route not in only:
+                continue
+            for _ in range(warmup):
+                fn()
+            start_profile(session, interval)
+            try:
+                for _ in range(iterations):
+                    fn()
+            finally:
+                captures[route] = stop_profile(session)
+            print(f"{route:<40}{len(captures[route]['requests']):>6} requests profiled", flush=True)
+    finally:
+        cleanup(created)
+    return captures
+
+
+def profile_scenario(session, users, duration, interval):
+    """Profile one closed-loop load_test run; returns {"scenario": capture}."""
+    from load_test import LatencyRecorder, print_report as print_load_report, run_closed_loop, setup_context, \
+        teardown_context
+
+    context = setup_context()
+    recorder = LatencyRecorder()
+    start_profile(session, interval)
+    recorder.started = time.perf_counter()
+    try:
+        run_closed_loop(recorder, context, users, duration)
+    finally:
+        recorder.finished = time.perf_counter()
+        capture = stop_profile(session)
+        teardown_context(context)
+    print_load_report(recorder.summary())
+    return {"scenario": capture}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank the server's hot CPU frames per route.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--scenario", action="store_true", help="profile a mixed load_test closed-loop run")
+    mode.add_argument("--analyze", metavar="FILE", help="rank a saved capture or .cpuprofile instead of profiling")
+    parser.add_argument("--only", action="append", help="profile only these routes (per-route mode)")
+    parser.add_argument("--iterations", type=int, default=50, help="requests per route (per-route mode)")
+    parser.add_argument("--warmup", type=int, default=5, help="unprofiled requests per route first")
+    parser.add_argument("--users", type=int, default=10, help="virtual users (--scenario)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run (--scenario)")
+    parser.add_argument("--interval-us", type=int, default=500, help="sampling interval in microseconds")
+    parser.add_argument("--top", type=int, default=15, help="frames to show per route")
+    parser.add_argument("--root", help="path prefix to strip from frame urls (default: up to the repo)")
+    parser.add_argument("--out", help="output directory (default: tmp/profiles/<timestamp>)")
+    args = parser.parse_args(argv)
+
+    root = args.root or os.path.dirname(HERE)
+    if args.analyze:
+        with open(args.analyze) as f:
+            captures = {os.path.splitext(os.path.basename(args.analyze))[0]: json.load(f)}
+    else:
+        session = get_session()
+        if args.scenario:
+            captures = profile_scenario(session, args.users, args.duration, args.interval_us)
+        else:
+            captures = profile_routes(session, args.only, args.iterations, args.warmup, args.interval_us)
+
+    per_route = {}
+    for capture in captures.values():
+        accumulate(capture, per_route, root)
+    report = rank(per_route, args.top)
+    out_dir = args.out or os.path.join(PROFILES_DIR, datetime.now().strftime("%Y%m%d-%H%M%S"))
+    write_outputs(report, per_route, captures, out_dir)
+    print_report(report, args.top)
+    print(f"\nProfiles, folded stacks and report.json written to {out_dir}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
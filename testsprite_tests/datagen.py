@@ -0,0 +1,476 @@
+"""Synthetic large-venue data for scale tests.
+
+``generate_venue(scale)`` builds a whole venue in the shape of
+``/api/demo-seed`` (sports, fields, fieldImages, bookings, barang, pemasukan,
+pemasukanDetail), with volumes proportional to ``scale``:
+
+* every sport has several fields with a few images each;
+* bookings fill hourly slots (06:00-23:00) of every field from
+  ``days_back`` days ago to ``days_ahead`` days ahead; evenings and weekends
+  are busier, most bookings last one hour and none overlap on a field;
+* past bookings are mostly completed and paid, upcoming ones confirmed or
+  still pending, some cancelled;
+* barang (shop items) are drinks, food and equipment, sold alongside paid
+  bookings and in shop-only sales, each sale an invoice (pemasukan) with
+  its pemasukan_detail lines.
+
+The data can be loaded two ways:
+
+* ``load_via_api`` - through the API routes, like the TC scripts. Barang have
+  no create route and are skipped; completed bookings arrive as confirmed.
+  In demo mode the routes write to the browser's localStorage store, so the
+  server itself keeps none of it.
+* ``load_via_seed`` - straight into the Supabase tables that /api/demo-seed
+  serves (NEXT_PUBLIC_SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY). Use a
+  scratch project: invoice numbers follow the app's INV/NNN/MMYYYY format.
+
+    python testsprite_tests/datagen.py --scale 10                 # print volumes
+    python testsprite_tests/datagen.py --scale 10 --out venue.json
+    python testsprite_tests/datagen.py --scale 1 --load api --keep
+"""
+
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as dtime, timedelta
+
+import requests
+
+from harness import BASE_URL, TIMEOUT, create_session, namespaced
+
+# Volumes at scale 1; sports, barang and shop sales grow with the scale
+BASE_VOLUMES = {
+    "sports": 5,
+    "fields_per_sport": 4,
+    "images_per_field": 3,
+    "days_back": 30,
+    "days_ahead": 14,
+    "barang": 30,
+    "shop_sales_per_day": 12,
+}
+
+SPORT_CATALOG = [
+    ("Futsal", "Indoor", 150000),
+    ("Badminton", "Indoor", 60000),
+    ("Basketball", "Indoor", 120000),
+    ("Padel", "Outdoor", 200000),
+    ("Mini Soccer", "Outdoor", 350000),
+    ("Tennis", "Outdoor", 100000),
+    ("Volleyball", "Indoor", 90000),
+]
+
+BARANG_CATALOG = [
+    ("Air Mineral 600ml", "minuman", 5000),
+    ("Isotonic Drink", "minuman", 8000),
+    ("Teh Botol", "minuman", 7000),
+    ("Kopi Hitam", "minuman", 10000),
+    ("Jus Jeruk", "minuman", 15000),
+    ("Roti Bakar", "makanan", 18000),
+    ("Pisang Goreng", "makanan", 12000),
+    ("Nasi Goreng", "makanan", 25000),
+    ("Mie Instan", "makanan", 10000),
+    ("Shuttlecock (3 pcs)", "perlengkapan", 30000),
+    ("Grip Raket", "perlengkapan", 20000),
+    ("Sewa Rompi", "perlengkapan", 15000),
+]
+
+FIRST_NAMES = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fajar", "Gita", "Hendra", "Indah", "Joko",
+               "Kevin", "Lina", "Maya", "Nanda", "Oki", "Putri", "Rizky", "Sari", "Tono", "Wulan"]
+LAST_NAMES = ["Saputra", "Wijaya", "Pratama", "Lestari", "Hidayat", "Kusuma", "Santoso", "Nugroho",
+              "Siregar", "Halim"]
+
+OPEN_HOUR, CLOSE_HOUR = 6, 23
+PEAK_HOURS = range(17, 22)
+DURATION_WEIGHTS = [(1, 0.6), (2, 0.3), (3, 0.1)]
+
+MAX_BULK_BOOKINGS = 1000
+SEED_BATCH = 1000
+
+
+def slot_label(hour):
+    return f"{hour:02d}:00-{hour + 1:02d}:00"
+
+
+def start_probability(day, hour):
+    """Chance that a free hour starts a booking: evenings and weekends are busiest."""
+    weekend = day.weekday() >= 5
+    if hour in PEAK_HOURS:
+        return 0.55 if weekend else 0.45
+    if hour < 10:
+        return 0.35 if weekend else 0.1
+    return 0.3 if weekend else 0.08
+
+
+def volumes_for(scale, overrides=None):
+    volumes = dict(BASE_VOLUMES, **(overrides or {}))
+    for key in ("sports", "barang", "shop_sales_per_day"):
+        volumes[key] = max(1, int(round(volumes[key] * scale)))
+    return volumes
+
+
+def iso_at(day, hour, minute, rng):
+    moment = datetime.combine(day, dtime(hour, minute, rng.randint(0, 59)))
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def generate_venue(scale=1, seed=42, today=None, tag="", **overrides):
+    """Return a demo-seed shaped dict of synthetic venue data at ``scale``.
+
+    ``tag`` is appended to sport names and field codes, so several venues
+    can be loaded side by side.
+    """
+    rng = random.Random(seed)
+    volumes = volumes_for(scale, overrides)
+    today = today or date.today()
+    data = {key: [] for key in ("sports", "fields", "fieldImages", "bookings", "barang", "pemasukan", "pemasukanDetail")}
+    data["systemPrompts"] = []
+
+    for i in range(volumes["sports"]):
+        name, sport_type, base_price = SPORT_CATALOG[i % len(SPORT_CATALOG)]
+        branch = i // len(SPORT_CATALOG)
+        sport_id = i + 1
+        data["sports"].append({
+            "id": sport_id,
+            "sport_name": (name if branch == 0 else f"{name} Cabang {branch + 1}") + (f" {tag}" if tag else ""),
+            "sport_type": sport_type,
+            "description": f"Lapangan {name.lower()} untuk latihan dan turnamen",
+            "is_available": 1 if rng.random() < 0.95 else 0,
+        })
+        for n in range(volumes["fields_per_sport"]):
+            field_id = len(data["fields"]) + 1
+            code = f"{name[:3].upper()}{branch + 1}-{n + 1:02d}" + (f"-{tag}" if tag else "")
+            data["fields"].append({
+                "id": field_id,
+                "field_name": f"{data['sports'][-1]['sport_name']} {chr(65 + n % 26)}{n // 26 or ''}",
+                "field_code": code,
+                "sport_id": sport_id,
+                "price_per_hour": int(base_price * rng.choice([0.8, 0.9, 1.0, 1.0, 1.2])),
+                "description": None,
+                "url_image": f"/images/venue/{code.lower()}-1.jpg",
+                "is_available": 1 if rng.random() < 0.9 else 0,
+            })
+            for k in range(volumes["images_per_field"]):
+                data["fieldImages"].append({
+                    "id": len(data["fieldImages"]) + 1,
+                    "field_id": field_id,
+                    "url_image": f"/images/venue/{code.lower()}-{k + 1}.jpg",
+                })
+
+    for i in range(volumes["barang"]):
+        name, category, price = BARANG_CATALOG[i % len(BARANG_CATALOG)]
+        variant = i // len(BARANG_CATALOG)
+        data["barang"].append({
+            "id": i + 1,
+            "nama_barang": name if variant == 0 else f"{name} #{variant + 1}",
+            "category": category,
+            "harga": price,
+            "stok": rng.randint(20, 200),
+            "is_available": 1 if rng.random() < 0.95 else 0,
+        })
+
+    invoices = InvoiceWriter(data, rng)
+    durations, weights = zip(*DURATION_WEIGHTS)
+    for offset in range(-volumes["days_back"], volumes["days_ahead"] + 1):
+        day = today + timedelta(days=offset)
+        for field in data["fields"]:
+            if not field["is_available"]:
+                continue
+            hour = OPEN_HOUR
+            while hour < CLOSE_HOUR:
+                if rng.random() >= start_probability(day, hour):
+                    hour += 1
+                    continue
+                length = min(rng.choices(durations, weights)[0], CLOSE_HOUR - hour)
+                booking = make_booking(data, field, day, hour, length, offset, rng)
+                if booking["payment_status"] == "paid":
+                    invoices.add(booking["created_at"], booking=booking)
+                hour += length
+        if offset <= 0:
+            for _ in range(volumes["shop_sales_per_day"]):
+                invoices.add(iso_at(day, rng.randint(OPEN_HOUR, CLOSE_HOUR - 1), rng.randint(0, 59), rng))
+    return data
+
+
+def make_booking(data, field, day, hour, length, offset, rng):
+    if offset < 0:
+        status = rng.choices(["completed", "cancelled", "confirmed"], [0.85, 0.1, 0.05])[0]
+        payment = "pending" if status == "cancelled" else "paid"
+    else:
+        status = rng.choices(["confirmed", "pending", "cancelled"], [0.5, 0.4, 0.1])[0]
+        payment = "paid" if status == "confirmed" else "pending"
+    created_day = day - timedelta(days=rng.randint(0, 10))
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    booking = {
+        "id": len(data["bookings"]) + 1,
+        "field_id": field["id"],
+        "field_name": field["field_name"],
+        "booking_date": day.isoformat(),
+        "time_slots": [slot_label(h) for h in range(hour, hour + length)],
+        "total_price": field["price_per_hour"] * length,
+        "customer_name": f"{first} {last}",
+        "customer_phone": f"08{rng.randint(10**9, 10**10 - 1)}",
+        "customer_email": f"{first.lower()}.{last.lower()}{rng.randint(1, 99)}@example.com",
+        "booking_status": status,
+        "payment_status": payment,
+        "created_at": iso_at(created_day, rng.randint(7, 22), rng.randint(0, 59), rng),
+    }
+    data["bookings"].append(booking)
+    return booking
+
+
+class InvoiceWriter:
+    """Appends pemasukan rows and their detail lines, numbering invoices per month."""
+
+    def __init__(self, data, rng):
+        self.data = data
+        self.rng = rng
+        self.sequence = {}
+
+    def add(self, created_at, booking=None):
+        period = created_at[5:7] + created_at[:4]
+        self.sequence[period] = self.sequence.get(period, 0) + 1
+        payment_id = len(self.data["pemasukan"]) + 1
+        invoice = f"INV/{self.sequence[period]:03d}/{period}"
+        lines = []
+        if booking:
+            lines.append((None, f"Sewa Lapangan: {booking['field_name']} ({booking['booking_date']})",
+                          booking["total_price"], 1))
+        # Most shop-only sales have something in the basket; some rentals add drinks
+        extra = self.rng.randint(1, 4) if not booking else (self.rng.randint(1, 2) if self.rng.random() < 0.3 else 0)
+        for _ in range(extra):
+            item = self.rng.choice(self.data["barang"])
+            lines.append((item["id"], item["nama_barang"], item["harga"], self.rng.randint(1, 3)))
+
+        for barang_id, name, price, qty in lines:
+            self.data["pemasukanDetail"].append({
+                "id": len(self.data["pemasukanDetail"]) + 1,
+                "pemasukan_id": payment_id,
+                "nomor_invoice": invoice,
+                "barang_id": barang_id,
+                "nama_barang": name,
+                "harga_satuan": price,
+                "qty": qty,
+                "subtotal": price * qty,
+            })
+        self.data["pemasukan"].append({
+            "id": payment_id,
+            "nomor_invoice": invoice,
+            "id_booking": booking["id"] if booking else None,
+            "amount": sum(price * qty for _, _, price, qty in lines),
+            "created_by": "kasir",
+            "updated_by": "kasir",
+            "created_at": created_at,
+        })
+
+
+def summarize(data):
+    return {key: len(rows) for key, rows in data.items() if key != "systemPrompts"}
+
+
+def write_seed_file(data, path):
+    """Write the venue as a demo-seed response body (``{"success": true, "data": ...}``)."""
+    with open(path, "w") as f:
+        json.dump({"success": True, "data": data}, f)
+
+
+# ---- loading through the API ----
+
+def chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def load_via_api(data, workers=8):
+    """Create the venue through the API routes; returns the created ids for ``cleanup``."""
+    session = create_session(pool_size=workers)
+    created = {"via": "api", "sports": [], "fields": [], "bookings": [], "pemasukan": [], "errors": 0}
+    sport_ids, field_ids, booking_ids = {}, {}, {}
+    images = {}
+    for image in data["fieldImages"]:
+        images.setdefault(image["field_id"], []).append(image["url_image"])
+
+    def post(path, payload):
+        try:
+            response = session.post(f"{BASE_URL}{path}", json=payload, timeout=TIMEOUT)
+        except requests.RequestException:
+            created["errors"] += 1
+            return None
+        if response.status_code not in (200, 201):
+            created["errors"] += 1
+            return None
+        return response.json()
+
+    for sport in data["sports"]:
+        row = post("/api/sports", {
+            "sport_name": namespaced(sport["sport_name"]), "sport_type": sport["sport_type"],
+            "description": sport["description"], "is_available": bool(sport["is_available"]),
+        })
+        if row:
+            sport_ids[sport["id"]] = row["id"]
+            created["sports"].append(row["id"])
+
+    for field in data["fields"]:
+        if field["sport_id"] not in sport_ids:
+            continue
+        row = post("/api/fields", {
+            "field_name": namespaced(field["field_name"]), "field_code": namespaced(field["field_code"]),
+            "sport_id": sport_ids[field["sport_id"]], "price_per_hour": field["price_per_hour"],
+            "images": images.get(field["id"], []), "is_available": bool(field["is_available"]),
+        })
+        if row:
+            field_ids[field["id"]] = (row["id"], row.get("field_name", field["field_name"]))
+            created["fields"].append(row["id"])
+
+    bookings = [b for b in data["bookings"] if b["field_id"] in field_ids]
+    for batch in chunks(bookings, MAX_BULK_BOOKINGS):
+        body = post("/api/booking/bulk", {"bookings": [
+            dict({k: v for k, v in b.items() if k not in ("id", "created_at")},
+                 field_id=field_ids[b["field_id"]][0], field_name=field_ids[b["field_id"]][1])
+            for b in batch
+        ]})
+        for source, row in zip(batch, (body or {}).get("bookings", [])):
+            booking_ids[source["id"]] = row["id"]
+            created["bookings"].append(row["id"])
+
+    # Bookings are created pending; move them to their generated status
+    for status, action in (("confirmed", "confirm"), ("completed", "confirm"), ("cancelled", "cancel")):
+        ids = [booking_ids[b["id"]] for b in bookings if b["booking_status"] == status and b["id"] in booking_ids]
+        for batch in chunks(ids, MAX_BULK_BOOKINGS):
+            try:
+                response = session.put(f"{BASE_URL}/api/booking/bulk", json={"ids": batch, "action": action},
+                                       timeout=TIMEOUT)
+            except requests.RequestException:
+                created["errors"] += 1
+                continue
+            if response.status_code != 200:
+                created["errors"] += 1
+
+    # Income goes through checkout, one invoice per sale; shop lines need barang, which the API cannot create
+    def checkout(payment):
+        booking_id = booking_ids.get(payment["id_booking"]) if payment["id_booking"] else None
+        if payment["id_booking"] and booking_id is None:
+            return None
+        row = post("/api/pemasukan", {
+            "amount": payment["amount"], "user_name": payment["created_by"],
+            "booking_ids": [booking_id] if booking_id else [],
+        })
+        return row and row.get("payment", {}).get("id")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        created["pemasukan"] = [pid for pid in pool.map(checkout, data["pemasukan"]) if pid is not None]
+    return created
+
+
+# ---- loading into the seed tables ----
+
+class PostgrestClient:
+    """Minimal PostgREST client for bulk inserts into the Supabase tables."""
+
+    def __init__(self, url=None, key=None):
+        url = url or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+        key = key or os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+        if not url or not key:
+            raise RuntimeError("NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set to load via seed")
+        self.base = url.rstrip("/") + "/rest/v1"
+        self.session = requests.Session()
+        self.session.headers.update({
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+            "Prefer": "return=representation",
+        })
+
+    def insert(self, table, rows):
+        inserted = []
+        for batch in chunks(rows, SEED_BATCH):
+            response = self.session.post(f"{self.base}/{table}", json=batch, timeout=TIMEOUT * 4)
+            response.raise_for_status()
+            inserted.extend(response.json())
+        return inserted
+
+    def delete(self, table, ids):
+        for batch in chunks(ids, 500):
+            self.session.delete(f"{self.base}/{table}", params={"id": f"in.({','.join(map(str, batch))})"},
+                                timeout=TIMEOUT * 4)
+
+
+def load_via_seed(data, client=None):
+    """Insert the venue into the seed tables, remapping ids; returns the inserted ids for ``cleanup``."""
+    client = client or PostgrestClient()
+    created = {"via": "seed", "client": client}
+
+    def insert(table, rows, remap=None):
+        body = [dict({k: v for k, v in row.items() if k != "id"}, **(remap(row) if remap else {})) for row in rows]
+        inserted = client.insert(table, body)
+        created[table] = [row["id"] for row in inserted]
+        return {source["id"]: row["id"] for source, row in zip(rows, inserted)}
+
+    sports = insert("sports", data["sports"])
+    fields = insert("fields", data["fields"], lambda f: {"sport_id": sports[f["sport_id"]]})
+    insert("field_images", data["fieldImages"], lambda i: {"field_id": fields[i["field_id"]]})
+    bookings = insert("bookings", data["bookings"], lambda b: {"field_id": fields[b["field_id"]]})
+    barang = insert("barang", data["barang"])
+    payments = insert("pemasukan", data["pemasukan"],
+                      lambda p: {"id_booking": bookings.get(p["id_booking"])})
+    insert("pemasukan_detail", data["pemasukanDetail"], lambda d: {
+        "pemasukan_id": payments[d["pemasukan_id"]],
+        "barang_id": barang.get(d["barang_id"]),
+    })
+    return created
+
+
+def cleanup(created):
+    """Remove what ``load_via_api`` or ``load_via_seed`` created."""
+    if created.get("via") == "seed":
+        client = created["client"]
+        for table in ("pemasukan_detail", "pemasukan", "barang", "bookings", "field_images", "fields", "sports"):
+            client.delete(table, created.get(table, []))
+        return
+
+    session = create_session()
+    # Income rows cannot be deleted through the API; cancelled bookings free their slots
+    for batch in chunks(created.get("bookings", []), MAX_BULK_BOOKINGS):
+        try:
+            session.put(f"{BASE_URL}/api/booking/bulk", json={"ids": batch, "action": "cancel"}, timeout=TIMEOUT)
+        except requests.RequestException:
+            pass
+    for kind in ("fields", "sports"):
+        for resource_id in created.get(kind, []):
+            try:
+                session.delete(f"{BASE_URL}/api/{kind}/{resource_id}", timeout=TIMEOUT)
+            except requests.RequestException:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate (and optionally load) a synthetic venue.")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days-back", type=int, default=BASE_VOLUMES["days_back"])
+    parser.add_argument("--days-ahead", type=int, default=BASE_VOLUMES["days_ahead"])
+    parser.add_argument("--fields-per-sport", type=int, default=BASE_VOLUMES["fields_per_sport"])
+    parser.add_argument("--out", help="write the venue as a demo-seed JSON body to this file")
+    parser.add_argument("--load", choices=["api", "seed"], help="load the venue into the server or the seed tables")
+    parser.add_argument("--keep", action="store_true", help="do not remove loaded data afterwards")
+    args = parser.parse_args(argv)
+
+    data = generate_venue(args.scale, seed=args.seed, days_back=args.days_back, days_ahead=args.days_ahead,
+                          fields_per_sport=args.fields_per_sport)
+    counts = summarize(data)
+    print(", ".join(f"{key} {count}" for key, count in counts.items()))
+    if args.out:
+        write_seed_file(data, args.out)
+    if args.load:
+        created = load_via_api(data) if args.load == "api" else load_via_seed(data)
+        loaded = {k: len(v) for k, v in created.items() if isinstance(v, list)}
+        print(f"loaded via {args.load}: " + ", ".join(f"{k} {v}" for k, v in loaded.items())
+              + (f" ({created['errors']} failed requests)" if created.get("errors") else ""))
+        if not args.keep:
+            cleanup(created)
+    return counts
+
+
+if __name__ == "__main__":
+    main()
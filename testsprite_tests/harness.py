@@ -0,0 +1,148 @@
+"""Shared HTTP session and fixtures for the testsprite API scripts.
+
+Every TC script talks to the server through one pooled keep-alive
+``requests.Session`` and reuses the same sport/field fixtures, which are
+created on first use and deleted once when the interpreter exits. Run the
+scripts through ``runner.py`` to share them across the whole suite; running
+a single TC file still works and just creates its own fixtures.
+
+Names and codes of everything the tests create carry ``NAMESPACE`` so that
+parallel workers (see ``runner.py --workers``) never touch each other's data.
+"""
+
+import atexit
+import json
+import os
+import random
+import string
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "http://localhost:4000"
+TIMEOUT = 30
+HEADERS = {"Content-Type": "application/json"}
+
+_session = None
+_fixtures = {}
+
+
+def random_string(length=8):
+    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+
+
+NAMESPACE = os.environ.get("TESTSPRITE_NAMESPACE") or f"ts{random_string(4)}"
+
+
+def set_namespace(namespace):
+    """Switch the prefix used by ``namespaced``; called once per runner worker."""
+    global NAMESPACE
+    NAMESPACE = namespace
+    os.environ["TESTSPRITE_NAMESPACE"] = namespace
+
+
+def namespaced(value):
+    """Prefix a name or code with this process's namespace."""
+    return f"{NAMESPACE}_{value}"
+
+
+def create_session(pool_size=16):
+    """Build a keep-alive session with a connection pool of ``pool_size``."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def get_session():
+    """Return the process-wide session shared by all TC scripts."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def url(path):
+    return BASE_URL + path
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def iter_ndjson(path, params=None, session=None):
+    """Yield the records of a ``?format=ndjson`` export one at a time.
+
+    The response is read as it arrives, so a year of bookings or income
+    history never has to fit in memory on either side.
+    """
+    params = {**(params or {}), "format": "ndjson"}
+    with (session or get_session()).get(url(path), params=params, stream=True, timeout=TIMEOUT) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        if "ndjson" not in content_type:
+            raise ValueError(f"Expected an NDJSON response from {path}, got {content_type!r}")
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+
+def sport_fixture():
+    """Sport created once per process for tests that need a parent sport."""
+    if "sport" not in _fixtures:
+        response = get_session().post(url("/api/sports"), json={
+            "sport_name": namespaced(f"Fixture Sport {random_string()}"),
+            "sport_type": "Indoor",
+            "description": "Shared sport fixture for testsprite tests",
+            "is_available": True,
+        }, timeout=TIMEOUT)
+        assert response.status_code == 201, f"Failed to create sport fixture: {response.text}"
+        _fixtures["sport"] = response.json()
+    return _fixtures["sport"]
+
+
+def field_fixture(available=True):
+    """Field under ``sport_fixture()``; one available and one unavailable per process."""
+    key = "field_available" if available else "field_unavailable"
+    if key not in _fixtures:
+        sport = sport_fixture()
+        suffix = "A" if available else "U"
+        response = get_session().post(url("/api/fields"), json={
+            "field_name": namespaced(f"Fixture Field {suffix} {random_string()}"),
+            "field_code": namespaced(f"FX{suffix}_{random_string(5)}"),
+            "sport_id": sport["id"],
+            "price_per_hour": 100.0,
+            "description": "Shared field fixture for testsprite tests",
+            "url_image": "http://example.com/image.jpg",
+            "is_available": available,
+        }, timeout=TIMEOUT)
+        assert response.status_code == 201, f"Failed to create field fixture: {response.text}"
+        _fixtures[key] = response.json()
+    return _fixtures[key]
+
+
+def teardown():
+    """Delete fixtures in reverse dependency order; safe to call twice."""
+    session = get_session()
+    for key in ("field_available", "field_unavailable"):
+        field = _fixtures.pop(key, None)
+        if field and field.get("id") is not None:
+            try:
+                session.delete(url(f"/api/fields/{field['id']}"), timeout=TIMEOUT)
+            except requests.RequestException:
+                pass
+    sport = _fixtures.pop("sport", None)
+    if sport and sport.get("id") is not None:
+        try:
+            session.delete(url(f"/api/sports/{sport['id']}"), timeout=TIMEOUT)
+        except requests.RequestException:
+            pass
+
+
+atexit.register(teardown)
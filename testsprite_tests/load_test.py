@@ -0,0 +1,335 @@
+"""Load mode for the testsprite API scenarios.
+
+Runs the same requests as TC001-TC010 from many virtual users at once and
+reports p50/p95/p99 latency and throughput per endpoint.
+
+    python testsprite_tests/load_test.py --users 20 --duration 30
+    python testsprite_tests/load_test.py --rate 50 --duration 60 --json load.json
+
+``--users`` is a closed loop: every virtual user fires its next scenario as
+soon as the previous one returns. ``--rate`` is an open loop: scenarios are
+started at a fixed rate no matter how slow the server gets, which is what
+shows queueing under load.
+
+A scenario that raises (an unreadable response body, say) counts as an
+error of the endpoint it last called and the virtual user carries on; the
+exception types are listed under the report.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+from harness import BASE_URL, TIMEOUT, create_session, percentile, random_string
+from server_timing import ServerTimingCollector, print_server_timing
+
+TIME_SLOTS = [f"{h:02d}:00-{h + 1:02d}:00" for h in range(6, 23)]
+
+
+class LatencyRecorder:
+    """Thread-safe per-endpoint latency and status collector."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.exceptions = defaultdict(lambda: defaultdict(int))
+        self.server_timing = ServerTimingCollector()
+        self.started = None
+        self.finished = None
+
+    def record(self, endpoint, elapsed, ok):
+        with self._lock:
+            self.samples[endpoint].append(elapsed)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def record_exception(self, endpoint, error):
+        with self._lock:
+            self.errors[endpoint] += 1
+            self.exceptions[endpoint][type(error).__name__] += 1
+
+    def summary(self):
+        wall = (self.finished or time.perf_counter()) - (self.started or 0.0)
+        report = {}
+        for endpoint in sorted(set(self.samples) | set(self.errors)):
+            ordered = sorted(self.samples[endpoint])
+            report[endpoint] = {
+                "requests": len(ordered),
+                "errors": self.errors[endpoint],
+                "throughput_rps": len(ordered) / wall if wall > 0 else 0.0,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+                "exceptions": dict(self.exceptions.get(endpoint, {})),
+            }
+        return {"wall_seconds": wall, "endpoints": report, "server_timing": self.server_timing.summary()}
+
+
+class VirtualUser:
+    """One simulated client with its own keep-alive connection."""
+
+    def __init__(self, recorder, context):
+        self.recorder = recorder
+        self.context = context
+        self.session = create_session(pool_size=1)
+        self.last_endpoint = None
+
+    def call(self, method, path, endpoint=None, expected=(200,), **kwargs):
+        endpoint = f"{method} {endpoint or path}"
+        self.last_endpoint = endpoint
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, BASE_URL + path, timeout=TIMEOUT, **kwargs)
+        except requests.RequestException:
+            self.recorder.record(endpoint, time.perf_counter() - start, False)
+            return None
+        self.recorder.record(endpoint, time.perf_counter() - start, response.status_code in expected)
+        self.recorder.server_timing.record(endpoint, response.headers.get("Server-Timing"))
+        return response
+
+
+# Scenarios mirror the TC scripts; each takes a VirtualUser.
+
+def scenario_login_valid(user):
+    user.call("POST", "/api/auth/login", json={"username": "validUser", "password": "validPassword123"})
+
+
+def scenario_login_missing(user):
+    user.call("POST", "/api/auth/login", json={"username": "someuser"}, expected=(400,))
+
+
+def scenario_login_invalid(user):
+    user.call("POST", "/api/auth/login", json={"username": "invalid_user", "password": "wrong_password"}, expected=(401,))
+
+
+def scenario_create_booking(user):
+    field = user.context["field"]
+    booking_date = (datetime.now() + timedelta(days=random.randint(1, 60))).strftime("%Y-%m-%d")
+    payload = {
+        "field_id": field["id"],
+        "field_name": field["field_name"],
+        "booking_date": booking_date,
+        "time_slots": [random.choice(TIME_SLOTS)],
+        "total_price": field["price_per_hour"],
+        "customer_name": "Load Customer",
+        "customer_phone": "081234567890",
+        "customer_email": "load.customer@example.com",
+    }
+    # A slot that was already taken by another virtual user is a valid outcome.
+    user.call("POST", "/api/booking", json=payload, expected=(201, 409))
+
+
+def scenario_booking_missing_fields(user):
+    user.call("POST", "/api/booking", json={"customer_name": "John Doe"}, expected=(400,))
+
+
+def scenario_get_bookings(user):
+    params = {"fieldId": user.context["field"]["id"], "status": "pending"}
+    user.call("GET", "/api/booking", params=params)
+
+
+def scenario_create_field(user):
+    payload = {
+        "field_name": f"Load Field {random_string()}",
+        "field_code": f"LF_{random_string(6)}",
+        "sport_id": user.context["sport"]["id"],
+        "price_per_hour": 150000,
+        "description": "Field created by load test",
+        "url_image": "http://example.com/image.png",
+        "is_available": True,
+    }
+    response = user.call("POST", "/api/fields", json=payload, expected=(201,))
+    if response is not None and response.status_code == 201:
+        user.context["created_fields"].append(response.json().get("id"))
+
+
+def scenario_get_fields(user):
+    params = {"isAvailable": "true", "sportId": user.context["sport"]["id"]}
+    user.call("GET", "/api/fields", params=params)
+
+
+def scenario_create_sport(user):
+    payload = {
+        "sport_name": f"Load Sport {random_string()}",
+        "sport_type": "Indoor",
+        "description": "Sport created by load test",
+        "is_available": True,
+    }
+    response = user.call("POST", "/api/sports", json=payload, expected=(201,))
+    if response is not None and response.status_code == 201:
+        user.context["created_sports"].append(response.json().get("id"))
+
+
+def scenario_get_sports(user):
+    user.call("GET", "/api/sports")
+
+
+# (scenario, weight) - reads dominate real traffic, so they are weighted up.
+SCENARIOS = [
+    (scenario_login_valid, 2),
+    (scenario_login_missing, 1),
+    (scenario_login_invalid, 1),
+    (scenario_create_booking, 3),
+    (scenario_booking_missing_fields, 1),
+    (scenario_get_bookings, 4),
+    (scenario_create_field, 1),
+    (scenario_get_fields, 6),
+    (scenario_create_sport, 1),
+    (scenario_get_sports, 4),
+]
+
+
+def pick_scenario():
+    functions, weights = zip(*SCENARIOS)
+    return random.choices(functions, weights=weights, k=1)[0]
+
+
+def run_scenario(user):
+    """Run one random scenario; an exception is an error of the endpoint it last called."""
+    scenario = pick_scenario()
+    user.last_endpoint = None
+    try:
+        scenario(user)
+    except Exception as error:
+        user.recorder.record_exception(user.last_endpoint or scenario.__name__, error)
+
+
+def setup_context():
+    """Create the sport and field the booking scenarios book against."""
+    session = create_session()
+    sport_resp = session.post(f"{BASE_URL}/api/sports", json={
+        "sport_name": f"Load Sport {random_string()}",
+        "sport_type": "Indoor",
+        "is_available": True,
+    }, timeout=TIMEOUT)
+    assert sport_resp.status_code == 201, f"Failed to create sport: {sport_resp.text}"
+    sport = sport_resp.json()
+
+    field_resp = session.post(f"{BASE_URL}/api/fields", json={
+        "field_name": f"Load Field {random_string()}",
+        "field_code": f"LF_{random_string(6)}",
+        "sport_id": sport["id"],
+        "price_per_hour": 100000,
+        "is_available": True,
+    }, timeout=TIMEOUT)
+    assert field_resp.status_code == 201, f"Failed to create field: {field_resp.text}"
+    field = field_resp.json()
+
+    return {
+        "sport": sport,
+        "field": field,
+        "created_fields": [field["id"]],
+        "created_sports": [sport["id"]],
+    }
+
+
+def teardown_context(context):
+    session = create_session()
+    for field_id in context["created_fields"]:
+        if field_id is not None:
+            try:
+                session.delete(f"{BASE_URL}/api/fields/{field_id}", timeout=TIMEOUT)
+            except requests.RequestException:
+                pass
+    for sport_id in context["created_sports"]:
+        if sport_id is not None:
+            try:
+                session.delete(f"{BASE_URL}/api/sports/{sport_id}", timeout=TIMEOUT)
+            except requests.RequestException:
+                pass
+
+
+def run_closed_loop(recorder, context, users, duration):
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        user = VirtualUser(recorder, context)
+        while time.perf_counter() < deadline:
+            run_scenario(user)
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        futures = [pool.submit(worker) for _ in range(users)]
+    for future in futures:
+        future.result()
+
+
+def run_open_loop(recorder, context, rate, duration, max_workers):
+    local = threading.local()
+
+    def fire():
+        if not hasattr(local, "user"):
+            local.user = VirtualUser(recorder, context)
+        run_scenario(local.user)
+
+    interval = 1.0 / rate
+    total = int(rate * duration)
+    start = time.perf_counter()
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for i in range(total):
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(fire))
+    for future in futures:
+        future.result()
+
+
+def print_report(summary):
+    print(f"\nWall time: {summary['wall_seconds']:.1f}s")
+    print(f"{'endpoint':<28}{'reqs':>7}{'errs':>6}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for endpoint, stats in summary["endpoints"].items():
+        print(
+            f"{endpoint:<28}{stats['requests']:>7}{stats['errors']:>6}"
+            f"{stats['throughput_rps']:>8.1f}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+            f"{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}"
+        )
+    print("(latencies in ms)")
+    for endpoint, stats in summary["endpoints"].items():
+        if stats["exceptions"]:
+            raised = ", ".join(f"{name} x{count}" for name, count in stats["exceptions"].items())
+            print(f"{endpoint}: scenario raised {raised}")
+    print_server_timing(summary["server_timing"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the testsprite API scenarios under concurrent load.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--users", type=int, default=10, help="concurrent virtual users (closed loop)")
+    mode.add_argument("--rate", type=float, help="target requests per second (open loop)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--max-workers", type=int, default=64, help="thread pool size for --rate")
+    parser.add_argument("--json", dest="json_path", help="write the summary to this file")
+    args = parser.parse_args(argv)
+
+    context = setup_context()
+    recorder = LatencyRecorder()
+    recorder.started = time.perf_counter()
+    try:
+        if args.rate:
+            run_open_loop(recorder, context, args.rate, args.duration, args.max_workers)
+        else:
+            run_closed_loop(recorder, context, args.users, args.duration)
+    finally:
+        recorder.finished = time.perf_counter()
+        teardown_context(context)
+
+    summary = recorder.summary()
+    print_report(summary)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Discover the TC scripts and run them, optionally across a process pool.
+
+    python testsprite_tests/runner.py                 # one worker per core
+    python testsprite_tests/runner.py --workers 1     # serial, in-process
+    python testsprite_tests/runner.py TC004 TC006
+
+Each worker process gets its own harness namespace (``<run>w<n>``), so the
+names and codes it creates, and the field fixture its bookings land on,
+never collide with another worker's. Fixtures are shared by all tests that
+run in the same worker and deleted when the worker exits.
+
+The Server-Timing headers of every response are collected per test and
+summarised per endpoint at the end of the run (``--no-server-timing`` hides
+the table).
+"""
+
+import argparse
+import glob
+import importlib.util
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import util as mp_util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import harness  # noqa: E402
+from server_timing import ServerTimingCollector, print_server_timing  # noqa: E402
+
+server_timing = ServerTimingCollector()
+
+
+def discover(selected=None):
+    paths = sorted(glob.glob(os.path.join(HERE, "TC[0-9][0-9][0-9]_*.py")))
+    if selected:
+        paths = [p for p in paths if test_id_of(p) in selected]
+    return paths
+
+
+def test_id_of(path):
+    return os.path.basename(path).split("_", 1)[0]
+
+
+def load_module(path):
+    spec = importlib.util.spec_from_file_location(f"testsprite_{test_id_of(path)}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_test(path):
+    """Import one TC module and call its test functions.
+
+    Returns (test_id, passed, seconds, error, server timing samples).
+    """
+    test_id = test_id_of(path)
+    start = time.perf_counter()
+    try:
+        module = load_module(path)
+        for name in sorted(dir(module)):
+            if name.startswith("test_") and callable(getattr(module, name)):
+                getattr(module, name)()
+    except Exception:
+        return test_id, False, time.perf_counter() - start, traceback.format_exc(limit=3), server_timing.drain()
+    return test_id, True, time.perf_counter() - start, None, server_timing.drain()
+
+
+def install_server_timing():
+    session = harness.get_session()
+    if not getattr(session, "_server_timing_installed", False):
+        server_timing.install(session)
+        session._server_timing_installed = True
+
+
+def init_worker(run_id, counter):
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    harness.set_namespace(f"{run_id}w{index}")
+    install_server_timing()
+    # Pool workers leave through os._exit, which skips atexit handlers.
+    mp_util.Finalize(None, harness.teardown, exitpriority=10)
+
+
+def report(result):
+    test_id, passed, seconds, error = result[:4]
+    print(f"{test_id}: {'PASS' if passed else 'FAIL'} ({seconds:.2f}s)")
+    if error:
+        print(error)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the testsprite TC scripts.")
+    parser.add_argument("tests", nargs="*", help="test ids to run, e.g. TC004 (default: all)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (1 = serial)")
+    parser.add_argument("--no-server-timing", action="store_true", help="skip the Server-Timing summary")
+    args = parser.parse_args(argv)
+
+    paths = discover(set(args.tests))
+    run_id = harness.random_string(4)
+    results = []
+    timings = ServerTimingCollector()
+    start = time.perf_counter()
+
+    if args.workers <= 1 or len(paths) <= 1:
+        harness.set_namespace(f"{run_id}w0")
+        install_server_timing()
+        try:
+            for path in paths:
+                results.append(run_test(path))
+                report(results[-1])
+        finally:
+            harness.teardown()
+    else:
+        counter = multiprocessing.Value("i", 0)
+        workers = min(args.workers, len(paths))
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(run_id, counter)) as pool:
+            futures = [pool.submit(run_test, path) for path in paths]
+            for future in as_completed(futures):
+                results.append(future.result())
+                report(results[-1])
+
+    for result in results:
+        timings.merge(result[4])
+    if not args.no_server_timing:
+        print_server_timing(timings.summary())
+
+    failed = [r for r in results if not r[1]]
+    print(f"\n{len(results) - len(failed)}/{len(results)} passed in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Collect and aggregate the ``Server-Timing`` headers sent by the API routes.
+
+The routes wrapped with ``withServerTiming`` (``lib/serverTiming.ts``) report
+how long each request spent parsing the body, in the store, serializing the
+response and in total:
+
+    Server-Timing: parse;dur=0.31, store;dur=2.4, serialize;dur=0.05, total;dur=3.2
+
+``ServerTimingCollector`` keeps those durations per endpoint and summarises
+them per phase, so a run shows where time goes inside the server instead of
+only the end-to-end latency.
+"""
+
+import re
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from harness import percentile
+
+
+def parse_server_timing(header):
+    """Return {metric: duration ms} for a Server-Timing header value."""
+    timings = {}
+    for entry in (header or "").split(","):
+        name, *params = [part.strip() for part in entry.split(";")]
+        if not name:
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "dur":
+                try:
+                    timings[name] = float(value.strip().strip('"'))
+                except ValueError:
+                    pass
+    return timings
+
+
+class ServerTimingCollector:
+    """Thread-safe per-endpoint, per-phase collector of server-side durations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(lambda: defaultdict(list))
+
+    def record(self, endpoint, header):
+        timings = parse_server_timing(header)
+        if not timings:
+            return
+        with self._lock:
+            for phase, ms in timings.items():
+                self.samples[endpoint][phase].append(ms)
+
+    def record_response(self, response):
+        # Group /api/fields/12 and /api/fields/13 under one endpoint
+        path = re.sub(r"/\d+(?=/|$)", "/:id", urlsplit(response.request.url).path)
+        self.record(f"{response.request.method} {path}", response.headers.get("Server-Timing"))
+
+    def install(self, session):
+        """Record every response received through ``session``."""
+        def hook(response, *args, **kwargs):
+            self.record_response(response)
+        session.hooks["response"].append(hook)
+        return session
+
+    def drain(self):
+        """Return the raw samples collected so far and start over."""
+        with self._lock:
+            samples = {endpoint: dict(phases) for endpoint, phases in self.samples.items()}
+            self.samples.clear()
+        return samples
+
+    def merge(self, samples):
+        with self._lock:
+            for endpoint, phases in samples.items():
+                for phase, values in phases.items():
+                    self.samples[endpoint][phase].extend(values)
+
+    def summary(self):
+        with self._lock:
+            report = {}
+            for endpoint, phases in sorted(self.samples.items()):
+                report[endpoint] = {}
+                for phase, values in phases.items():
+                    ordered = sorted(values)
+                    report[endpoint][phase] = {
+                        "count": len(ordered),
+                        "mean_ms": sum(ordered) / len(ordered),
+                        "p50_ms": percentile(ordered, 50),
+                        "p95_ms": percentile(ordered, 95),
+                    }
+            return report
+
+
+def print_server_timing(summary, phases=("parse", "store", "serialize", "total")):
+    if not summary:
+        print("\nNo Server-Timing headers received.")
+        return
+    print("\nServer-Timing (mean / p95 ms)")
+    print(f"{'endpoint':<40}" + "".join(f"{phase:>18}" for phase in phases))
+    for endpoint, stats in summary.items():
+        cells = []
+        for phase in phases:
+            if phase in stats:
+                cells.append(f"{stats[phase]['mean_ms']:>9.2f} /{stats[phase]['p95_ms']:>7.2f}")
+            else:
+                cells.append(f"{'-':>18}")
+        print(f"{endpoint:<40}" + "".join(cells))